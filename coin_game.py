@@ -0,0 +1,112 @@
+"""One entry point for every front end and tool
+
+    python coin_game.py gui [CUPS]                    # Tk window (CUPS in a ring when not 4)
+    python coin_game.py cli                           # terminal game with the menu
+    python coin_game.py cli --script moves.txt [SEED] # scripted terminal games, one line per game
+    python coin_game.py simulate [GAMES] [--strategy NAME] [--seed N] [--vectorized]
+    python coin_game.py solve                         # exact puzzle-mode solution
+    python coin_game.py bench [BENCH OPTIONS]         # benchmarks, see coin_game_bench.py
+
+Only this file is loaded before the subcommand is chosen; each subcommand
+imports what it needs when it runs, so the headless commands never load
+tkinter, NumPy, sqlite3 or multiprocessing. Add --startup anywhere to print,
+on stderr, the CPU time the process spent before the subcommand started
+(interpreter start-up and imports included).
+"""
+
+import sys
+import time
+
+
+def gui(argv):
+    """The Tk front end"""
+    import coin_game_gui
+
+    return coin_game_gui.main
+
+
+def cli(argv):
+    """The terminal game, interactive or scripted"""
+    import coin_game_simulator
+
+    return coin_game_simulator.main
+
+
+def simulate(argv):
+    """Headless games for each strategy; --vectorized plays them with NumPy"""
+    import argparse
+
+    from coin_game_engine import STRATEGIES
+
+    parser = argparse.ArgumentParser(prog='coin_game.py simulate', description="Play headless games")
+    parser.add_argument('games', type=int, nargs='?', default=100000)
+    parser.add_argument('--strategy', action='append', choices=sorted(STRATEGIES),
+                        help="strategies to play (default: all)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-turns', type=int, default=50)
+    parser.add_argument('--vectorized', action='store_true', help="play in NumPy batches")
+    args = parser.parse_args(argv)
+
+    if args.vectorized:
+        from coin_game_vectorized import simulate as play
+    else:
+        from coin_game_engine import run_games as play
+
+    def run():
+        for name in args.strategy or STRATEGIES:
+            start = time.perf_counter()
+            wins, histogram = play(STRATEGIES[name], args.games, seed=args.seed, max_turns=args.max_turns)
+            elapsed = time.perf_counter() - start
+            if args.vectorized:
+                won_turns = [turns for turns, count in enumerate(histogram) if turns and count]
+            else:
+                won_turns = list(histogram)
+            rate = f"{wins / args.games:7.2%}" if args.games else '      -'
+            speed = f"{args.games / elapsed:,.0f}" if elapsed else '-'
+            print(f"{name:12} win rate {rate}  worst {max(won_turns, default=0):2} turns  {speed} games/sec")
+    return run
+
+
+def solve(argv):
+    """The exact puzzle-mode solution"""
+    import coin_game_solver
+
+    return coin_game_solver.main
+
+
+def bench(argv):
+    """The benchmark suite"""
+    import coin_game_bench
+
+    return coin_game_bench.main
+
+
+COMMANDS = {
+    'gui': gui,
+    'cli': cli,
+    'simulate': simulate,
+    'solve': solve,
+    'bench': bench,
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    report_startup = '--startup' in argv
+    if report_startup:
+        argv.remove('--startup')
+    if not argv or argv[0] not in COMMANDS:
+        print(__doc__.split('\n\n')[1], file=sys.stderr)
+        return 2
+
+    name, rest = argv[0], argv[1:]
+    # Subcommand mains read sys.argv themselves
+    sys.argv = [f'{sys.argv[0]} {name}', *rest]
+    run = COMMANDS[name](rest)
+    if report_startup:
+        print(f"startup: {time.process_time() * 1000:.1f} ms CPU before '{name}' ran", file=sys.stderr)
+    return run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
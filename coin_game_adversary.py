@@ -0,0 +1,128 @@
+"""Adversaries that choose how the Lazy Susan turns
+
+An adversary factory takes (strategy, max_turns) and returns a callable
+rotate(turn, state, cup_indices, rng) giving the number of 90° turns to apply
+once the player has picked their cups but before they look underneath, which is
+when puzzle mode rotates the table in the GUI.
+"""
+
+from coin_game_state import FLIP_MASK, HEADS, IS_WIN, PAIRS, PEEK, ROTATE, STATES, to_coins
+
+
+def random_adversary(strategy, max_turns):
+    """An honest spin: every rotation equally likely"""
+    def rotate(turn, state, cup_indices, rng):
+        return rng.randrange(4)
+    return rotate
+
+
+def malicious_score(state, cup_indices):
+    """CoinGameGUI.calculate_malicious_score on a packed state (lower = worse for the player)"""
+    heads_in_selected = sum(state >> cup & 1 for cup in cup_indices)
+    tails_in_selected = len(cup_indices) - heads_in_selected
+    total_heads = HEADS[state]
+    total_tails = 4 - total_heads
+
+    if (total_tails == 3 and tails_in_selected == 2) or (total_heads == 3 and heads_in_selected == 2):
+        return 1
+    elif total_tails == 2 and heads_in_selected == 1:
+        return 1
+    return 3
+
+
+def heuristic_rotation(state, cup_indices):
+    """The rotation CoinGameGUI.perform_malicious_rotation picks: the first with the lowest score"""
+    best_rotation = 0
+    worst_score = float('inf')
+    for rotation in range(4):
+        score = malicious_score(ROTATE[rotation][state], cup_indices)
+        if score < worst_score:
+            worst_score = score
+            best_rotation = rotation
+    return best_rotation
+
+
+# RESPONSE_TABLE[cup_indices][state] is the heuristic's rotation for every state and
+# selection (both orders of each pair). Built once at import; the GUI's puzzle mode
+# and the headless heuristic adversary both read it.
+RESPONSE_TABLE = {}
+for _pair in PAIRS:
+    RESPONSE_TABLE[_pair] = RESPONSE_TABLE[_pair[::-1]] = tuple(
+        heuristic_rotation(state, _pair) for state in range(STATES)
+    )
+del _pair
+
+
+def heuristic_adversary(strategy, max_turns):
+    """The GUI's one-step puzzle-mode heuristic"""
+    def rotate(turn, state, cup_indices, rng):
+        return RESPONSE_TABLE[cup_indices][state]
+    return rotate
+
+
+def dump_response_table(file):
+    """Write the heuristic's full response table as CSV for offline auditing"""
+    import csv
+
+    writer = csv.writer(file)
+    writer.writerow(['coins', 'cups', 'rotation', 'rotated_coins', 'seen'])
+    for cup_indices in PAIRS:
+        for state in range(STATES):
+            rotation = RESPONSE_TABLE[cup_indices][state]
+            rotated = ROTATE[rotation][state]
+            writer.writerow([
+                ''.join(to_coins(state)),
+                f"{cup_indices[0]+1}+{cup_indices[1]+1}",
+                rotation * 90,
+                ''.join(to_coins(rotated)),
+                ''.join(PEEK[cup_indices][rotated]),
+            ])
+
+
+def exact_adversary(strategy, max_turns):
+    """Knows the strategy and rotates to delay the win as long as possible
+
+    Solved backwards over (turn, state); a loss counts as the longest possible game.
+    """
+    lost = max_turns + 1
+    # turns_to_win[state] for the turn after the one being solved
+    turns_to_win = [lost] * STATES
+    choices = [None] * max_turns
+
+    for turn in reversed(range(max_turns)):
+        cup_indices = strategy.select(turn)
+        flip_mask = FLIP_MASK[cup_indices]
+        peek = PEEK[cup_indices]
+        # The strategy's reply to each observation is the same for every state on this turn
+        reply = {observed: flip_mask[strategy.flip(turn, observed)] for observed in set(peek)}
+        best = []
+        values = []
+        for state in range(STATES):
+            best_rotation, best_value = 0, -1
+            for rotation in range(4):
+                rotated = ROTATE[rotation][state]
+                flipped = rotated ^ reply[peek[rotated]]
+                value = turn + 1 if IS_WIN[flipped] else turns_to_win[flipped]
+                if value > best_value:
+                    best_rotation, best_value = rotation, value
+            best.append(best_rotation)
+            values.append(best_value)
+        choices[turn] = best
+        turns_to_win = values
+
+    def rotate(turn, state, cup_indices, rng):
+        return choices[turn][state]
+    return rotate
+
+
+ADVERSARIES = {
+    'random': random_adversary,
+    'heuristic': heuristic_adversary,
+    'exact': exact_adversary,
+}
+
+
+if __name__ == "__main__":
+    import sys
+
+    dump_response_table(sys.stdout)
@@ -0,0 +1,119 @@
+"""Belief tracking: which coin states are still consistent with what the player knows
+
+A belief is a 16-bit set with bit s set while coin state s (see coin_game_state)
+is still possible. Rotating or flipping every state in a belief permutes its
+bits, so both are done with two byte-indexed table lookups; restricting a
+belief to an observation is a single AND. Every update is constant time.
+"""
+
+from coin_game_state import FLIP_MASK, IS_WIN, PEEK, ROTATE, START_STATES, STATES
+
+START_BELIEF = sum(1 << state for state in START_STATES)
+WIN_BELIEF = sum(1 << state for state in range(STATES) if IS_WIN[state])
+OBSERVATIONS = (('T', 'T'), ('H', 'T'), ('T', 'H'), ('H', 'H'))
+
+
+def _permutation_tables(mapping):
+    """Low- and high-byte tables that apply a state permutation to a whole belief"""
+    low = [0] * 256
+    high = [0] * 256
+    # Each entry is an earlier entry (the byte minus its lowest bit) plus that bit's image
+    for byte in range(1, 256):
+        rest = byte & (byte - 1)
+        state = (byte ^ rest).bit_length() - 1
+        low[byte] = low[rest] | 1 << mapping[state]
+        high[byte] = high[rest] | 1 << mapping[state + 8]
+    return tuple(low), tuple(high)
+
+
+# ROTATE_BELIEF[r] and FLIP_BELIEF[mask] are (low byte, high byte) tables
+ROTATE_BELIEF = tuple(_permutation_tables(rotate) for rotate in ROTATE)
+FLIP_BELIEF = tuple(_permutation_tables([state ^ mask for state in range(STATES)]) for mask in range(STATES))
+
+# OBSERVATION_BELIEF[cup_indices][i] is every state showing OBSERVATIONS[i] under those cups
+OBSERVATION_BELIEF = {
+    cup_indices: tuple(
+        sum(1 << state for state in range(STATES) if peek[state] == observed) for observed in OBSERVATIONS
+    )
+    for cup_indices, peek in PEEK.items()
+}
+
+
+def rotation_closure(belief):
+    """Every state the table could be in after an unknown rotation"""
+    low = belief & 0xFF
+    high = belief >> 8
+    closed = 0
+    for low_table, high_table in ROTATE_BELIEF:
+        closed |= low_table[low] | high_table[high]
+    return closed
+
+
+def flip_belief(belief, mask):
+    """Apply the same flip (an XOR mask over cups) to every state in a belief"""
+    low_table, high_table = FLIP_BELIEF[mask]
+    return low_table[belief & 0xFF] | high_table[belief >> 8]
+
+
+def observe(belief, cup_indices):
+    """Split a belief by what the player would see under the two cups"""
+    return [belief & part for part in OBSERVATION_BELIEF[cup_indices]]
+
+
+def count(belief):
+    """Number of states still possible"""
+    return bin(belief).count('1')
+
+
+class BeliefTracker:
+    """Incrementally tracks one player's belief through a game
+
+    Call spin() when the table may have turned unseen, observe() when cups are
+    looked under (observed=None in blind mode), flip() for every flip and
+    end_turn() when a spin did not win.
+    """
+
+    __slots__ = ('belief',)
+
+    def __init__(self, belief=START_BELIEF):
+        self.belief = belief
+
+    def reset(self):
+        """Back to knowing only that the game did not start won"""
+        self.belief = START_BELIEF
+
+    def spin(self):
+        """The table turned by an unknown amount"""
+        self.belief = rotation_closure(self.belief)
+
+    def observe(self, cup_indices, observed=None):
+        """The player looked under two cups and saw observed, e.g. ('H', 'T')"""
+        if observed is not None:
+            self.belief &= OBSERVATION_BELIEF[tuple(cup_indices)][OBSERVATIONS.index(tuple(observed))]
+
+    def flip(self, cup_indices, choice):
+        """A flip choice (0-3) on two cups"""
+        self.belief = flip_belief(self.belief, FLIP_MASK[tuple(cup_indices)][choice])
+
+    def flip_cup(self, cup):
+        """One coin flipped"""
+        self.belief = flip_belief(self.belief, 1 << cup)
+
+    def end_turn(self):
+        """A spin was checked and did not win, so the coins are not all alike"""
+        self.belief &= ~WIN_BELIEF
+
+    @property
+    def possible_states(self):
+        """How many coin states are still consistent with everything seen"""
+        return count(self.belief)
+
+    @property
+    def win_guaranteed(self):
+        """True when every possible state is a win, so spinning now must win"""
+        return self.belief != 0 and not self.belief & ~WIN_BELIEF
+
+    @property
+    def win_possible(self):
+        """True when at least one possible state is a win"""
+        return bool(self.belief & WIN_BELIEF)
@@ -0,0 +1,184 @@
+"""Micro and macro benchmarks for the engine and GUI hot paths
+
+    python coin_game_bench.py                       # run and print
+    python coin_game_bench.py --save results.json   # also record as JSON
+    python coin_game_bench.py --baseline bench_baseline.json --threshold 0.15
+
+With --baseline, any benchmark slower than baseline * (1 + threshold) is
+reported as a regression and the exit status is 1. The startup[...] process
+launches vary far more from run to run than the in-process timings, so they
+are gated by their own --startup-threshold instead. --update-baseline writes
+the current run to the baseline file instead of comparing.
+"""
+
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+
+
+def stub_gui():
+    """A CoinGameGUI wired to the in-memory widget backend instead of a real display"""
+    from coin_game_gui import CoinGameGUI
+    from coin_game_widgets import VirtualRoot, virtual_backend
+
+    return CoinGameGUI(VirtualRoot(), backend=virtual_backend())
+
+
+def micro_benchmarks():
+    """name -> zero-argument callable exercising one rule method"""
+    from coin_game_simulator import CoinGame
+
+    game = CoinGame()
+    game.rng = random.Random(0)
+    game.initialize_game()
+    gui = stub_gui()
+    coins = ['H', 'T', 'T', 'H']
+    cups = [0, 1]
+
+    return {
+        'rotate_coins': lambda: game.rotate_coins(coins, 1),
+        'calculate_malicious_score': lambda: gui.calculate_malicious_score(coins, cups),
+        'check_win_condition': game.check_win_condition,
+        'initialize_game': game.initialize_game,
+        'apply_flip': lambda: game.apply_flip(cups, 3),
+    }
+
+
+def macro_benchmarks():
+    """name -> (zero-argument callable, operations it performs)"""
+    from coin_game_engine import STRATEGIES, HeadlessCoinGame
+
+    benchmarks = {}
+    for name, strategy in STRATEGIES.items():
+        game = HeadlessCoinGame(strategy, seed=0)
+        benchmarks[f'game[{name}]'] = (game.play_game, 1)
+
+    gui = stub_gui()
+    gui.selected_cups = [0, 1]
+    gui.cups_examined = {2}
+
+    def redraw_loop():
+        for _ in range(100):
+            gui.update_display()
+
+    benchmarks['gui.update_display'] = (redraw_loop, 100)
+
+    # Whole-process start-up through the entry point, as a shell pipeline would launch it
+    entry_point = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'coin_game.py')
+    for command in (['simulate', '0'], ['cli', '--script', os.devnull]):
+        def launch(command=command):
+            subprocess.run([sys.executable, entry_point, *command], stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, check=True)
+        benchmarks[f'startup[{command[0]}]'] = (launch, 1)
+    return benchmarks
+
+
+def measure(func, ops=1, min_time=0.2, repeat=5):
+    """Best-of-repeat nanoseconds per operation"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / (number * ops) * 1e9
+
+
+def environment():
+    """Metadata recorded alongside the results"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'commit': commit,
+    }
+
+
+def run(selected=None, min_time=0.2):
+    """Run every benchmark (or those whose names contain a selected substring)"""
+    benchmarks = {name: (func, 1) for name, func in micro_benchmarks().items()}
+    benchmarks.update(macro_benchmarks())
+    results = {}
+    for name, (func, ops) in benchmarks.items():
+        if selected and not any(s in name for s in selected):
+            continue
+        results[name] = {'ns_per_op': measure(func, ops, min_time)}
+    return {'environment': environment(), 'results': results}
+
+
+def compare(current, baseline, threshold, startup_threshold=None):
+    """Return [(name, baseline ns, current ns, change)] for benchmarks that regressed
+
+    startup[...] benchmarks use startup_threshold; None leaves them ungated.
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        limit = startup_threshold if name.startswith('startup[') else threshold
+        if before is None or limit is None:
+            continue
+        change = result['ns_per_op'] / before['ns_per_op'] - 1
+        if change > limit:
+            regressions.append((name, before['ns_per_op'], result['ns_per_op'], change))
+    return regressions
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the coin game engine and GUI hot paths")
+    parser.add_argument('benchmarks', nargs='*', help="only run benchmarks whose names contain these")
+    parser.add_argument('--save', help="write results as JSON to this file")
+    parser.add_argument('--baseline', help="compare against this JSON baseline")
+    parser.add_argument('--threshold', type=float, default=0.10, help="allowed slowdown (default 0.10 = 10%%)")
+    parser.add_argument('--startup-threshold', type=float, default=0.50,
+                        help="allowed slowdown of the startup[...] launches (default 0.50 = 50%%)")
+    parser.add_argument('--update-baseline', action='store_true', help="overwrite the baseline with this run")
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds per timing sample")
+    args = parser.parse_args()
+    if args.baseline and not args.update_baseline and not os.path.exists(args.baseline):
+        # A regression gate must not pass just because its baseline went missing
+        parser.error(f"baseline {args.baseline} does not exist; create it with --update-baseline")
+
+    current = run(args.benchmarks, args.min_time)
+    baseline = None
+    if args.baseline and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    for name, result in current['results'].items():
+        line = f"{name:28} {result['ns_per_op']:12,.0f} ns/op"
+        if baseline and name in baseline['results']:
+            change = result['ns_per_op'] / baseline['results'][name]['ns_per_op'] - 1
+            line += f"  {change:+7.1%}"
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(current, f, indent=2)
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    elif baseline:
+        regressions = compare(current, baseline, args.threshold, args.startup_threshold)
+        for name, before, after, change in regressions:
+            print(f"REGRESSION {name}: {before:,.0f} -> {after:,.0f} ns/op ({change:+.1%})")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Columnar result files built on the array module
+
+A column file is a header, a directory of typed columns, then each column's
+values stored contiguously in little-endian order:
+
+    header     magic, version, column count, row count
+    directory  per column: typecode, item size, name, and the labels of a
+               categorical column (its values are indexes into the labels)
+    data       column 0's values, column 1's values, ...
+
+Every column is a fixed-width array, so loading one is a single
+array.fromfile() call per column instead of parsing text row by row:
+
+    write_columns('sweep.cgc', {'turns': array('H', ...), 'strategy': array('B', ...)},
+                  labels={'strategy': ('optimal', 'blind')})
+    table = read_columns('sweep.cgc')
+    table['turns'], table.decoded('strategy')
+"""
+
+import struct
+import sys
+from array import array
+
+MAGIC = b'CGCF'
+VERSION = 1
+HEADER = struct.Struct('<4sBHQ')  # magic, version, columns, rows
+COLUMN = struct.Struct('<cBHH')  # typecode, item size, name length, label count
+LABEL = struct.Struct('<H')  # label length
+
+# Typecodes whose width is the same on every platform ('l' and 'L' are not)
+TYPECODES = 'bBhHiIqQfd'
+
+
+class ColumnTable:
+    """Columns read from a column file: table[name] is an array, table.labels[name] its labels if categorical"""
+
+    def __init__(self, columns, labels):
+        self.columns = columns
+        self.labels = labels
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def names(self):
+        """Column names in file order"""
+        return list(self.columns)
+
+    def decoded(self, name):
+        """A categorical column as its label strings"""
+        labels = self.labels[name]
+        return [labels[code] for code in self.columns[name]]
+
+    def rows(self):
+        """Yield each row as a dict, with categorical columns decoded"""
+        names = self.names()
+        columns = [self.decoded(name) if name in self.labels else self.columns[name] for name in names]
+        for values in zip(*columns):
+            yield dict(zip(names, values))
+
+
+def write_columns(path, columns, labels=None):
+    """Write {name: array} (all the same length) to a column file
+
+    labels maps a categorical column's name to the strings its values index.
+    """
+    labels = labels or {}
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("every column must have the same number of rows")
+    for name, values in columns.items():
+        if values.typecode not in TYPECODES:
+            raise ValueError(f"column {name!r} has typecode {values.typecode!r}; use one of {TYPECODES}")
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(columns), lengths.pop() if lengths else 0))
+        for name, values in columns.items():
+            encoded = name.encode()
+            column_labels = [label.encode() for label in labels.get(name, ())]
+            f.write(COLUMN.pack(values.typecode.encode(), values.itemsize, len(encoded), len(column_labels)))
+            f.write(encoded)
+            for label in column_labels:
+                f.write(LABEL.pack(len(label)))
+                f.write(label)
+        for values in columns.values():
+            if sys.byteorder == 'big':
+                values = array(values.typecode, values)
+                values.byteswap()
+            values.tofile(f)
+
+
+def read_columns(path, names=None):
+    """Load a column file into a ColumnTable, optionally only the named columns"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is not a column file")
+        magic, version, count, rows = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} column file")
+
+        directory = []
+        labels = {}
+        for _ in range(count):
+            typecode, itemsize, name_length, label_count = COLUMN.unpack(f.read(COLUMN.size))
+            typecode = typecode.decode()
+            name = f.read(name_length).decode()
+            if array(typecode).itemsize != itemsize:
+                raise ValueError(f"column {name!r} has {itemsize}-byte items, "
+                                 f"but typecode {typecode!r} is {array(typecode).itemsize} bytes here")
+            column_labels = []
+            for _ in range(label_count):
+                (length,) = LABEL.unpack(f.read(LABEL.size))
+                column_labels.append(f.read(length).decode())
+            if label_count:
+                labels[name] = tuple(column_labels)
+            directory.append((name, typecode, itemsize))
+
+        columns = {}
+        for name, typecode, itemsize in directory:
+            if names is not None and name not in names:
+                f.seek(rows * itemsize, 1)
+                continue
+            values = array(typecode)
+            values.fromfile(f, rows)
+            if sys.byteorder == 'big':
+                values.byteswap()
+            columns[name] = values
+    return ColumnTable(columns, {name: labels[name] for name in columns if name in labels})
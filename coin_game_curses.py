@@ -0,0 +1,190 @@
+"""curses front end for the terminal game
+
+Plays the same rules as coin_game_simulator.CoinGame but keeps the board on
+screen instead of clearing and reprinting it every turn. Each frame is built
+as a list of text rows and compared with the rows already on screen; only the
+changed span of each changed row is written, and curses sends just those
+cells to the terminal, so a turn costs a few dozen bytes even over slow SSH.
+Keys are read as they are pressed, with no blocking input() or sleeps:
+
+    1-4    select / deselect a cup        e, Enter   look under the selected cups
+    0-3    flip choice after looking      h          strategy hint
+    n      new game                       q          quit
+
+    python coin_game_curses.py
+"""
+
+import curses
+import time
+
+from coin_game_simulator import CoinGame
+
+HELP = ("1-4 select cups   e look   0-3 flip (0 none, 1 first, 2 second, 3 both)\n"
+        "h hint   n new game   q quit")
+HINT = ("Five steps win within 5 turns: diagonal (1 & 4) tails to heads,\n"
+        "adjacent (1 & 2) tails to heads, diagonal tails to heads (or flip one),\n"
+        "adjacent flip both, diagonal flip both.")
+
+
+class Screen:
+    """Shadow copy of the rows on screen; draw() writes only what changed"""
+
+    def __init__(self, window):
+        self.window = window
+        self.rows = []
+        self.cells_written = 0
+
+    def draw(self, rows):
+        """Bring the window up to date with a new frame of text rows"""
+        height, width = self.window.getmaxyx()
+        rows = [row[:width - 1] for row in rows[:height]]
+        if len(self.rows) < len(rows):
+            self.rows.extend([''] * (len(rows) - len(self.rows)))
+        for y, old in enumerate(self.rows):
+            new = rows[y] if y < len(rows) else ''
+            if new == old:
+                continue
+            # Only the span between the first and last differing cells
+            length = max(len(new), len(old))
+            new_padded = new.ljust(length)
+            old_padded = old.ljust(length)
+            start = 0
+            while start < length and new_padded[start] == old_padded[start]:
+                start += 1
+            end = length
+            while end > start and new_padded[end - 1] == old_padded[end - 1]:
+                end -= 1
+            # Rows differing only in trailing spaces look the same and need no write
+            if start < end:
+                self.window.addstr(y, start, new_padded[start:end])
+                self.cells_written += end - start
+            self.rows[y] = new
+        self.window.noutrefresh()
+        curses.doupdate()
+
+
+class CursesFrontEnd:
+    """Event-driven game loop: one key in, one diffed frame out"""
+
+    def __init__(self, window, game=None):
+        self.window = window
+        self.screen = Screen(window)
+        self.game = game if game is not None else CoinGame()
+        self.selected = []
+        self.seen = None  # Coins under the examined cups, once looked at
+        self.message = ""
+        self.over = False
+        self.frame_ms = 0.0
+        self.worst_frame_ms = 0.0
+        self.new_game()
+
+    def new_game(self):
+        """Fresh coins, spun before the first look like every later turn"""
+        self.game.initialize_game()
+        self.game.spin_lazy_susan()
+        self.selected = []
+        self.seen = None
+        self.over = False
+        self.message = "New game: pick two cups to look under."
+
+    def frame(self):
+        """The screen as a list of rows"""
+        game = self.game
+        cells = []
+        for cup in range(4):
+            label = f"CUP {cup + 1}"
+            if self.seen is not None and cup in self.selected:
+                label += f": {self.seen[self.selected.index(cup)]}"
+            elif self.over:
+                label += f": {game.coins[cup]}"
+            cells.append(f"[{label:^9}]" if cup in self.selected else f" {label:^9} ")
+        return [
+            f" LAZY SUSAN COIN GAME{'':20}Turn {min(game.turn_count + 1, game.max_turns)}/{game.max_turns}",
+            "",
+            f"   {cells[0]}   {cells[1]}",
+            "",
+            f"   {cells[2]}   {cells[3]}",
+            "",
+            *(f" {line}" for line in self.message.split("\n")),
+            "",
+            *(f" {line}" for line in HELP.split("\n")),
+            f" frame {self.frame_ms:.3f} ms (worst {self.worst_frame_ms:.3f} ms), "
+            f"{self.screen.cells_written} cells written",
+        ]
+
+    def handle_key(self, key):
+        """Apply one key press; returns False to quit"""
+        game = self.game
+        if key in (ord('q'), ord('Q')):
+            return False
+        if key in (ord('n'), ord('N')):
+            self.new_game()
+        elif key in (ord('h'), ord('H')):
+            self.message = HINT
+        elif self.over:
+            self.message = "Game over. Press n for a new game or q to quit."
+        elif self.seen is None and ord('1') <= key <= ord('4'):
+            cup = key - ord('1')
+            if cup in self.selected:
+                self.selected.remove(cup)
+            elif len(self.selected) < 2:
+                self.selected.append(cup)
+            else:
+                self.selected[0] = cup
+            self.message = "Press e to look under the selected cups." if len(self.selected) == 2 else \
+                "Pick two cups to look under."
+        elif self.seen is None and key in (ord('e'), ord('E'), ord('\n'), curses.KEY_ENTER):
+            if len(self.selected) == 2:
+                self.seen = game.peek_coins(self.selected)
+                self.message = "Flip: 0 neither, 1 first, 2 second, 3 both."
+            else:
+                self.message = "Select exactly two cups first."
+        elif self.seen is not None and ord('0') <= key <= ord('3'):
+            self.flip(key - ord('0'))
+        return True
+
+    def flip(self, choice):
+        """Flip, check for a win and spin for the next turn"""
+        game = self.game
+        game.apply_flip(self.selected, choice)
+        if game.recorder is not None:
+            game.recorder.record_turn(self.selected, game.last_rotation, choice)
+        self.seen = None
+        self.selected = []
+        if game.check_win_condition():
+            self.over = True
+            self.message = f"YOU WON in {game.turn_count + 1} turns! Press n for a new game."
+            return
+        game.turn_count += 1
+        if game.turn_count >= game.max_turns:
+            self.over = True
+            self.message = f"Game over: no win within {game.max_turns} turns. Press n for a new game."
+            return
+        game.spin_lazy_susan()
+        self.message = "The Lazy Susan spun. Pick two cups to look under."
+
+    def run(self):
+        """Read keys until q"""
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass  # Terminal cannot hide the cursor
+        self.window.keypad(True)
+        self.screen.draw(self.frame())
+        while True:
+            key = self.window.getch()
+            start = time.perf_counter()
+            if not self.handle_key(key):
+                break
+            self.screen.draw(self.frame())
+            # Timed after drawing, so the readout shows the previous frame
+            self.frame_ms = (time.perf_counter() - start) * 1000
+            self.worst_frame_ms = max(self.worst_frame_ms, self.frame_ms)
+
+
+def main():
+    curses.wrapper(lambda window: CursesFrontEnd(window).run())
+
+
+if __name__ == "__main__":
+    main()
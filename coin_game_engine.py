@@ -0,0 +1,176 @@
+import random
+
+from coin_game_simulator import CoinGame
+from coin_game_start import game_rng
+from coin_game_state import FLIP_MASK, IS_WIN, PEEK, ROTATE, from_coins, to_coins
+
+# Cup pairs on the 2x2 grid:
+# 0 1
+# 2 3
+ADJACENT = (0, 1)
+DIAGONAL = (0, 3)
+
+
+class Strategy:
+    """A named pair of callables that plays the game without a human
+
+    select(turn) returns the two cups to examine this turn.
+    flip(turn, observed) receives the coins seen under those cups (e.g. ('H', 'T'))
+    and returns a flip choice: 0 neither, 1 first, 2 second, 3 both.
+    """
+
+    def __init__(self, name, select, flip):
+        self.name = name
+        self.select = select
+        self.flip = flip
+
+    def __repr__(self):
+        return f"Strategy({self.name!r})"
+
+
+def make_heads(observed):
+    """Flip choice that turns every observed tail into a head"""
+    return (observed[0] == 'T') | ((observed[1] == 'T') << 1)
+
+
+def pair_up(observed):
+    """Flip choice that makes the two observed coins match"""
+    return 0 if observed[0] == observed[1] else 1
+
+
+def optimal_flip(turn, observed):
+    """Five-step program that wins against any rotation sequence"""
+    step = turn % 5
+    if step < 2:
+        # Diagonal then adjacent: at least three heads afterwards
+        return make_heads(observed)
+    if step == 2:
+        # Diagonal: flip a lone tail to win, otherwise leave two adjacent tails
+        return make_heads(observed) or 1
+    # Adjacent then diagonal: flipping both either wins or sets up the next step
+    return 3
+
+
+# Seven blind moves (cups, flip choice) that win against any rotation sequence without looking
+BLIND_PLAN = (
+    (DIAGONAL, 3), (ADJACENT, 3), (DIAGONAL, 3), (ADJACENT, 1), (DIAGONAL, 3), (ADJACENT, 3), (DIAGONAL, 3),
+)
+
+
+STRATEGIES = {
+    'adjacent': Strategy('adjacent', lambda turn: ADJACENT, lambda turn, observed: pair_up(observed)),
+    'diagonal': Strategy('diagonal', lambda turn: DIAGONAL, lambda turn, observed: pair_up(observed)),
+    'alternating': Strategy(
+        'alternating',
+        lambda turn: DIAGONAL if turn % 2 == 0 else ADJACENT,
+        lambda turn, observed: make_heads(observed),
+    ),
+    'optimal': Strategy(
+        'optimal',
+        lambda turn: ADJACENT if turn % 5 in (1, 3) else DIAGONAL,
+        optimal_flip,
+    ),
+    'blind': Strategy(
+        'blind',
+        lambda turn: BLIND_PLAN[turn % len(BLIND_PLAN)][0],
+        lambda turn, observed: BLIND_PLAN[turn % len(BLIND_PLAN)][1],
+    ),
+}
+
+
+class HeadlessCoinGame(CoinGame):
+    """CoinGame driven by a Strategy instead of a terminal: no input, output or sleeps
+
+    adversary is a factory from coin_game_adversary; by default the table spins at random.
+    recorder is an optional coin_game_records.GameRecordWriter that receives every game.
+    start_states is a coin_game_start.StartStateSampler; by default every start is equally likely.
+    """
+
+    def __init__(self, strategy, seed=None, max_turns=50, adversary=None, recorder=None, start_states=None):
+        super().__init__()
+        if start_states is not None:
+            self.start_states = start_states
+        self.strategy = strategy
+        self.rng = random.Random(seed)
+        self.max_turns = max_turns
+        self.adversary = adversary(strategy, max_turns) if adversary is not None else None
+        self.recorder = recorder
+
+    def play_game(self):
+        """Play one game; return the number of turns taken to win, or None on a loss"""
+        self.initialize_game()
+        select = self.strategy.select
+        flip = self.strategy.flip
+        rng = self.rng
+        randrange = rng.randrange
+        adversary = self.adversary
+        recorder = self.recorder
+        # The rules run on the packed state; self.coins is refreshed once at the end
+        state = from_coins(self.coins)
+        turns = None
+
+        for turn in range(self.max_turns):
+            cup_indices = select(turn)
+            if adversary is None:
+                rotation = randrange(4)
+            else:
+                rotation = adversary(turn, state, cup_indices, rng)
+            state = ROTATE[rotation][state]
+            choice = flip(turn, PEEK[cup_indices][state])
+            state ^= FLIP_MASK[cup_indices][choice]
+            if recorder is not None:
+                recorder.record_turn(cup_indices, rotation, choice)
+            if IS_WIN[state]:
+                turns = turn + 1
+                break
+
+        self.turn_count = self.max_turns if turns is None else turns - 1
+        self.coins = to_coins(state)
+        return turns
+
+
+def run_games(strategy, games, seed=None, max_turns=50, adversary=None, recorder=None, start_states=None,
+              streams=False, stats=None, snapshots=None):
+    """Play many headless games and return (wins, {turns_to_win: count})
+
+    With streams=True game i draws from coin_game_start.game_rng(seed, i), so any
+    single game can be replayed on its own (seed=None draws a fresh run seed);
+    otherwise all games share one stream.
+    Every game is also folded into stats (a coin_game_stats.TurnStats) if given,
+    and snapshots (a coin_game_stats.Snapshots) is ticked after each game.
+    """
+    if streams and seed is None:
+        seed = random.getrandbits(64)
+    game = HeadlessCoinGame(strategy, seed=seed, max_turns=max_turns, adversary=adversary, recorder=recorder,
+                            start_states=start_states)
+    turns_histogram = {}
+    wins = 0
+    for i in range(games):
+        if streams:
+            game.rng = game_rng(seed, i)
+        turns = game.play_game()
+        if stats is not None:
+            stats.add(turns)
+            if snapshots is not None:
+                snapshots.tick(stats)
+        if turns is not None:
+            wins += 1
+            turns_histogram[turns] = turns_histogram.get(turns, 0) + 1
+    return wins, turns_histogram
+
+
+def main():
+    import sys
+    import time
+
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for name, strategy in STRATEGIES.items():
+        start = time.perf_counter()
+        wins, turns_histogram = run_games(strategy, games, seed=0)
+        elapsed = time.perf_counter() - start
+        print(f"{name:12} win rate {wins / games:7.2%}  worst {max(turns_histogram, default=0):2} turns  "
+              f"{games / elapsed:,.0f} games/sec")
+
+
+if __name__ == "__main__":
+    main()
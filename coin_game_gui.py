@@ -1,24 +1,90 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
+import functools
+import hashlib
+import math
+import os
 import random
+import sqlite3
+import sys
 import time
+import types
+
+from coin_game_adversary import RESPONSE_TABLE
+from coin_game_belief import BeliefTracker
+from coin_game_engine import STRATEGIES
+from coin_game_policy import PolicyTable, compile_strategy, describe_turn
+from coin_game_solver import PuzzleSolver, describe_move
+from coin_game_start import StartStateSampler, state_to_coins
+from coin_game_store import GameStore
+from coin_game_state import ROTATE, ROTATIONS, from_coins, to_coins
+from coin_game_trace import TIMINGS, TRACE, traced
+from coin_game_verify import check_strategy
+
+def tk_backend():
+    """Real Tk widgets; see coin_game_widgets.virtual_backend() for the in-memory stand-in"""
+    import tkinter as tk
+    from tkinter import messagebox
+
+    return types.SimpleNamespace(Tk=tk.Tk, Frame=tk.Frame, Label=tk.Label, Button=tk.Button, LEFT=tk.LEFT,
+                                 messagebox=messagebox)
+
+
+@functools.lru_cache(maxsize=None)
+def proven_worst_case(name):
+    """Turns the model checker proves a built-in strategy needs at most; checked once per run"""
+    return check_strategy(STRATEGIES[name]).worst_case
+
 
 class CoinGameGUI:
-    def __init__(self, root):
+    # Autoplay speeds: (button text, ms between bot actions); 0 = as fast as the event loop allows
+    AUTOPLAY_SPEEDS = (("Slow", 600), ("Normal", 150), ("Fast", 20), ("Max", 0))
+    
+    def __init__(self, root, cups=4, recorder=None, seed=None, backend=None, store=None):
         self.root = root
+        self.ui = backend if backend is not None else tk_backend()  # Widget classes and messagebox
         self.root.title("Lazy Susan Coin Game")
         self.root.geometry("800x600")
         self.root.configure(bg='#2c3e50')
         
         # Game state
+        self.cups = cups  # 4 cups sit on the classic 2x2 grid, any other count in a ring
         self.coins = []
         self.turn_count = 0
         self.max_turns = 50
+        self.rng = random.Random(seed)
+        self.start_states = StartStateSampler(cups)
         self.game_mode = "human"
         self.selected_cups = []
         self.game_active = False
         self.cups_examined = set()  # Track which cups have been examined
         self.malicious_mode = False  # Track if malicious mode is enabled
+        self.spin_job = None  # Pending root.after id while the spin animation runs
+        self.spin_position = None  # Cup lit up by the spin animation
+        self.spin_frame_ms = 50  # 6 frames = the old 0.3 second pause
+        self.spin_frames_left = 0
+        self.drawn = {}  # widget -> options last pushed to it, see render()
+        self.solver = PuzzleSolver(self.max_turns)
+        self.policy = compile_strategy(STRATEGIES['optimal'], self.max_turns)
+        # Autoplay: a strategy plays through the normal handlers, one action per root.after step
+        self.autoplay_strategy = self.policy
+        self.autoplay_actions = None  # Generator of bot actions while autoplay is on
+        self.autoplay_job = None
+        self.autoplay_speed = 1  # Index into AUTOPLAY_SPEEDS
+        self.autoplay_limit = None  # Stop after this many games (None = until switched off)
+        self.autoplay_games = 0
+        self.autoplay_wins = 0
+        self.autoplay_moves = 0
+        self.autoplay_started = 0.0
+        self.autoplay_shown = 0.0  # When the throughput label was last refreshed
+        self.autoplay_tracing = False  # Whether autoplay switched handler timing on
+        # Coin states consistent with what the player has seen (tracked for 4 cups only)
+        self.tracker = BeliefTracker() if cups == 4 else None
+        self.examined_pair = None
+        self.examined_coins = None
+        self.examined_rotation = 0  # Puzzle-mode rotation applied at the latest examine
+        self.recorder = recorder  # Optional coin_game_records.GameRecordWriter (4 cups only)
+        self.store = store  # Optional coin_game_store.GameStore that keeps every finished game
+        self.move_trace = bytearray()  # (cup, cup, rotation, flip choice) per finished turn, for the store
+        self.game_started = 0.0
         
         # Colors
         self.colors = {
@@ -26,6 +92,7 @@ class CoinGameGUI:
             'cup_normal': '#34495e',
             'cup_selected': '#e74c3c',
             'cup_highlight': '#f39c12',
+            'cup_spin': '#9b59b6',
             'text': '#ecf0f1',
             'button': '#3498db',
             'button_hover': '#2980b9'
@@ -37,10 +104,10 @@ class CoinGameGUI:
     def setup_ui(self):
         """Setup the user interface"""
         # Title
-        title_frame = tk.Frame(self.root, bg=self.colors['bg'])
+        title_frame = self.ui.Frame(self.root, bg=self.colors['bg'])
         title_frame.pack(pady=20)
         
-        title_label = tk.Label(
+        title_label = self.ui.Label(
             title_frame, 
             text="🎠 LAZY SUSAN COIN GAME 🎠", 
             font=('Arial', 24, 'bold'),
@@ -50,10 +117,10 @@ class CoinGameGUI:
         title_label.pack()
         
         # Game info
-        info_frame = tk.Frame(self.root, bg=self.colors['bg'])
+        info_frame = self.ui.Frame(self.root, bg=self.colors['bg'])
         info_frame.pack(pady=10)
         
-        self.turn_label = tk.Label(
+        self.turn_label = self.ui.Label(
             info_frame,
             text="Turn: 1/50",
             font=('Arial', 14),
@@ -63,34 +130,44 @@ class CoinGameGUI:
         self.turn_label.pack()
         
         # Cups display
-        cups_frame = tk.Frame(self.root, bg=self.colors['bg'])
-        cups_frame.pack(pady=30)
+        if self.cups == 4:
+            cups_frame = self.ui.Frame(self.root, bg=self.colors['bg'])
+            cups_frame.pack(pady=30)
+        else:
+            # Fixed-size frame so the ring can be laid out with place()
+            cups_frame = self.ui.Frame(self.root, bg=self.colors['bg'], width=420, height=300)
+            cups_frame.pack(pady=10)
         
         self.cup_buttons = []
-        for i in range(4):
+        for i in range(self.cups):
             row = i // 2
             col = i % 2
             
-            cup_btn = tk.Button(
+            cup_btn = self.ui.Button(
                 cups_frame,
                 text=f"CUP {i+1}",
-                font=('Arial', 16, 'bold'),
-                width=8,
-                height=3,
+                font=('Arial', 16 if self.cups == 4 else 10, 'bold'),
+                width=8 if self.cups == 4 else 6,
+                height=3 if self.cups == 4 else 2,
                 bg=self.colors['cup_normal'],
                 fg=self.colors['text'],
                 relief='raised',
                 bd=3,
                 command=lambda idx=i: self.select_cup(idx)
             )
-            cup_btn.grid(row=row, column=col, padx=10, pady=10)
+            if self.cups == 4:
+                cup_btn.grid(row=row, column=col, padx=10, pady=10)
+            else:
+                # Cup 1 at the top, numbered clockwise around the ring
+                angle = 2 * math.pi * i / self.cups
+                cup_btn.place(relx=0.5 + 0.42 * math.sin(angle), rely=0.5 - 0.4 * math.cos(angle), anchor='center')
             self.cup_buttons.append(cup_btn)
             
         # Action buttons
-        action_frame = tk.Frame(self.root, bg=self.colors['bg'])
+        action_frame = self.ui.Frame(self.root, bg=self.colors['bg'])
         action_frame.pack(pady=20)
         
-        self.examine_btn = tk.Button(
+        self.examine_btn = self.ui.Button(
             action_frame,
             text="Examine Selected Cups",
             font=('Arial', 12, 'bold'),
@@ -101,9 +178,9 @@ class CoinGameGUI:
             command=self.examine_cups,
             state='disabled'
         )
-        self.examine_btn.pack(side=tk.LEFT, padx=10)
+        self.examine_btn.pack(side=self.ui.LEFT, padx=10)
         
-        self.spin_btn = tk.Button(
+        self.spin_btn = self.ui.Button(
             action_frame,
             text="Spin Lazy Susan",
             font=('Arial', 12, 'bold'),
@@ -114,13 +191,13 @@ class CoinGameGUI:
             command=self.spin_lazy_susan,
             state='disabled'  # Initially disabled until cups are examined
         )
-        self.spin_btn.pack(side=tk.LEFT, padx=10)
+        self.spin_btn.pack(side=self.ui.LEFT, padx=10)
         
         # Flip options (initially hidden)
-        self.flip_frame = tk.Frame(self.root, bg=self.colors['bg'])
+        self.flip_frame = self.ui.Frame(self.root, bg=self.colors['bg'])
         self.flip_frame.pack(pady=20)
         
-        self.flip_label = tk.Label(
+        self.flip_label = self.ui.Label(
             self.flip_frame,
             text="Which coins would you like to flip?",
             font=('Arial', 12, 'bold'),
@@ -129,10 +206,10 @@ class CoinGameGUI:
         )
         self.flip_label.pack()
         
-        flip_buttons_frame = tk.Frame(self.flip_frame, bg=self.colors['bg'])
+        flip_buttons_frame = self.ui.Frame(self.flip_frame, bg=self.colors['bg'])
         flip_buttons_frame.pack(pady=10)
         
-        self.flip_none_btn = tk.Button(
+        self.flip_none_btn = self.ui.Button(
             flip_buttons_frame,
             text="Flip Neither",
             font=('Arial', 10),
@@ -140,9 +217,9 @@ class CoinGameGUI:
             fg=self.colors['text'],
             command=lambda: self.flip_coins(0)
         )
-        self.flip_none_btn.pack(side=tk.LEFT, padx=5)
+        self.flip_none_btn.pack(side=self.ui.LEFT, padx=5)
         
-        self.flip_first_btn = tk.Button(
+        self.flip_first_btn = self.ui.Button(
             flip_buttons_frame,
             text="Flip First Cup",
             font=('Arial', 10),
@@ -150,9 +227,9 @@ class CoinGameGUI:
             fg=self.colors['text'],
             command=lambda: self.flip_coins(1)
         )
-        self.flip_first_btn.pack(side=tk.LEFT, padx=5)
+        self.flip_first_btn.pack(side=self.ui.LEFT, padx=5)
         
-        self.flip_second_btn = tk.Button(
+        self.flip_second_btn = self.ui.Button(
             flip_buttons_frame,
             text="Flip Second Cup",
             font=('Arial', 10),
@@ -160,9 +237,9 @@ class CoinGameGUI:
             fg=self.colors['text'],
             command=lambda: self.flip_coins(2)
         )
-        self.flip_second_btn.pack(side=tk.LEFT, padx=5)
+        self.flip_second_btn.pack(side=self.ui.LEFT, padx=5)
         
-        self.flip_both_btn = tk.Button(
+        self.flip_both_btn = self.ui.Button(
             flip_buttons_frame,
             text="Flip Both Cups",
             font=('Arial', 10),
@@ -170,16 +247,16 @@ class CoinGameGUI:
             fg=self.colors['text'],
             command=lambda: self.flip_coins(3)
         )
-        self.flip_both_btn.pack(side=tk.LEFT, padx=5)
+        self.flip_both_btn.pack(side=self.ui.LEFT, padx=5)
         
         # Hide flip options initially
         self.flip_frame.pack_forget()
         
         # Game control buttons
-        control_frame = tk.Frame(self.root, bg=self.colors['bg'])
+        control_frame = self.ui.Frame(self.root, bg=self.colors['bg'])
         control_frame.pack(pady=20)
         
-        self.new_game_btn = tk.Button(
+        self.new_game_btn = self.ui.Button(
             control_frame,
             text="New Game",
             font=('Arial', 12, 'bold'),
@@ -189,9 +266,9 @@ class CoinGameGUI:
             bd=2,
             command=self.new_game
         )
-        self.new_game_btn.pack(side=tk.LEFT, padx=10)
+        self.new_game_btn.pack(side=self.ui.LEFT, padx=10)
         
-        self.malicious_btn = tk.Button(
+        self.malicious_btn = self.ui.Button(
             control_frame,
             text="Enable Puzzle Mode",
             font=('Arial', 12, 'bold'),
@@ -201,9 +278,9 @@ class CoinGameGUI:
             bd=2,
             command=self.toggle_malicious_mode
         )
-        self.malicious_btn.pack(side=tk.LEFT, padx=10)
+        self.malicious_btn.pack(side=self.ui.LEFT, padx=10)
         
-        self.strategy_btn = tk.Button(
+        self.strategy_btn = self.ui.Button(
             control_frame,
             text="Strategy Hint",
             font=('Arial', 12, 'bold'),
@@ -213,10 +290,34 @@ class CoinGameGUI:
             bd=2,
             command=self.show_strategy
         )
-        self.strategy_btn.pack(side=tk.LEFT, padx=10)
+        self.strategy_btn.pack(side=self.ui.LEFT, padx=10)
+        
+        self.autoplay_btn = self.ui.Button(
+            control_frame,
+            text="Autoplay",
+            font=('Arial', 12, 'bold'),
+            bg='#9b59b6',
+            fg=self.colors['text'],
+            relief='raised',
+            bd=2,
+            command=self.toggle_autoplay
+        )
+        self.autoplay_btn.pack(side=self.ui.LEFT, padx=10)
+        
+        self.speed_btn = self.ui.Button(
+            control_frame,
+            text=f"Speed: {self.AUTOPLAY_SPEEDS[self.autoplay_speed][0]}",
+            font=('Arial', 12, 'bold'),
+            bg='#9b59b6',
+            fg=self.colors['text'],
+            relief='raised',
+            bd=2,
+            command=self.cycle_autoplay_speed
+        )
+        self.speed_btn.pack(side=self.ui.LEFT, padx=10)
         
         # Status display
-        self.status_label = tk.Label(
+        self.status_label = self.ui.Label(
             self.root,
             text="Welcome! Select two cups to examine.",
             font=('Arial', 12),
@@ -226,38 +327,63 @@ class CoinGameGUI:
         )
         self.status_label.pack(pady=20)
         
+        # Autoplay throughput and handler latency
+        self.autoplay_label = self.ui.Label(
+            self.root,
+            text="",
+            font=('Courier', 10),
+            bg=self.colors['bg'],
+            fg=self.colors['text'],
+            justify='left'
+        )
+        self.autoplay_label.pack(pady=5)
+        
     def initialize_game(self):
         """Initialize a new game"""
-        while True:
-            self.coins = [random.choice(['H', 'T']) for _ in range(4)]
-            if len(set(self.coins)) > 1:
-                break
+        self.cancel_spin()
+        self.coins = state_to_coins(self.start_states.sample(self.rng), self.cups)
         self.turn_count = 0
         self.selected_cups = []
         self.game_active = True
         self.cups_examined = set()  # Reset examined cups
+        self.reset_belief()
+        self.move_trace.clear()
+        self.game_started = time.perf_counter()
+        if self.recorder is not None and self.cups == 4:
+            self.recorder.start_game(from_coins(self.coins))
         # Note: malicious_mode is NOT reset - it persists across games
         
         # Reset button states for new game
-        self.examine_btn.config(state='disabled')  # Disable examine until 2 cups selected
-        self.spin_btn.config(state='disabled')     # Disable spin until cups examined
+        self.render(self.examine_btn, state='disabled')  # Disable examine until 2 cups selected
+        self.render(self.spin_btn, state='disabled')     # Disable spin until cups examined
         
         self.update_display()
         self.hide_flip_options()
         
+    def render(self, widget, **options):
+        """Push only the widget options that differ from what was last drawn"""
+        drawn = self.drawn.setdefault(widget, {})
+        changed = {key: value for key, value in options.items() if key not in drawn or drawn[key] != value}
+        if changed:
+            widget.config(**changed)
+            drawn.update(changed)
+        
+    @traced
     def update_display(self):
         """Update the display"""
-        self.turn_label.config(text=f"Turn: {self.turn_count + 1}/{self.max_turns}")
+        self.render(self.turn_label, text=f"Turn: {self.turn_count + 1}/{self.max_turns}")
         
         # Update cup buttons
         for i, btn in enumerate(self.cup_buttons):
-            if i in self.selected_cups:
-                btn.config(bg=self.colors['cup_selected'])
+            if i == self.spin_position:
+                cup_bg = self.colors['cup_spin']
+            elif i in self.selected_cups:
+                cup_bg = self.colors['cup_selected']
             elif i in self.cups_examined:
                 # Examined cups get a different color to show they can be clicked to flip
-                btn.config(bg=self.colors['cup_highlight'])
+                cup_bg = self.colors['cup_highlight']
             else:
-                btn.config(bg=self.colors['cup_normal'])
+                cup_bg = self.colors['cup_normal']
             
             # Only show coin values if cups have been examined
             if hasattr(self, 'cups_examined') and i in self.cups_examined:
@@ -267,160 +393,156 @@ class CoinGameGUI:
                     coin_text = f"CUP {i+1}\n???\n(Click to flip)"
             else:
                 coin_text = f"CUP {i+1}"
-            btn.config(text=coin_text)
+            self.render(btn, bg=cup_bg, text=coin_text)
                 
-        # Update examine button state
-        if len(self.selected_cups) == 2:
-            self.examine_btn.config(state='normal')
+        # Update examine button state: one examination per turn, so it stays off until the spin
+        if len(self.selected_cups) == 2 and self.examined_pair is None:
+            self.render(self.examine_btn, state='normal')
         else:
-            self.examine_btn.config(state='disabled')
+            self.render(self.examine_btn, state='disabled')
             
+    @traced
     def select_cup(self, cup_index):
         """Handle cup selection"""
-        print(f"DEBUG: select_cup called with index: {cup_index}")
-        print(f"DEBUG: game_active: {self.game_active}")
-        
-        if not self.game_active:
-            print("DEBUG: Cup selection blocked - game not active")
+        if not self.game_active or self.spin_job is not None:
+            if TRACE.enabled:
+                TRACE.emit('select_cup', cup_index, 'blocked')
             return
         
         # If cup is already examined, flip the coin instead of selecting
         if cup_index in self.cups_examined:
-            print(f"DEBUG: Cup {cup_index} is examined, flipping coin instead")
+            if TRACE.enabled:
+                TRACE.emit('select_cup', cup_index, 'flip')
             self.flip_single_coin(cup_index)
             return
             
         if cup_index in self.selected_cups:
             # Deselect cup (only if not examined)
-            print(f"DEBUG: Deselecting cup {cup_index}")
+            action = 'deselect'
             self.selected_cups.remove(cup_index)
         else:
             # Select cup
             if len(self.selected_cups) < 2:
-                print(f"DEBUG: Adding cup {cup_index} to selection")
+                action = 'select'
                 self.selected_cups.append(cup_index)
             else:
                 # Replace first selection
-                print(f"DEBUG: Replacing first selection with cup {cup_index}")
+                action = 'replace'
                 self.selected_cups[0] = cup_index
                 
-        print(f"DEBUG: Updated selected_cups: {self.selected_cups}")
+        if TRACE.enabled:
+            TRACE.emit('select_cup', cup_index, action)
         self.update_display()
         
+    @traced
     def examine_cups(self):
         """Examine the selected cups"""
-        print(f"DEBUG: examine_cups called with selected_cups: {self.selected_cups}")
-        print(f"DEBUG: game_mode: {self.game_mode}")
-        print(f"DEBUG: game_active: {self.game_active}")
-        print(f"DEBUG: malicious_mode: {self.malicious_mode}")
-        
-        if len(self.selected_cups) != 2:
-            print(f"DEBUG: Wrong number of cups selected: {len(self.selected_cups)}")
+        if len(self.selected_cups) != 2 or self.spin_job is not None or self.examined_pair is not None:
             return
         
         # In malicious mode, the game will rotate the coins to give you the worst possible state
+        self.examined_rotation = 0
         if self.malicious_mode:
             self.perform_malicious_rotation()
-            print(f"DEBUG: Puzzle mode rotated coins to: {self.coins}")
             
         # Mark the selected cups as examined (no interference with selection in malicious mode)
         self.cups_examined.update(self.selected_cups)
+        self.examined_pair = tuple(self.selected_cups)
+        self.examined_coins = tuple(self.coins[cup] for cup in self.examined_pair)
+        
+        if TRACE.enabled:
+            TRACE.emit('examine', self.examined_pair, self.examined_coins, self.game_mode, self.malicious_mode)
         
         if self.game_mode == 'blind':
-            print("DEBUG: Blind mode - showing flip options")
-            self.status_label.config(text="You cannot see the coins in blind mode! Choose your flip strategy.")
+            self.render(self.status_label, text="You cannot see the coins in blind mode! Choose your flip strategy.")
         else:
-            cup1, cup2 = self.selected_cups
-            coin1, coin2 = self.coins[cup1], self.coins[cup2]
-            print(f"DEBUG: Human mode - showing coins: Cup {cup1+1}={coin1}, Cup {cup2+1}={coin2}")
-            self.status_label.config(text="You can see the coin values under each cup. Choose your flip strategy.")
+            self.render(self.status_label, text="You can see the coin values under each cup. Choose your flip strategy.")
             
-        print("DEBUG: About to call show_flip_options")
         self.update_display()  # Update display to show coin values
         self.show_flip_options()
         
     def show_flip_options(self):
         """Show the flip options"""
-        print("DEBUG: show_flip_options called")
-        print(f"DEBUG: flip_frame exists: {self.flip_frame is not None}")
-        print(f"DEBUG: flip_frame.winfo_exists(): {self.flip_frame.winfo_exists()}")
-        
         try:
             self.flip_frame.pack()
-            print("DEBUG: flip_frame.pack() successful")
         except Exception as e:
-            print(f"DEBUG: Error packing flip_frame: {e}")
+            if TRACE.enabled:
+                TRACE.emit('widget_error', 'show_flip_options', str(e))
             
-        self.examine_btn.config(state='disabled')
-        self.spin_btn.config(state='normal')  # Enable spin button after examine
-        print("DEBUG: examine_btn disabled, spin_btn enabled")
+        self.render(self.examine_btn, state='disabled')
+        self.render(self.spin_btn, state='normal')  # Enable spin button after examine
         
     def hide_flip_options(self):
         """Hide the flip options"""
         try:
             if self.flip_frame.winfo_exists():
                 self.flip_frame.pack_forget()
-                print("DEBUG: flip_frame hidden successfully")
-            else:
-                print("DEBUG: flip_frame doesn't exist, can't hide")
         except Exception as e:
-            print(f"DEBUG: Error hiding flip_frame: {e}")
-            
-        self.examine_btn.config(state='normal')
-        print("DEBUG: examine_btn enabled")
+            if TRACE.enabled:
+                TRACE.emit('widget_error', 'hide_flip_options', str(e))
         
+    @traced
     def flip_coins(self, choice):
         """Apply coin flips based on choice"""
-        if len(self.selected_cups) != 2:
+        if len(self.selected_cups) != 2 or self.spin_job is not None:
             return
             
         cup1, cup2 = self.selected_cups
+        if TRACE.enabled:
+            TRACE.emit('flip', (cup1, cup2), choice, tuple(self.coins))
         
         if choice == 1:  # Flip first cup
             self.coins[cup1] = 'T' if self.coins[cup1] == 'H' else 'H'
-            self.status_label.config(text=f"Flipped cup {cup1+1} to {'Heads' if self.coins[cup1] == 'H' else 'Tails'}")
+            self.render(self.status_label, text=f"Flipped cup {cup1+1} to {'Heads' if self.coins[cup1] == 'H' else 'Tails'}")
         elif choice == 2:  # Flip second cup
             self.coins[cup2] = 'T' if self.coins[cup2] == 'H' else 'H'
-            self.status_label.config(text=f"Flipped cup {cup2+1} to {'Heads' if self.coins[cup2] == 'H' else 'Tails'}")
+            self.render(self.status_label, text=f"Flipped cup {cup2+1} to {'Heads' if self.coins[cup2] == 'H' else 'Tails'}")
         elif choice == 3:  # Flip both cups
             self.coins[cup1] = 'T' if self.coins[cup1] == 'H' else 'H'
             self.coins[cup2] = 'T' if self.coins[cup2] == 'H' else 'H'
-            self.status_label.config(text="Flipped both cups!")
+            self.render(self.status_label, text="Flipped both cups!")
         else:  # No flip
-            self.status_label.config(text="No coins flipped.")
+            self.render(self.status_label, text="No coins flipped.")
             
         self.hide_flip_options()
         self.selected_cups = []
         
         # Check win condition
         if self.check_win_condition():
+            self.record_turn()
             self.game_won()
         else:
             # Update display after coin flips to show new coin values
             self.update_display()
     
+    @traced
     def flip_single_coin(self, cup_index):
         """Flip a single coin when clicking on an examined cup"""
         if cup_index not in self.cups_examined:
             return
             
         # Flip the coin
+        if TRACE.enabled:
+            TRACE.emit('flip', (cup_index,), 1, tuple(self.coins))
         self.coins[cup_index] = 'T' if self.coins[cup_index] == 'H' else 'H'
-        print(f"DEBUG: Flipped single coin in cup {cup_index} to {self.coins[cup_index]}")
         
         # Update status
-        self.status_label.config(text=f"Flipped cup {cup_index+1} to {'Heads' if self.coins[cup_index] == 'H' else 'Tails'}")
+        self.render(self.status_label, text=f"Flipped cup {cup_index+1} to {'Heads' if self.coins[cup_index] == 'H' else 'Tails'}")
         
         # Update display to show new coin value
         self.update_display()
     
     def perform_malicious_rotation(self):
         """Rotate the entire Lazy Susan to give the player the worst possible state"""
-        # Count current coin distribution
-        heads_count = self.coins.count('H')
-        tails_count = self.coins.count('T')
-        
-        print(f"DEBUG: Puzzle rotation - Current coins: {self.coins}, H:{heads_count}, T:{tails_count}")
+        if self.cups == 4:
+            # Every (state, selection) answer is precomputed in coin_game_adversary
+            state = from_coins(self.coins)
+            best_rotation = RESPONSE_TABLE[tuple(self.selected_cups)][state]
+            self.coins = to_coins(ROTATE[best_rotation][state])
+            self.examined_rotation = best_rotation
+            if TRACE.enabled:
+                TRACE.emit('puzzle_rotation', best_rotation * 90, tuple(self.coins))
+            return
         
         # Puzzle rotation logic: rotate the entire 2x2 grid to give worst possible state
         # The coins stay in their relative positions, but the whole grid rotates
@@ -429,7 +551,7 @@ class CoinGameGUI:
         best_rotation = 0  # 0° = no rotation
         worst_score = float('inf')  # Lower is worse for the player
         
-        for rotation in range(4):  # 0, 1, 2, 3 rotations of 90°
+        for rotation in range(self.cups):  # 0, 1, 2, 3 rotations of 90° on the grid, one per cup on a ring
             rotated_coins = self.rotate_coins(self.coins, rotation)
             
             # Calculate how bad this rotation is for the player
@@ -441,22 +563,19 @@ class CoinGameGUI:
         
         # Apply the worst rotation
         self.coins = self.rotate_coins(self.coins, best_rotation)
-        print(f"DEBUG: Puzzle rotation completed - Applied {best_rotation * 90}° rotation, new coins: {self.coins}")
+        if TRACE.enabled:
+            TRACE.emit('puzzle_rotation', best_rotation * 360 // self.cups, tuple(self.coins))
     
     def rotate_coins(self, coins, rotations):
         """Rotate the 2x2 grid of coins by the given number of 90° rotations"""
         # Coins are arranged as: [0, 1, 2, 3] representing:
         # 0 1
         # 2 3
-        
-        if rotations == 0:
-            return coins.copy()
-        elif rotations == 1:  # 90° clockwise
-            return [coins[2], coins[0], coins[3], coins[1]]
-        elif rotations == 2:  # 180°
-            return [coins[3], coins[2], coins[1], coins[0]]
-        elif rotations == 3:  # 270° clockwise (90° counterclockwise)
-            return [coins[1], coins[3], coins[0], coins[2]]
+        if self.cups != 4:
+            # Ring layout: every coin moves one place clockwise per step
+            rotations %= self.cups
+            return coins[-rotations:] + coins[:-rotations] if rotations else coins.copy()
+        return [coins[cup] for cup in ROTATIONS[rotations]]
     
     def calculate_malicious_score(self, coins, selected_cups):
         """Calculate how bad this coin arrangement is for the player (lower = worse)"""
@@ -468,13 +587,17 @@ class CoinGameGUI:
 
         total_tails = coins.count('T')
         total_heads = coins.count('H')  
+        # Thresholds scale with the table: one coin off on any ring, an even split, etc.
+        cups = len(coins)
+        revealed = len(selected_coins)
         
         # Score based on how unhelpful this combination is
-        if (total_tails == 3 and tails_in_selected == 2) or (total_heads == 3 and heads_in_selected == 2):
-            # Two heads - bad if player wants all tails
+        if (total_tails == cups - 1 and tails_in_selected == revealed) or \
+                (total_heads == cups - 1 and heads_in_selected == revealed):
+            # Only the majority face is visible - the odd coin out stays hidden
             return 1
-        elif (total_tails == 2 and heads_in_selected == 1):
-            # Two tails - bad if player wants all heads
+        elif total_tails == cups // 2 and 0 < heads_in_selected < revealed:
+            # Evenly split table and a mixed look - no clue which face to aim for
             return 1
         else:
             # Mixed or other combinations
@@ -495,40 +618,97 @@ class CoinGameGUI:
     def game_won(self):
         """Handle game win"""
         self.game_active = False
-        messagebox.showinfo(
-            "Congratulations! 🎉",
-            f"You won in {self.turn_count + 1} turns!\nFinal state: {self.coins}"
-        )
-        self.status_label.config(text="🎉 YOU WON! 🎉")
+        self.save_result(True)
+        if self.autoplay_actions is None:  # A modal box would stall autoplay
+            self.ui.messagebox.showinfo(
+                "Congratulations! 🎉",
+                f"You won in {self.turn_count + 1} turns!\nFinal state: {self.coins}"
+            )
+        self.render(self.status_label, text="🎉 YOU WON! 🎉")
         
     def game_lost(self):
         """Handle game loss"""
         self.game_active = False
-        messagebox.showinfo(
-            "Game Over 😔",
-            f"You didn't win within {self.max_turns} turns.\nFinal state: {self.coins}"
+        self.save_result(False)
+        if self.autoplay_actions is None:
+            self.ui.messagebox.showinfo(
+                "Game Over 😔",
+                f"You didn't win within {self.max_turns} turns.\nFinal state: {self.coins}"
+            )
+        self.render(self.status_label, text="😔 Game Over - You didn't win within the time limit.")
+        
+    def save_result(self, won):
+        """Queue the finished game for the store, if there is one"""
+        if self.store is None:
+            return
+        self.store.add(
+            mode=self.game_mode,
+            player=self.autoplay_strategy.name if self.autoplay_actions is not None else 'human',
+            puzzle=self.malicious_mode,
+            cups=self.cups,
+            won=won,
+            spins=self.turn_count + 1 if won else self.turn_count,
+            trace_hash=hashlib.blake2b(self.move_trace, digest_size=8).hexdigest(),
+            duration_ms=(time.perf_counter() - self.game_started) * 1000,
         )
-        self.status_label.config(text="😔 Game Over - You didn't win within the time limit.")
         
+    @traced
     def spin_lazy_susan(self):
         """Simulate spinning the Lazy Susan"""
-        if not self.game_active:
+        if not self.game_active or self.spin_job is not None:
             return
             
-        self.status_label.config(text="🎠 Spinning the Lazy Susan...")
-        self.root.update()
-        time.sleep(0.3)  # Reduced from 1 second to 0.3 seconds
+        self.render(self.status_label, text="🎠 Spinning the Lazy Susan...")
+        self.render(self.spin_btn, state='disabled')
+        # Animate with root.after so the event loop keeps handling input while the table turns
+        self.spin_frames_left = 6
+        self.spin_position = 0
+        self.update_display()
+        self.spin_job = self.root.after(self.spin_frame_ms, self.animate_spin)
+        
+    @traced
+    def animate_spin(self):
+        """Advance the spin animation one frame, finishing the spin after the last"""
+        self.spin_frames_left -= 1
+        if self.spin_frames_left > 0:
+            self.spin_position = (self.spin_position + 1) % self.cups
+            self.update_display()
+            self.spin_job = self.root.after(self.spin_frame_ms, self.animate_spin)
+            return
+        
+        self.spin_job = None
+        self.spin_position = None
+        self.finish_spin()
+        
+    def cancel_spin(self):
+        """Stop a spin animation in progress without finishing the spin"""
+        if self.spin_job is not None:
+            self.root.after_cancel(self.spin_job)
+            self.spin_job = None
+        self.spin_position = None
+        
+    def finish_spin(self):
+        """Resolve the spin once the animation is over"""
+        self.record_turn()
         
         # Check win condition before resetting
         if self.check_win_condition():
+            if TRACE.enabled:
+                TRACE.emit('spin', self.turn_count, 'won')
             self.game_won()
             return
         
+        self.update_belief()
+        
         # Increment turn count when spinning
         self.turn_count += 1
         if self.turn_count >= self.max_turns:
+            if TRACE.enabled:
+                TRACE.emit('spin', self.turn_count, 'lost')
             self.game_lost()
             return
+        if TRACE.enabled:
+            TRACE.emit('spin', self.turn_count, 'continue')
         
         # Clear selection and hide flip options
         self.selected_cups = []
@@ -536,80 +716,292 @@ class CoinGameGUI:
         try:
             self.hide_flip_options()
         except Exception as e:
-            print(f"DEBUG: Error in spin_lazy_susan when hiding flip options: {e}")
+            if TRACE.enabled:
+                TRACE.emit('widget_error', 'finish_spin', str(e))
         
         # Reset button states for next round
-        self.examine_btn.config(state='disabled')  # Disable examine until 2 cups selected
-        self.spin_btn.config(state='disabled')     # Disable spin until cups examined
+        self.render(self.examine_btn, state='disabled')  # Disable examine until 2 cups selected
+        self.render(self.spin_btn, state='disabled')     # Disable spin until cups examined
         
         self.update_display()
         
-        self.status_label.config(text="The Lazy Susan has spun! Select two cups to examine.")
+        self.render(self.status_label, text="The Lazy Susan has spun! Select two cups to examine.")
+        
+    def reset_belief(self):
+        """Forget everything the player has learned about the coins"""
+        if self.tracker is not None:
+            self.tracker.reset()
+        self.examined_pair = None
+        self.examined_coins = None
+        
+    def examined_flip_choice(self):
+        """Net flip choice (0-3) made on the examined cups since they were examined"""
+        cup1, cup2 = self.examined_pair
+        return (self.coins[cup1] != self.examined_coins[0]) | (self.coins[cup2] != self.examined_coins[1]) << 1
+        
+    def record_turn(self):
+        """Add the finished turn to the move trace and the game recorder, if there is one"""
+        if self.examined_pair is None:
+            return
+        choice = self.examined_flip_choice()
+        self.move_trace += bytes((*self.examined_pair, self.examined_rotation, choice))
+        if self.recorder is not None and self.cups == 4:
+            self.recorder.record_turn(self.examined_pair, self.examined_rotation, choice)
+        
+    def turn_belief(self):
+        """The player's belief including this turn's examination and flips so far"""
+        tracker = BeliefTracker(self.tracker.belief)
+        if self.examined_pair is not None:
+            if self.malicious_mode:
+                tracker.spin()  # Puzzle mode turned the table before the cups were lifted
+            tracker.observe(self.examined_pair, self.examined_coins if self.game_mode == 'human' else None)
+            tracker.flip(self.examined_pair, self.examined_flip_choice())
+        return tracker
+        
+    def update_belief(self):
+        """Fold this turn's examination and flips into the player's belief"""
+        if self.examined_pair is None:
+            return
+        if self.tracker is not None:
+            self.tracker = self.turn_belief()
+            self.tracker.end_turn()
+        self.examined_pair = None
+        self.examined_coins = None
         
+    @traced
     def new_game(self):
         """Start a new game"""
         self.initialize_game()
-        self.status_label.config(text="New game started! Select two cups to examine.")
+        self.render(self.status_label, text="New game started! Select two cups to examine.")
         self.update_display()  # Ensure display is updated for new game
         
     def toggle_mode(self):
         """Toggle between human and blind modes"""
+        self.cancel_spin()  # A spin finishing after the switch would resolve against the reset turn
+        if self.autoplay_actions is not None:
+            self.stop_autoplay()  # The bot's strategy was chosen for the old mode
         if self.game_mode == 'human':
             self.game_mode = 'blind'
-            self.mode_btn.config(text="Switch to Human Mode")
+            self.render(self.mode_btn, text="Switch to Human Mode")
         else:
             self.game_mode = 'human'
-            self.mode_btn.config(text="Switch to Blind Mode")
+            self.render(self.mode_btn, text="Switch to Blind Mode")
             
         # Reset examined cups when switching modes
         self.cups_examined = set()
+        self.reset_belief()
         # Reset button states when switching modes
-        self.examine_btn.config(state='disabled')
-        self.spin_btn.config(state='disabled')
+        self.render(self.examine_btn, state='disabled')
+        self.render(self.spin_btn, state='disabled')
         self.update_display()
     
+    def toggle_autoplay(self):
+        """Start or stop the autoplay bot"""
+        if self.autoplay_actions is None:
+            self.start_autoplay()
+        else:
+            self.stop_autoplay()
+    
+    def start_autoplay(self, strategy=None, games=None):
+        """Let a strategy play, optionally for a fixed number of games
+
+        The default is the compiled optimal plan, or the blind plan in blind
+        mode, where only strategies that never look at the coins may play.
+        """
+        if self.cups != 4:
+            self.render(self.status_label, text="Autoplay needs the classic four cups.")
+            return
+        if strategy is None:
+            strategy = self.policy if self.game_mode == 'human' else STRATEGIES['blind']
+        if not isinstance(strategy, PolicyTable):
+            strategy = compile_strategy(strategy, self.max_turns)
+        if self.game_mode == 'blind' and not strategy.blind:
+            self.render(self.status_label, text=f"'{strategy.name}' looks at the coins, so it cannot play blind mode.")
+            return
+        self.autoplay_strategy = strategy
+        self.autoplay_limit = games
+        self.autoplay_games = 0
+        self.autoplay_wins = 0
+        self.autoplay_moves = 0
+        # Handler latency comes from the tracer's timings
+        self.autoplay_tracing = not TRACE.timing
+        if self.autoplay_tracing:
+            TRACE.handler_stats.clear()
+            TRACE.enable(TIMINGS)
+        self.autoplay_started = self.autoplay_shown = time.perf_counter()
+        self.autoplay_actions = self.bot_actions()
+        self.apply_autoplay_speed()
+        self.render(self.autoplay_btn, text="Stop Autoplay")
+        self.new_game()
+        self.autoplay_job = self.root.after(0, self.autoplay_step)
+    
+    def stop_autoplay(self):
+        """Stop the bot, leaving the current game where it is"""
+        if self.autoplay_job is not None:
+            self.root.after_cancel(self.autoplay_job)
+            self.autoplay_job = None
+        self.autoplay_actions = None
+        self.spin_frame_ms = 50
+        if self.autoplay_tracing:
+            TRACE.disable()
+            self.autoplay_tracing = False
+        self.show_autoplay_stats()
+        self.render(self.autoplay_btn, text="Autoplay")
+    
+    def cycle_autoplay_speed(self):
+        """Switch to the next autoplay speed"""
+        self.autoplay_speed = (self.autoplay_speed + 1) % len(self.AUTOPLAY_SPEEDS)
+        self.render(self.speed_btn, text=f"Speed: {self.AUTOPLAY_SPEEDS[self.autoplay_speed][0]}")
+        if self.autoplay_actions is not None:
+            self.apply_autoplay_speed()
+    
+    def apply_autoplay_speed(self):
+        """Keep the spin animation no slower than the bot's pace"""
+        self.spin_frame_ms = min(50, self.AUTOPLAY_SPEEDS[self.autoplay_speed][1])
+    
+    def bot_actions(self):
+        """Generator that performs one bot action per next() through the normal handlers"""
+        while True:
+            if not self.game_active:
+                self.new_game()
+                yield
+            strategy = self.autoplay_strategy
+            turn = self.turn_count
+            first, second = strategy.select(turn)
+            self.select_cup(first)
+            yield
+            self.select_cup(second)
+            yield
+            self.examine_cups()
+            yield
+            # A blind player sees nothing, as in update_belief()
+            choice = strategy.flip(turn, self.examined_coins if self.game_mode == 'human' else None)
+            for bit, cup in ((1, first), (2, second)):
+                if choice & bit:
+                    self.flip_single_coin(cup)
+                    yield
+            self.spin_lazy_susan()
+            while self.spin_job is not None:
+                yield
+            self.autoplay_moves += 1
+            if not self.game_active:
+                self.autoplay_games += 1
+                self.autoplay_wins += self.check_win_condition()
+    
+    @traced
+    def autoplay_step(self):
+        """Run the bot's next action and schedule the one after it"""
+        self.autoplay_job = None
+        if self.autoplay_actions is None:
+            return
+        next(self.autoplay_actions)
+        if time.perf_counter() - self.autoplay_shown >= 0.5:
+            self.show_autoplay_stats()
+        if self.autoplay_limit is not None and self.autoplay_games >= self.autoplay_limit:
+            self.stop_autoplay()
+            return
+        self.autoplay_job = self.root.after(self.AUTOPLAY_SPEEDS[self.autoplay_speed][1], self.autoplay_step)
+    
+    def show_autoplay_stats(self):
+        """Refresh the throughput and slowest-handler readout"""
+        now = time.perf_counter()
+        self.autoplay_shown = now
+        elapsed = max(now - self.autoplay_started, 1e-9)
+        lines = [f"Autoplay: {self.autoplay_wins}/{self.autoplay_games} won, {self.autoplay_games / elapsed:,.1f} games/sec, "
+                 f"{self.autoplay_moves / elapsed:,.1f} moves/sec"]
+        # Slowest handlers by mean latency
+        slowest = sorted(TRACE.handler_stats.items(), key=lambda item: item[1][1] / item[1][0], reverse=True)
+        for name, (calls, total_ns, max_ns) in slowest[:3]:
+            lines.append(f"{name:16} mean {total_ns / calls / 1000:8.1f} µs  max {max_ns / 1000:8.1f} µs")
+        self.render(self.autoplay_label, text="\n".join(lines))
+    
     def toggle_malicious_mode(self):
         """Toggle malicious mode on/off"""
+        self.cancel_spin()
         self.malicious_mode = not self.malicious_mode
         
         if self.malicious_mode:
-            self.malicious_btn.config(text="Disable Puzzle Mode", bg='#27ae60')
-            self.status_label.config(text="😈 MALICIOUS MODE ENABLED! The game will actively work against you!")
+            self.render(self.malicious_btn, text="Disable Puzzle Mode", bg='#27ae60')
+            self.render(self.status_label, text="😈 MALICIOUS MODE ENABLED! The game will actively work against you!")
         else:
-            self.malicious_btn.config(text="Enable Puzzle Mode", bg='#e74c3c')
-            self.status_label.config(text="Puzzle mode disabled. Normal gameplay restored.")
+            self.render(self.malicious_btn, text="Enable Puzzle Mode", bg='#e74c3c')
+            self.render(self.status_label, text="Puzzle mode disabled. Normal gameplay restored.")
         
         # Reset examined cups when toggling modes
         self.cups_examined = set()
+        self.reset_belief()
         # Reset button states when toggling modes
-        self.examine_btn.config(state='disabled')
-        self.spin_btn.config(state='disabled')
+        self.render(self.examine_btn, state='disabled')
+        self.render(self.spin_btn, state='disabled')
         self.update_display()
         
     def show_strategy(self):
         """Show strategy hint"""
-        strategy_text = """OPTIMAL STRATEGY (Guaranteed win in ≤4 turns):
+        # The turn guarantees are proven by the model checker, not just claimed
+        seeing = proven_worst_case('optimal')
+        blind = proven_worst_case('blind')
+        strategy_text = f"""OPTIMAL STRATEGY (Guaranteed win in ≤{seeing} turns):
 
-1. Always choose cups in a consistent pattern (e.g., always adjacent)
-2. If you see two different coins, flip one to make them the same
-3. If you see two same coins, don't flip them
+1. Diagonal cups (1 & 4): turn any tails to heads
+2. Adjacent cups (1 & 2): turn any tails to heads
+3. Diagonal cups: turn any tails to heads; if both are heads, flip one
+4. Adjacent cups: flip both
+5. Diagonal cups: flip both
 
-BLIND MODE STRATEGY:
-- Use the same consistent cup selection pattern
-- Always flip exactly one coin (creates pairs)
-- This also guarantees a win in ≤4 turns!
+BLIND MODE STRATEGY (Guaranteed win in ≤{blind} turns):
+- Without looking, flip: both diagonal, both adjacent, both diagonal,
+  one adjacent, both diagonal, both adjacent, both diagonal
 
 Why this works:
-- With only 4 coins, you'll see all of them within 4 turns
-- Making pairs the same creates a 'snowball effect'
-- The strategy is deterministic and guaranteed to succeed!"""
+- Each step shrinks the set of arrangements the spins can leave you in
+- Pairing coins is not enough: the spins can dodge any fixed pair forever
+- Both plans are checked against every possible spin (coin_game_verify.py)"""
+        
+        if self.tracker is not None and self.game_active:
+            belief = self.turn_belief()
+            strategy_text += f"\n\nWHAT YOU KNOW:\n{belief.possible_states} coin arrangements are still possible."
+            if belief.win_guaranteed:
+                strategy_text += "\nSpin now - a win is guaranteed!"
+        
+        if not self.malicious_mode and self.game_active and self.tracker is not None:
+            strategy_text += (f"\n\nTHIS TURN (step {self.turn_count % self.policy.period + 1} of the "
+                              f"{self.policy.period}-step plan):\n{describe_turn(self.policy, self.turn_count)}")
+        
+        if self.malicious_mode and self.game_active and self.tracker is not None:
+            turns, move = self.solver.search(self.tracker.belief, self.max_turns - self.turn_count)
+            if move is None:
+                strategy_text += "\n\nPUZZLE SOLVER:\nNo strategy can guarantee a win in the spins left."
+            else:
+                strategy_text += (f"\n\nPUZZLE SOLVER (guaranteed win in ≤{turns} more spins):\n"
+                                  f"{describe_move(move)}")
         
-        messagebox.showinfo("Strategy Hint", strategy_text)
+        self.ui.messagebox.showinfo("Strategy Hint", strategy_text)
 
 def main():
-    root = tk.Tk()
-    app = CoinGameGUI(root)
-    root.mainloop()
+    backend = tk_backend()
+    root = backend.Tk()
+    # Optional cup count, e.g. `python coin_game_gui.py 8` for eight cups in a ring
+    cups = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    # Every finished game is kept in COIN_GAME_DB (default coin_game.db); see coin_game_store.py
+    path = os.environ.get('COIN_GAME_DB', 'coin_game.db')
+    try:
+        store = GameStore(path)
+    except sqlite3.Error as error:
+        print(f"Games will not be saved: cannot open {path} ({error})", file=sys.stderr)
+        store = None
+    try:
+        app = CoinGameGUI(root, cups, backend=backend, store=store)
+        root.mainloop()
+    finally:
+        # COIN_GAME_TRACE=events (or timings/debug) records a trace; write it out on exit
+        if TRACE.timing:
+            TRACE.dump('coin_game_trace.jsonl')
+            print(TRACE.summary())
+        if store is not None:
+            try:
+                store.close()
+            except sqlite3.Error as error:
+                print(f"{store.dropped:,} games were not saved to {path} ({error})", file=sys.stderr)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,146 @@
+"""Exact turns-to-win distributions against random spins
+
+A strategy's only memory is the turn number, so once compiled to a policy
+table (coin_game_policy) its memory is the phase turn % period. The game is a
+Markov chain on (phase, coin state): each turn the table spins to one of four
+rotations with equal chance, the phase's cup pair is examined and flipped,
+and all-alike states absorb as wins. Rotation counts are kept as integers
+over a common denominator, so every probability is an exact Fraction:
+
+    result = analyze(STRATEGIES['optimal'])
+    result.win_probability(3), result.mean_spins(), result.tail(10)
+
+    python coin_game_markov.py        # every strategy, exact vs. sampled
+"""
+
+import math
+from fractions import Fraction
+
+from coin_game_policy import compile_strategy
+from coin_game_start import UNIFORM
+from coin_game_state import FLIP_MASK, IS_WIN, PEEK, ROTATE, STATES
+
+
+def phase_transitions(policy, phase):
+    """next_states[state] = the four states one turn later, one per rotation"""
+    cup_indices = policy.select(phase)
+    masks = FLIP_MASK[cup_indices]
+    peek = PEEK[cup_indices]
+    next_states = []
+    for state in range(STATES):
+        successors = []
+        for rotate in ROTATE:
+            rotated = rotate[state]
+            successors.append(rotated ^ masks[policy.flip(phase, peek[rotated])])
+        next_states.append(tuple(successors))
+    return next_states
+
+
+class ChainResult:
+    """Exact distribution of the turn a strategy wins on
+
+    wins[t] / denominators[t] is the chance of winning on turn t (t >= 1),
+    with denominators[t] = start denominator * 4**t.
+    """
+
+    def __init__(self, name, max_turns, wins, denominators):
+        self.name = name
+        self.max_turns = max_turns
+        self.wins = wins
+        self.denominators = denominators
+
+    def win_probability(self, turns):
+        """Chance of winning on exactly this turn"""
+        if not 1 <= turns <= self.max_turns:
+            return Fraction(0)
+        return Fraction(self.wins[turns], self.denominators[turns])
+
+    def distribution(self):
+        """[P(win on turn t) for t = 1..max_turns]"""
+        return [self.win_probability(turns) for turns in range(1, self.max_turns + 1)]
+
+    def win_rate(self):
+        """Chance of winning within max_turns"""
+        return sum(self.distribution(), Fraction(0))
+
+    def tail(self, turns):
+        """Chance of not having won after `turns` turns"""
+        return 1 - sum((self.win_probability(t) for t in range(1, min(turns, self.max_turns) + 1)), Fraction(0))
+
+    def mean_spins(self):
+        """Expected turns to win, over games that win; None if none can"""
+        win_rate = self.win_rate()
+        if not win_rate:
+            return None
+        return sum((turns * self.win_probability(turns) for turns in range(1, self.max_turns + 1)),
+                   Fraction(0)) / win_rate
+
+    def percentile(self, pct):
+        """Smallest t with P(win by t | win) >= pct%, matching coin_game_stats' nearest rank"""
+        win_rate = self.win_rate()
+        if not win_rate:
+            return None
+        target = win_rate * Fraction(pct) / 100
+        total = Fraction(0)
+        for turns in range(1, self.max_turns + 1):
+            total += self.win_probability(turns)
+            if total >= target:
+                return turns
+
+    def worst_case(self):
+        """Longest win with non-zero probability"""
+        return max((turns for turns in range(1, self.max_turns + 1) if self.wins[turns]), default=None)
+
+
+def analyze(strategy, max_turns=50, start_states=UNIFORM):
+    """Exact turns-to-win distribution of a strategy against uniformly random spins"""
+    policy = compile_strategy(strategy, max_turns)
+    transitions = [phase_transitions(policy, phase) for phase in range(policy.period)]
+
+    # Integer weight of each coin state over a common denominator
+    start = [start_states.probability(state) for state in range(STATES)]
+    denominator = math.lcm(*(p.denominator for p in start))
+    vector = [p.numerator * (denominator // p.denominator) for p in start]
+
+    wins = [0] * (max_turns + 1)
+    denominators = [denominator] * (max_turns + 1)
+    for turn in range(max_turns):
+        next_states = transitions[turn % policy.period]
+        advanced = [0] * STATES
+        for state, weight in enumerate(vector):
+            if weight:
+                for successor in next_states[state]:
+                    advanced[successor] += weight
+        denominator *= 4
+        won = sum(advanced[state] for state in range(STATES) if IS_WIN[state])
+        wins[turn + 1] = won
+        denominators[turn + 1] = denominator
+        vector = [0 if IS_WIN[state] else weight for state, weight in enumerate(advanced)]
+        if not any(vector):
+            break
+    return ChainResult(policy.name, max_turns, wins, denominators)
+
+
+def main():
+    import sys
+    import time
+
+    from coin_game_engine import STRATEGIES, run_games
+
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{'strategy':12} {'win rate':>9} {'mean':>7} {'P(>10)':>10} {'p99':>4} {'worst':>5} "
+          f"{'exact µs':>9}  sampled ({games:,} games)")
+    for name, strategy in STRATEGIES.items():
+        start = time.perf_counter()
+        result = analyze(strategy)
+        elapsed = time.perf_counter() - start
+        wins, turns_histogram = run_games(strategy, games, seed=0)
+        sampled_mean = sum(t * n for t, n in turns_histogram.items()) / wins if wins else float('nan')
+        mean = result.mean_spins()
+        print(f"{name:12} {float(result.win_rate()):9.4%} {float(mean) if mean else float('nan'):7.3f} "
+              f"{float(result.tail(10)):10.3e} {result.percentile(99) or '-':>4} {result.worst_case() or '-':>5} "
+              f"{elapsed * 1e6:9.0f}  win rate {wins / games:.4%}, mean {sampled_mean:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Compile strategies into flat policy tables
+
+A strategy's decisions depend only on the turn number and, for flips, the two
+coins seen. compile_strategy() asks the strategy for every one of those
+decisions up to max_turns, detects the shortest period the decisions repeat
+with, and stores each turn of the period as two bytes: the ordered cup pair
+and the four flip choices (two bits per observation). The resulting
+PolicyTable is itself a Strategy, so it plugs into the headless engine, the
+vectorized simulator, the tournament and the GUI, and every decision is a
+couple of indexing operations.
+
+    python coin_game_policy.py optimal optimal.cgp    # compile, verify, save
+"""
+
+import struct
+
+from coin_game_engine import STRATEGIES, Strategy
+from coin_game_records import ORDERED_PAIRS, PAIR_INDEX
+
+MAGIC = b'CGPT'
+VERSION = 1
+HEADER = struct.Struct('<4sBHH')  # magic, version, period, name length
+
+OBSERVATIONS = (('T', 'T'), ('H', 'T'), ('T', 'H'), ('H', 'H'))
+# Bit offset of each observation's flip choice in a slot's choice byte
+OBSERVATION_SHIFT = {observed: 2 * i for i, observed in enumerate(OBSERVATIONS)}
+
+
+class PolicyTable(Strategy):
+    """A strategy frozen into a table of (cup pair, flip choices) per turn of its period"""
+
+    def __init__(self, name, table):
+        self.table = bytes(table)
+        self.period = len(self.table) // 2
+        pairs = [ORDERED_PAIRS[pair_index] for pair_index in self.table[0::2]]
+        # Unpacked once so a decision is two indexing operations
+        flips = [{observed: choices >> shift & 3 for observed, shift in OBSERVATION_SHIFT.items()}
+                 for choices in self.table[1::2]]
+        # A turn whose choice is the same whatever is seen can also be played unseen (observed=None)
+        for turn_flips in flips:
+            if len(set(turn_flips.values())) == 1:
+                turn_flips[None] = turn_flips[OBSERVATIONS[0]]
+        # True when no flip depends on the coins, so the policy can play blind mode
+        self.blind = all(None in turn_flips for turn_flips in flips)
+        period = self.period
+
+        def select(turn):
+            return pairs[turn % period]
+
+        def flip(turn, observed):
+            return flips[turn % period][observed]
+
+        super().__init__(name, select, flip)
+
+    def move(self, turn):
+        """(cup_indices, {observed: choice}) for a turn"""
+        return self.select(turn), {observed: self.flip(turn, observed) for observed in OBSERVATIONS}
+
+
+def compile_strategy(strategy, max_turns=50):
+    """Freeze a strategy's decisions for turns 0..max_turns-1 into a PolicyTable"""
+    slots = []
+    for turn in range(max_turns):
+        cup_indices = tuple(strategy.select(turn))
+        choices = 0
+        for observed in OBSERVATIONS:
+            choice = strategy.flip(turn, observed)
+            if choice not in (0, 1, 2, 3):
+                raise ValueError(f"{strategy.name} returned flip choice {choice!r} on turn {turn}")
+            choices |= choice << OBSERVATION_SHIFT[observed]
+        slots.append((PAIR_INDEX[cup_indices], choices))
+
+    # Shortest period that reproduces every compiled turn
+    period = next(p for p in range(1, max_turns + 1)
+                  if all(slots[turn] == slots[turn % p] for turn in range(max_turns)))
+    table = bytearray()
+    for pair_index, choices in slots[:period]:
+        table += bytes((pair_index, choices))
+    return PolicyTable(strategy.name, table)
+
+
+def verify(strategy, policy, max_turns=50):
+    """Every (turn, decision) where the table disagrees with the strategy; empty when they match"""
+    mismatches = []
+    for turn in range(max_turns):
+        if tuple(strategy.select(turn)) != policy.select(turn):
+            mismatches.append((turn, 'select', tuple(strategy.select(turn)), policy.select(turn)))
+        for observed in OBSERVATIONS:
+            expected = strategy.flip(turn, observed)
+            actual = policy.flip(turn, observed)
+            if expected != actual:
+                mismatches.append((turn, observed, expected, actual))
+    return mismatches
+
+
+def save_policy(policy, path):
+    """Write a policy table to disk"""
+    name = policy.name.encode()
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, policy.period, len(name)))
+        f.write(name)
+        f.write(policy.table)
+
+
+def load_policy(path):
+    """Read a policy table written by save_policy"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is not a policy table")
+    magic, version, period, name_length = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} policy table")
+    name = data[HEADER.size:HEADER.size + name_length].decode()
+    table = data[HEADER.size + name_length:]
+    if len(table) != 2 * period:
+        raise ValueError(f"{path} is truncated")
+    return PolicyTable(name, table)
+
+
+def resolve_strategy(name, max_turns=50):
+    """A registered strategy compiled to a table, or a saved policy table by file path"""
+    if name in STRATEGIES:
+        return compile_strategy(STRATEGIES[name], max_turns)
+    return load_policy(name)
+
+
+def describe_turn(policy, turn):
+    """Human-readable advice for one turn of a policy"""
+    cup_indices, flips = policy.move(turn)
+    names = ('neither', 'the first', 'the second', 'both')
+    lines = [f"Examine cups {cup_indices[0]+1} and {cup_indices[1]+1}."]
+    for observed, choice in flips.items():
+        lines.append(f"  If you see {observed[0]}{observed[1]}, flip {names[choice]}.")
+    return "\n".join(lines)
+
+
+def main():
+    import sys
+
+    if len(sys.argv) != 3:
+        print("usage: python coin_game_policy.py <strategy> <output file>")
+        sys.exit(2)
+    strategy = STRATEGIES[sys.argv[1]]
+    policy = compile_strategy(strategy)
+    mismatches = verify(strategy, policy)
+    if mismatches:
+        for mismatch in mismatches:
+            print("MISMATCH", mismatch)
+        sys.exit(1)
+    save_policy(policy, sys.argv[2])
+    print(f"{policy.name}: period {policy.period}, {len(policy.table)} bytes, verified -> {sys.argv[2]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Compact binary game records
+
+A record file is an 8-byte header followed by a stream of one-byte records:
+
+    0-191    a turn: ordered cup pair * 16 + rotation * 4 + flip choice
+    240-255  a new game starting from coin state (value - 240)
+
+Cup pairs are indexed in ORDERED_PAIRS, rotations are 90° clockwise turns
+applied before the player looked under the cups, and flip choices use the
+usual 0 neither / 1 first / 2 second / 3 both. Every record is the same width,
+so the reader maps the file and indexes it directly instead of parsing it.
+"""
+
+import mmap
+import struct
+
+from coin_game_state import FLIP_MASK, IS_WIN, ROTATE
+
+MAGIC = b'CGRB'
+VERSION = 1
+HEADER = struct.Struct('<4sBBH')  # magic, version, cups, reserved
+GAME_START = 240
+
+ORDERED_PAIRS = tuple((a, b) for a in range(4) for b in range(4) if a != b)
+PAIR_INDEX = {pair: i for i, pair in enumerate(ORDERED_PAIRS)}
+
+# DECODE[byte] is (cup_indices, rotation, choice) for turn records and None otherwise
+DECODE = tuple(
+    (ORDERED_PAIRS[byte >> 4], byte >> 2 & 3, byte & 3) if byte < len(ORDERED_PAIRS) << 4 else None
+    for byte in range(256)
+)
+
+
+class GameRecordWriter:
+    """Buffered, append-only writer of game records"""
+
+    def __init__(self, path, buffer_size=1 << 20):
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(MAGIC, VERSION, 4, 0))
+        self.buffer = bytearray()
+        self.buffer_size = buffer_size
+        self.games = 0
+        self.turns = 0
+
+    def start_game(self, state):
+        """Begin a new game from a packed coin state"""
+        self.buffer.append(GAME_START + state)
+        self.games += 1
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def record_turn(self, cup_indices, rotation, choice):
+        """Append one turn of the current game"""
+        self.buffer.append(PAIR_INDEX[tuple(cup_indices)] << 4 | rotation << 2 | choice)
+        self.turns += 1
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write everything buffered so far"""
+        self.file.write(self.buffer)
+        self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        """Flush and close the file"""
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class GameRecordReader:
+    """Memory-mapped view of a record file
+
+    reader[i] is the raw record byte and reader[i:j] a zero-copy memoryview,
+    so slices of billions of records cost nothing until they are read.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"{path} is not a game record file")
+            magic, version, cups, _ = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION or cups != 4:
+                raise ValueError(f"{path} is not a version {VERSION} game record file")
+            size = f.seek(0, 2)
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size > HEADER.size else None
+        self.records = memoryview(self.mmap)[HEADER.size:] if self.mmap is not None else memoryview(b'')
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def close(self):
+        """Release the mapping"""
+        self.records.release()
+        if self.mmap is not None:
+            self.mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def games(self, start=0, stop=None):
+        """Yield (initial_state, [(cup_indices, rotation, choice), ...]) for each game in a range of records"""
+        state = None
+        turns = []
+        decode = DECODE
+        for byte in self.records[start:stop]:
+            if byte >= GAME_START:
+                if state is not None:
+                    yield state, turns
+                state = byte - GAME_START
+                turns = []
+            elif state is not None:
+                turns.append(decode[byte])
+        if state is not None:
+            yield state, turns
+
+    def replay(self, state, turns):
+        """Final coin state and whether the game was won, from a game's records"""
+        for cup_indices, rotation, choice in turns:
+            state = ROTATE[rotation][state] ^ FLIP_MASK[cup_indices][choice]
+            if IS_WIN[state]:
+                return state, True
+        return state, False
+
+    def as_array(self):
+        """The records as a NumPy uint8 array sharing the mapped memory"""
+        import numpy as np
+
+        return np.frombuffer(self.records, dtype=np.uint8)
+
+
+def main():
+    import sys
+
+    with GameRecordReader(sys.argv[1]) as reader:
+        games = wins = 0
+        for state, turns in reader.games():
+            games += 1
+            wins += reader.replay(state, turns)[1]
+        print(f"{len(reader):,} records, {games:,} games, {wins:,} won")
+
+
+if __name__ == "__main__":
+    main()
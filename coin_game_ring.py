@@ -0,0 +1,140 @@
+"""Generalized Lazy Susan: N cups in a ring, k of them revealed each turn
+
+The board is an N-bit integer with bit i set when the coin under cup i shows
+heads, and cups are numbered around the ring so a spin is a bit rotation.
+With N=4 this is the classic game with the 2x2 grid read in ring order
+(0, 1, 3, 2).
+
+Ring strategies work on bits rather than 'H'/'T' strings:
+select(turn) returns the k ring positions to examine, and
+flip(turn, observed) receives a k-bit int (bit j set when the coin under the
+j-th selected cup shows heads) and returns a k-bit int of cups to flip.
+"""
+
+import random
+
+from coin_game_engine import Strategy
+from coin_game_start import StartStateSampler
+
+
+class RingGame:
+    """Headless game on N cups with k reveals per turn"""
+
+    def __init__(self, cups=4, reveals=2, max_turns=50, seed=None):
+        if not 0 < reveals <= cups:
+            raise ValueError("reveals must be between 1 and the number of cups")
+        self.cups = cups
+        self.reveals = reveals
+        self.max_turns = max_turns
+        self.full = (1 << cups) - 1
+        self.rng = random.Random(seed)
+        self.start_states = StartStateSampler(cups)
+        self.state = 0
+        self.turn_count = 0
+        # cup tuple -> per-cup bit masks, so each flip is a handful of ORs
+        self._cup_bits = {}
+
+    def rotate(self, state, steps):
+        """Rotate the ring by the given number of positions"""
+        steps %= self.cups
+        return ((state << steps) | (state >> (self.cups - steps))) & self.full
+
+    def check_win_condition(self, state=None):
+        """Check if all coins are the same"""
+        if state is None:
+            state = self.state
+        return state == 0 or state == self.full
+
+    def initialize_game(self):
+        """Random coins, not all the same"""
+        self.state = self.start_states.sample(self.rng)
+        self.turn_count = 0
+
+    def cup_bits(self, cup_indices):
+        """Bit mask for each selected cup"""
+        bits = self._cup_bits.get(cup_indices)
+        if bits is None:
+            if len(cup_indices) != self.reveals or len(set(cup_indices)) != self.reveals:
+                raise ValueError(f"select exactly {self.reveals} different cups")
+            bits = self._cup_bits[cup_indices] = tuple(1 << cup for cup in cup_indices)
+        return bits
+
+    def play_game(self, strategy):
+        """Play one game; return the number of turns taken to win, or None on a loss"""
+        self.initialize_game()
+        select = strategy.select
+        flip = strategy.flip
+        randrange = self.rng.randrange
+        rotate = self.rotate
+        cups = self.cups
+        full = self.full
+        state = self.state
+
+        for turn in range(self.max_turns):
+            state = rotate(state, randrange(cups))
+            bits = self.cup_bits(select(turn))
+            observed = 0
+            for j, bit in enumerate(bits):
+                if state & bit:
+                    observed |= 1 << j
+            choice = flip(turn, observed)
+            for j, bit in enumerate(bits):
+                if choice >> j & 1:
+                    state ^= bit
+            if state == 0 or state == full:
+                self.state = state
+                self.turn_count = turn
+                return turn + 1
+
+        self.state = state
+        self.turn_count = self.max_turns
+        return None
+
+
+def spread_cups(cups, reveals, offset=0):
+    """k cups spaced as evenly as possible around the ring"""
+    return tuple(sorted((offset + j * cups // reveals) % cups for j in range(reveals)))
+
+
+def make_heads_strategy(cups, reveals):
+    """Examine evenly spaced cups, shifting the pattern each turn, and turn every tail to heads"""
+    patterns = [spread_cups(cups, reveals, offset) for offset in range(max(1, cups // reveals))]
+    all_revealed = (1 << reveals) - 1
+    return Strategy(
+        f'make-heads-{cups}x{reveals}',
+        lambda turn: patterns[turn % len(patterns)],
+        lambda turn, observed: ~observed & all_revealed,
+    )
+
+
+def run_games(game, strategy, games):
+    """Play many games and return (wins, {turns_to_win: count})"""
+    turns_histogram = {}
+    wins = 0
+    for _ in range(games):
+        turns = game.play_game(strategy)
+        if turns is not None:
+            wins += 1
+            turns_histogram[turns] = turns_histogram.get(turns, 0) + 1
+    return wins, turns_histogram
+
+
+def main():
+    import sys
+    import time
+
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    max_turns = 1000
+    print(f"{'cups':>4} {'reveals':>7} {'win rate':>9} {'mean turns':>10} {'games/sec':>10}")
+    for cups in (4, 8, 16, 32, 64):
+        for reveals in sorted({2, cups // 2, cups - 1}):
+            game = RingGame(cups, reveals, max_turns=max_turns, seed=0)
+            start = time.perf_counter()
+            wins, turns_histogram = run_games(game, make_heads_strategy(cups, reveals), games)
+            elapsed = time.perf_counter() - start
+            mean = sum(t * n for t, n in turns_histogram.items()) / wins if wins else float('nan')
+            print(f"{cups:4} {reveals:7} {wins / games:9.2%} {mean:10.1f} {games / elapsed:10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
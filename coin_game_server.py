@@ -0,0 +1,325 @@
+"""asyncio game server: many concurrent sessions over a line-based protocol
+
+Run a server over TCP or a Unix socket, then drive it with the built-in load
+generator:
+
+    python coin_game_server.py serve --port 7777
+    python coin_game_server.py load --port 7777 --sessions 10000 --connections 50
+    python coin_game_server.py load --local --sessions 10000   # server in the same process
+
+Protocol (one command per line, replies in order on the same connection):
+
+    NEW [puzzle]           -> OK <sid> TURN 1
+    EXAMINE <sid> <a> <b>  -> SEE <sid> <coin a> <coin b>   (cups 1-4; the table turns first)
+    FLIP <sid> <0-3>       -> OK <sid> TURN <n> | WIN <sid> <turns> | LOSE <sid>
+    QUIT <sid>             -> BYE <sid>
+    STATS                  -> STATS <sessions> <games> <wins> <moves>
+
+A connection may own any number of sessions; they are dropped when it closes.
+Commands naming a session another connection owns get ERR no such session.
+Lines longer than the reader's limit get ERR line too long and are skipped.
+"""
+
+import asyncio
+import collections
+import math
+import random
+
+from coin_game_adversary import RESPONSE_TABLE
+from coin_game_start import UNIFORM
+from coin_game_state import FLIP_MASK, IS_WIN, PEEK, ROTATE
+
+
+class Session:
+    """One game in progress"""
+
+    __slots__ = ('sid', 'state', 'turn', 'pair', 'puzzle')
+
+    def __init__(self, sid, state, puzzle):
+        self.sid = sid
+        self.state = state
+        self.turn = 0
+        self.pair = None  # Cups examined this turn, waiting for a flip
+        self.puzzle = puzzle
+
+
+class CoinGameServer:
+    """Hosts sessions; every rule is a table lookup on the packed coin state
+
+    start_states is a 4-cup coin_game_start.StartStateSampler; by default every start is equally likely.
+    """
+
+    def __init__(self, max_turns=50, seed=None, start_states=UNIFORM):
+        if start_states.cups != 4:
+            raise ValueError("the server plays with 4 cups")
+        self.max_turns = max_turns
+        self.rng = random.Random(seed)
+        self.start_states = start_states
+        self.sessions = {}
+        self.next_sid = 1
+        self.games = 0
+        self.wins = 0
+        self.moves = 0
+
+    def new_session(self, puzzle):
+        """Start a game from a state drawn by the start-state sampler"""
+        session = Session(self.next_sid, self.start_states.sample(self.rng), puzzle)
+        self.sessions[session.sid] = session
+        self.next_sid += 1
+        self.games += 1
+        return session
+
+    def owned_session(self, sid, owned):
+        """The session with this id, if the connection owns it; KeyError otherwise"""
+        if sid not in owned:
+            raise KeyError(sid)
+        return self.sessions[sid]
+
+    def handle(self, line, owned):
+        """Execute one command line and return the reply line"""
+        parts = line.split()
+        if not parts:
+            return b'ERR empty command\n'
+        command = parts[0].upper()
+        try:
+            if command == b'EXAMINE':
+                session = self.owned_session(int(parts[1]), owned)
+                pair = (int(parts[2]) - 1, int(parts[3]) - 1)
+                if session.pair is not None:
+                    return b'ERR already examined this turn; flip first\n'
+                if pair not in FLIP_MASK:
+                    return b'ERR choose two different cups between 1 and 4\n'
+                if session.puzzle:
+                    rotation = RESPONSE_TABLE[pair][session.state]
+                else:
+                    rotation = self.rng.randrange(4)
+                session.state = ROTATE[rotation][session.state]
+                session.pair = pair
+                seen = PEEK[pair][session.state]
+                return b'SEE %d %s %s\n' % (session.sid, seen[0].encode(), seen[1].encode())
+
+            if command == b'FLIP':
+                session = self.owned_session(int(parts[1]), owned)
+                choice = int(parts[2])
+                if session.pair is None:
+                    return b'ERR examine two cups first\n'
+                if not 0 <= choice <= 3:
+                    return b'ERR flip choice must be 0-3\n'
+                session.state ^= FLIP_MASK[session.pair][choice]
+                session.pair = None
+                session.turn += 1
+                self.moves += 1
+                if IS_WIN[session.state]:
+                    self.wins += 1
+                    self.end_session(session.sid, owned)
+                    return b'WIN %d %d\n' % (session.sid, session.turn)
+                if session.turn >= self.max_turns:
+                    self.end_session(session.sid, owned)
+                    return b'LOSE %d\n' % session.sid
+                return b'OK %d TURN %d\n' % (session.sid, session.turn + 1)
+
+            if command == b'NEW':
+                session = self.new_session(len(parts) > 1 and parts[1].lower() == b'puzzle')
+                owned.add(session.sid)
+                return b'OK %d TURN 1\n' % session.sid
+
+            if command == b'QUIT':
+                sid = self.owned_session(int(parts[1]), owned).sid
+                self.end_session(sid, owned)
+                return b'BYE %d\n' % sid
+
+            if command == b'STATS':
+                return b'STATS %d %d %d %d\n' % (len(self.sessions), self.games, self.wins, self.moves)
+        except (IndexError, ValueError):
+            return b'ERR malformed command\n'
+        except KeyError:
+            return b'ERR no such session\n'
+        return b'ERR unknown command\n'
+
+    def end_session(self, sid, owned):
+        """Forget a finished or abandoned session"""
+        self.sessions.pop(sid, None)
+        owned.discard(sid)
+
+    async def serve_connection(self, reader, writer):
+        """Answer commands from one client until it disconnects"""
+        owned = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as error:
+                    line = error.partial  # Last line without a newline, then b'' at EOF
+                except asyncio.LimitOverrunError:
+                    writer.write(b'ERR line too long\n')
+                    await self.skip_line(reader)
+                    continue
+                if not line:
+                    break
+                writer.write(self.handle(line, owned))
+                # Only wait on the socket when the client is not keeping up
+                if writer.transport.get_write_buffer_size() > 1 << 16:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for sid in owned:
+                self.sessions.pop(sid, None)
+            writer.close()
+
+    async def skip_line(self, reader):
+        """Discard the rest of an over-long line, however much of it is still to arrive"""
+        while True:
+            try:
+                await reader.readuntil(b'\n')
+                return
+            except asyncio.LimitOverrunError as error:
+                await reader.read(error.consumed)  # Drop what is buffered and look again
+            except asyncio.IncompleteReadError:
+                return
+
+    async def start(self, host='127.0.0.1', port=7777, path=None):
+        """Listen on a Unix socket path, or on host:port"""
+        if path is not None:
+            return await asyncio.start_unix_server(self.serve_connection, path, limit=1 << 20)
+        return await asyncio.start_server(self.serve_connection, host, port, limit=1 << 20, backlog=4096)
+
+
+async def drive_connection(open_connection, sessions, games, puzzle, latencies, strategy):
+    """Play games on one connection, each session moving as soon as its last reply arrives
+
+    Replies come back in command order, so a queue of the commands in flight
+    says which session each reply belongs to. Every move's latency, from its
+    EXAMINE being written to its FLIP reply being read, goes into latencies.
+    """
+    clock = asyncio.get_running_loop().time
+    reader, writer = await open_connection()
+    new = b'NEW puzzle\n' if puzzle else b'NEW\n'
+    select = strategy.select
+    flip = strategy.flip
+    finished = 0
+    # (command, sid) per command in flight; for NEW the second item is the games left for the slot
+    in_flight = collections.deque()
+    slots = {}  # sid -> [turn, games left for this slot, time its EXAMINE was written]
+
+    def examine(sid):
+        slot = slots[sid]
+        slot[2] = clock()
+        in_flight.append((b'EXAMINE', sid))
+        return b'EXAMINE %d %d %d\n' % (sid, *[cup + 1 for cup in select(slot[0])])
+
+    writer.write(new * sessions)
+    in_flight.extend([(b'NEW', games)] * sessions)
+    while in_flight:
+        command, value = in_flight.popleft()
+        reply = (await reader.readline()).split()
+        if command == b'NEW':
+            sid = int(reply[1])
+            slots[sid] = [0, value, 0.0]
+            writer.write(examine(sid))
+        elif command == b'EXAMINE':
+            observed = (reply[2].decode(), reply[3].decode())
+            in_flight.append((b'FLIP', value))
+            writer.write(b'FLIP %d %d\n' % (value, flip(slots[value][0], observed)))
+        else:
+            slot = slots[value]
+            latencies.append(clock() - slot[2])
+            if reply[0] == b'OK':
+                slot[0] += 1
+                writer.write(examine(value))
+            else:
+                finished += 1
+                del slots[value]
+                if slot[1] > 1:
+                    in_flight.append((b'NEW', slot[1] - 1))
+                    writer.write(new)
+        # Only wait on the socket when the server is not keeping up
+        if writer.transport.get_write_buffer_size() > 1 << 16:
+            await writer.drain()
+
+    writer.close()
+    return finished
+
+
+async def run_load(open_connection, sessions=10000, connections=50, games=1, puzzle=False):
+    """Keep `sessions` games in flight across `connections` and report throughput and per-move latency"""
+    from coin_game_engine import STRATEGIES
+
+    strategy = STRATEGIES['optimal']
+    latencies = []
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    per_connection = [sessions // connections + (i < sessions % connections) for i in range(connections)]
+    finished = await asyncio.gather(*[
+        drive_connection(open_connection, count, games, puzzle, latencies, strategy)
+        for count in per_connection if count
+    ])
+    elapsed = loop.time() - start
+
+    moves = len(latencies)
+    latencies.sort()
+    report = {
+        'sessions': sessions,
+        'games': sum(finished),
+        'moves': moves,
+        'seconds': elapsed,
+        'moves_per_sec': moves / elapsed if elapsed else 0.0,
+    }
+    # Nearest-rank percentiles of per-move latency (None without moves)
+    for pct in (50, 99):
+        report[f'p{pct}_ms'] = latencies[max(0, math.ceil(moves * pct / 100) - 1)] * 1000 if moves else None
+    return report
+
+
+def main():
+    import argparse
+    import functools
+    import os
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Lazy Susan coin game server and load generator")
+    parser.add_argument('mode', choices=['serve', 'load'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--unix', help="Unix socket path instead of TCP")
+    parser.add_argument('--local', action='store_true', help="load: run the server in this process too")
+    parser.add_argument('--sessions', type=int, default=10000)
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--games', type=int, default=1, help="games per session slot")
+    parser.add_argument('--puzzle', action='store_true', help="play against the puzzle-mode adversary")
+    args = parser.parse_args()
+
+    async def serve():
+        server = await CoinGameServer().start(args.host, args.port, args.unix)
+        print(f"Serving on {args.unix or f'{args.host}:{args.port}'}")
+        async with server:
+            await server.serve_forever()
+
+    async def load():
+        path = args.unix
+        server = None
+        if args.local:
+            path = path or os.path.join(tempfile.mkdtemp(), 'coin_game.sock')
+            server = await CoinGameServer().start(path=path)
+        if path:
+            open_connection = functools.partial(asyncio.open_unix_connection, path, limit=1 << 20)
+        else:
+            open_connection = functools.partial(asyncio.open_connection, args.host, args.port, limit=1 << 20)
+        report = await run_load(open_connection, args.sessions, args.connections, args.games, args.puzzle)
+        if server is not None:
+            server.close()
+        def ms(value):
+            return '-' if value is None else f"{value:.1f}"
+
+        print(f"{report['sessions']:,} concurrent sessions, {report['games']:,} games, {report['moves']:,} moves "
+              f"in {report['seconds']:.2f}s: {report['moves_per_sec']:,.0f} moves/sec, "
+              f"p50 {ms(report['p50_ms'])} ms, p99 {ms(report['p99_ms'])} ms per move (EXAMINE sent to FLIP answered)")
+
+    try:
+        asyncio.run(serve() if args.mode == 'serve' else load())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
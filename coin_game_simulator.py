@@ -1,26 +1,40 @@
 import random
+import sys
 import time
 import os
 
+from coin_game_start import UNIFORM
+from coin_game_state import ROTATIONS, to_coins
+
 class CoinGame:
     def __init__(self):
         self.coins = []
         self.turn_count = 0
         self.max_turns = 50  # Prevent infinite games
+        self.rng = random  # Swap for a seeded random.Random to reproduce games
+        self.start_states = UNIFORM  # coin_game_start.StartStateSampler for new games
+        self.recorder = None  # Optional coin_game_records.GameRecordWriter
+        self.last_rotation = 0  # Rotation applied by the latest spin, for the recorder
+        # Terminal hooks, swapped out by play_script() to run without a person at the keyboard
+        self.read_line = input
+        self.pause = time.sleep
         
     def initialize_game(self):
         """Initialize the game with random coin states (not all the same)"""
-        while True:
-            self.coins = [random.choice(['H', 'T']) for _ in range(4)]
-            # Ensure not all coins are the same
-            if len(set(self.coins)) > 1:
-                break
+        state = self.start_states.sample(self.rng)
+        self.coins = to_coins(state)
         self.turn_count = 0
+        if self.recorder is not None:
+            self.recorder.start_game(state)
         
     def spin_lazy_susan(self):
         """Randomly rotate the cups (simulate spinning)"""
-        # This doesn't change the actual coin positions, just simulates the effect
-        pass
+        self.last_rotation = self.rng.randrange(4)
+        self.coins = self.rotate_coins(self.coins, self.last_rotation)
+        
+    def rotate_coins(self, coins, rotations):
+        """Rotate the 2x2 grid of coins by the given number of 90° rotations"""
+        return [coins[cup] for cup in ROTATIONS[rotations % 4]]
         
     def display_cups(self, selected_indices=None):
         """Display the cups with selected ones highlighted"""
@@ -45,7 +59,7 @@ class CoinGame:
         while True:
             try:
                 print("Select two cups to examine (1-4, separated by space):")
-                selection = input("> ").strip()
+                selection = self.read_line("> ").strip()
                 cup_indices = [int(x) - 1 for x in selection.split()]
                 
                 if len(cup_indices) != 2:
@@ -70,10 +84,13 @@ class CoinGame:
         print(f"\nYou selected cups {cup_indices[0]+1} and {cup_indices[1]+1}")
         print("Under these cups, you see:")
         
-        for i, cup_idx in enumerate(cup_indices):
-            coin_state = self.coins[cup_idx]
+        for cup_idx, coin_state in zip(cup_indices, self.peek_coins(cup_indices)):
             print(f"Cup {cup_idx+1}: {coin_state} ({'Heads' if coin_state == 'H' else 'Tails'})")
             
+    def peek_coins(self, cup_indices):
+        """Return the coins under the selected cups, in selection order"""
+        return tuple(self.coins[cup_idx] for cup_idx in cup_indices)
+            
     def flip_coins(self, cup_indices):
         """Let player choose which coins to flip"""
         print("\nWhich coins would you like to flip?")
@@ -85,7 +102,7 @@ class CoinGame:
         
         while True:
             try:
-                choice = int(input("Enter your choice (0-3): "))
+                choice = int(self.read_line("Enter your choice (0-3): "))
                 if 0 <= choice <= 3:
                     break
                 print("Please enter a number between 0 and 3!")
@@ -93,23 +110,34 @@ class CoinGame:
                 print("Please enter a valid number!")
                 
         # Apply the flips
+        self.apply_flip(cup_indices, choice)
+        if self.recorder is not None:
+            self.recorder.record_turn(cup_indices, self.last_rotation, choice)
+            self.last_rotation = 0
         if choice == 1:
-            self.coins[cup_indices[0]] = 'T' if self.coins[cup_indices[0]] == 'H' else 'H'
             print(f"Flipped cup {cup_indices[0]+1} to {self.coins[cup_indices[0]]}")
         elif choice == 2:
-            self.coins[cup_indices[1]] = 'T' if self.coins[cup_indices[1]] == 'H' else 'H'
             print(f"Flipped cup {cup_indices[1]+1} to {self.coins[cup_indices[1]]}")
         elif choice == 3:
-            self.coins[cup_indices[0]] = 'T' if self.coins[cup_indices[0]] == 'H' else 'H'
-            self.coins[cup_indices[1]] = 'T' if self.coins[cup_indices[1]] == 'H' else 'H'
             print(f"Flipped both cups!")
         else:
             print("No coins flipped.")
             
+    def apply_flip(self, cup_indices, choice):
+        """Apply a flip choice (0 neither, 1 first, 2 second, 3 both) to the selected cups"""
+        if choice & 1:
+            self.coins[cup_indices[0]] = 'T' if self.coins[cup_indices[0]] == 'H' else 'H'
+        if choice & 2:
+            self.coins[cup_indices[1]] = 'T' if self.coins[cup_indices[1]] == 'H' else 'H'
+            
     def check_win_condition(self):
         """Check if all coins are the same"""
         return len(set(self.coins)) == 1
         
+    def clear_screen(self):
+        """Clear the terminal between turns"""
+        os.system('cls' if os.name == 'nt' else 'clear')
+        
     def play_game(self):
         """Main game loop"""
         self.initialize_game()
@@ -119,14 +147,15 @@ class CoinGame:
         print("Each turn, you'll select 2 cups, see their coins, and optionally flip them.")
         print("The Lazy Susan spins between turns, so you won't know which cup is which!")
         print("\nPress Enter to start...")
-        input()
+        self.read_line()
         
         while self.turn_count < self.max_turns:
-            os.system('cls' if os.name == 'nt' else 'clear')  # Clear screen
+            self.clear_screen()
             
             # Simulate spinning the Lazy Susan
             print("🎠 Spinning the Lazy Susan...")
-            time.sleep(1)
+            self.spin_lazy_susan()
+            self.pause(1)
             
             # Display current state
             self.display_cups()
@@ -151,7 +180,7 @@ class CoinGame:
                 
             # Cover coins and continue
             print("\nCovering the coins...")
-            time.sleep(1)
+            self.pause(1)
             
             self.turn_count += 1
             
@@ -164,14 +193,110 @@ class CoinGame:
         print("\n" + "="*50)
         print("STRATEGY HINT")
         print("="*50)
-        print("Optimal strategy for guaranteed win:")
-        print("1. Always choose cups in a consistent pattern (e.g., always adjacent)")
-        print("2. If you see two different coins, flip one to make them the same")
-        print("3. If you see two same coins, don't flip them")
-        print("4. This strategy guarantees a win in at most 4 turns!")
+        print("Optimal strategy for a guaranteed win in at most 5 turns:")
+        print("1. Diagonal cups (1 & 4): turn any tails to heads")
+        print("2. Adjacent cups (1 & 2): turn any tails to heads")
+        print("3. Diagonal cups: turn any tails to heads; if both are heads, flip one")
+        print("4. Adjacent cups: flip both")
+        print("5. Diagonal cups: flip both")
         print("="*50)
 
+class ScriptRecorder:
+    """Recorder that keeps just what a script result line needs"""
+    
+    def __init__(self):
+        self.start = None
+        self.turns = 0
+        
+    def start_game(self, state):
+        self.start = state
+        self.turns = 0
+        
+    def record_turn(self, cup_indices, rotation, choice):
+        self.turns += 1
+
+
+class ScriptInput:
+    """Feeds scripted lines to CoinGame in place of input()
+    
+    Blank lines and '#' comments are skipped. The "Press Enter to start" prompt
+    is answered automatically, so a script holds only moves. Like input(), it
+    raises EOFError when the script runs out.
+    """
+    
+    def __init__(self, lines):
+        self.lines = (line.strip() for line in lines)
+        self.pending = None
+        self.lines_read = 0
+        
+    def peek(self):
+        """The next move line, or None at the end of the script"""
+        if self.pending is None:
+            for line in self.lines:
+                self.lines_read += 1
+                if line and not line.startswith('#'):
+                    self.pending = line
+                    break
+        return self.pending
+        
+    def __call__(self, prompt=""):
+        if not prompt:
+            return ""  # Press Enter to start
+        line = self.peek()
+        if line is None:
+            raise EOFError(f"script ended after {self.lines_read} lines")
+        self.pending = None
+        return line
+
+
+def play_script(lines, out=sys.stdout, seed=None, max_turns=50):
+    """Play games back to back from scripted moves; write one result line per game
+    
+    Each move line is what a player would type: "1 4" to pick cups, "3" to flip.
+    The real prompts, input checks and retries run unchanged; only the screen
+    clears, pauses and printed text are dropped. A game the script stops in the
+    middle of is reported as incomplete. Returns (games, wins).
+    """
+    import contextlib
+    
+    game = CoinGame()
+    game.rng = random.Random(seed)
+    game.max_turns = max_turns
+    game.read_line = script = ScriptInput(lines)
+    game.pause = lambda seconds: None
+    game.clear_screen = lambda: None
+    game.recorder = recorder = ScriptRecorder()
+    
+    games = wins = 0
+    with open(os.devnull, 'w') as devnull:
+        while script.peek() is not None:
+            with contextlib.redirect_stdout(devnull):
+                try:
+                    won = game.play_game()
+                except EOFError:
+                    won = None
+            games += 1
+            wins += bool(won)
+            result = 'incomplete' if won is None else 'won' if won else 'lost'
+            out.write(f"game {games} {result} {recorder.turns} "
+                      f"{''.join(to_coins(recorder.start))} {''.join(game.coins)}\n")
+    return games, wins
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--script':
+        import contextlib
+        
+        # python coin_game_simulator.py --script moves.txt [seed]   ('-' reads standard input)
+        path = sys.argv[2] if len(sys.argv) > 2 else '-'
+        seed = int(sys.argv[3]) if len(sys.argv) > 3 else None
+        start = time.perf_counter()
+        with (open(path) if path != '-' else contextlib.nullcontext(sys.stdin)) as source:
+            games, wins = play_script(source, seed=seed)
+        elapsed = time.perf_counter() - start
+        print(f"{games} games, {wins} won in {elapsed:.2f}s ({games / elapsed:,.0f} games/sec)", file=sys.stderr)
+        return
+    
     game = CoinGame()
     
     while True:
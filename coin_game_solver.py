@@ -0,0 +1,144 @@
+"""Exact minimax solver for puzzle (malicious) mode
+
+The player never sees the whole table, so a position is the set of coin states
+consistent with everything the player has seen so far: a belief, stored as a
+16-bit mask with bit s set when state s is still possible. Each turn the player
+picks two cups, the table rotates adversarially, the player sees the two coins
+and flips any of them. A turn wins when every state left in the belief is a win.
+
+Because the adversary may rotate before every examination, a belief is only
+meaningful up to rotation, so positions are canonicalized to their rotation
+closure before they are looked up in the transposition table.
+"""
+
+from coin_game_belief import (
+    OBSERVATIONS,
+    START_BELIEF,
+    WIN_BELIEF,
+    count,
+    flip_belief,
+    observe,
+    rotation_closure,
+)
+from coin_game_state import FLIP_MASK
+
+# Once a belief is closed under rotation every adjacent pair is a rotation of
+# (0, 1) and every diagonal a rotation of (0, 3), so these two cover all choices
+CANONICAL_PAIRS = ((0, 1), (0, 3))
+
+
+def advance(belief, cup_indices, observed, choice):
+    """Belief after one puzzle-mode turn that did not end the game
+
+    observed is the pair of coins seen, e.g. ('H', 'T'), or None when the
+    player could not see them (blind mode).
+    """
+    parts = observe(rotation_closure(belief), cup_indices)
+    seen = sum(parts) if observed is None else parts[OBSERVATIONS.index(tuple(observed))]
+    return flip_belief(seen, FLIP_MASK[cup_indices][choice]) & ~WIN_BELIEF
+
+
+class PuzzleSolver:
+    """Worst-case optimal play against the malicious Lazy Susan"""
+
+    def __init__(self, max_turns=50):
+        self.max_turns = max_turns
+        # (canonical belief, turns left) -> move that forces a win in time, or None
+        self.table = {}
+
+    def search(self, belief, turns_left):
+        """Return (turns, move) for a belief with turns_left spins remaining
+
+        turns is the fewest turns that guarantee a win, or None if no strategy
+        can guarantee one in time. move is (cup_indices, flips) where flips
+        maps each possible observation to the flip choice to make.
+        """
+        belief = rotation_closure(belief)
+        # Iterative deepening: the first depth that forces a win is the worst-case length
+        for depth in range(1, turns_left + 1):
+            move = self.forced_win(belief, depth)
+            if move is not None:
+                return depth, move
+        return None, None
+
+    def forced_win(self, belief, depth):
+        """A move that wins within depth turns whatever the table does, or None"""
+        key = (belief, depth)
+        if key in self.table:
+            return self.table[key]
+
+        move = None
+        if depth > 0:
+            for cup_indices in CANONICAL_PAIRS:
+                flips = {}
+                for observed, seen in zip(OBSERVATIONS, observe(belief, cup_indices)):
+                    if not seen:
+                        continue
+                    for choice, mask in enumerate(FLIP_MASK[cup_indices]):
+                        remaining = flip_belief(seen, mask) & ~WIN_BELIEF
+                        if not remaining or self.forced_win(rotation_closure(remaining), depth - 1):
+                            flips[observed] = choice
+                            break
+                    else:
+                        break
+                else:
+                    move = (cup_indices, flips)
+                    break
+
+        self.table[key] = move
+        return move
+
+    def best_move(self, belief=START_BELIEF, turns_left=None):
+        """The optimal (cup_indices, flips) for a belief, or None if the game cannot be forced"""
+        if turns_left is None:
+            turns_left = self.max_turns
+        return self.search(belief, turns_left)[1]
+
+    def solve(self, belief=START_BELIEF):
+        """Return (worst-case turns to win, policy) from a belief
+
+        The policy maps every canonical belief reachable under optimal play to
+        the move to make there.
+        """
+        turns, move = self.search(belief, self.max_turns)
+        policy = {}
+        frontier = [(rotation_closure(belief), self.max_turns)]
+        while frontier:
+            belief, turns_left = frontier.pop()
+            move = self.search(belief, turns_left)[1]
+            if move is None or belief in policy:
+                continue
+            policy[belief] = move
+            cup_indices, flips = move
+            for observed, choice in flips.items():
+                remaining = advance(belief, cup_indices, observed, choice)
+                if remaining:
+                    frontier.append((rotation_closure(remaining), turns_left - 1))
+        return turns, policy
+
+
+def describe_move(move):
+    """Human-readable summary of a solver move"""
+    cup_indices, flips = move
+    names = ('neither', 'the first', 'the second', 'both')
+    pair = 'diagonal' if cup_indices in ((0, 3), (1, 2)) else 'adjacent'
+    lines = [f"Examine two {pair} cups ({cup_indices[0]+1} and {cup_indices[1]+1})."]
+    for observed, choice in flips.items():
+        lines.append(f"  If you see {observed[0]}{observed[1]}, flip {names[choice]}.")
+    return "\n".join(lines)
+
+
+def main():
+    import time
+
+    start = time.perf_counter()
+    turns, policy = PuzzleSolver().solve()
+    elapsed = time.perf_counter() - start
+    print(f"Guaranteed win in {turns} turns against the malicious Lazy Susan ({elapsed * 1000:.1f} ms)")
+    for belief, move in policy.items():
+        print(f"\nBelief {belief:#06x} ({count(belief)} states):")
+        print(describe_move(move))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Starting coin states without rejection sampling
+
+A starting state is any packed board (bit i set when the coin under cup i
+shows heads) except all tails (0) and all heads (2**cups - 1), so the uniform
+distribution is a single randrange(1, 2**cups - 1) draw. Other distributions
+are given as weights over those states and drawn by bisecting cumulative
+weights. Every draw takes an explicit RNG; game_rng() derives an independent,
+reproducible stream for any single game from a run seed and the game number.
+
+    sampler = StartStateSampler()                      # uniform over the 14 states
+    sampler = StartStateSampler.by_heads({1: 1, 3: 1})  # only one coin differs
+    state = sampler.sample(game_rng(seed, game))
+    states = sampler.fill(10_000_000, seed)            # array('B') of states
+"""
+
+import bisect
+import itertools
+import math
+import random
+from array import array
+from fractions import Fraction
+
+
+def game_rng(seed, game):
+    """Independent random stream for one game of a seeded run"""
+    return random.Random(f"{seed}:game:{game}")
+
+
+def state_to_coins(state, cups):
+    """Unpack a state of any width into a list of 'H'/'T' strings"""
+    return ['H' if state >> i & 1 else 'T' for i in range(cups)]
+
+
+class StartStateSampler:
+    """Draws starting states for a game with `cups` cups
+
+    weights maps states to relative weights; states left out are never drawn.
+    Without weights every starting state is equally likely.
+    """
+
+    def __init__(self, cups=4, weights=None):
+        self.cups = cups
+        self.top = (1 << cups) - 1  # all heads; all tails is 0
+        if weights is None:
+            self.states = None
+            self.cum_weights = None
+            return
+        for state, weight in weights.items():
+            if not 0 < state < self.top:
+                raise ValueError(f"{state} is not a starting state for {cups} cups")
+            if weight < 0:
+                raise ValueError("weights must not be negative")
+        self.states = [state for state in sorted(weights) if weights[state] > 0]
+        if not self.states:
+            raise ValueError("at least one starting state needs a positive weight")
+        # The weights as given, for exact probabilities; draws bisect their float running totals
+        self.weights = [weights[state] for state in self.states]
+        self.total = sum(map(Fraction, self.weights))
+        self.cum_weights = list(itertools.accumulate(float(weight) for weight in self.weights))
+
+    @classmethod
+    def by_heads(cls, weights, cups=4):
+        """Weight states by how many heads they show, e.g. {2: 1} for two heads and two tails
+
+        Each head count's weight is shared equally by the states with that many
+        heads, so this enumerates all 2**cups states and suits small tables only.
+        """
+        states = {}
+        for state in range(1, (1 << cups) - 1):
+            heads = bin(state).count('1')
+            if weights.get(heads):
+                states[state] = Fraction(weights[heads]) / math.comb(cups, heads)
+        return cls(cups, states)
+
+    def sample(self, rng):
+        """One starting state"""
+        if self.states is None:
+            return rng.randrange(1, self.top)
+        return self.states[bisect.bisect(self.cum_weights, rng.random() * self.cum_weights[-1])]
+
+    def probability(self, state):
+        """Exact chance, as a Fraction, that sample() returns a state"""
+        if self.states is None:
+            return Fraction(1, self.top - 1) if 0 < state < self.top else Fraction(0)
+        i = bisect.bisect_left(self.states, state)
+        if i == len(self.states) or self.states[i] != state:
+            return Fraction(0)
+        return Fraction(self.weights[i]) / self.total
+
+    def typecode(self):
+        """Smallest unsigned array typecode that holds a state"""
+        for code in ('B', 'H', 'L', 'Q'):
+            if self.top < 1 << 8 * array(code).itemsize:
+                return code
+        raise ValueError("more than 64 cups do not fit in an array")
+
+    def fill(self, count, seed=None):
+        """count starting states in an array, drawn in bulk from one seeded stream"""
+        rng = random.Random(seed)
+        # The same draws as count sample() calls on that stream, in one pass
+        if self.states is not None:
+            states = rng.choices(self.states, cum_weights=self.cum_weights, k=count)
+        else:
+            randrange, top = rng.randrange, self.top
+            states = [randrange(1, top) for _ in range(count)]
+        return array(self.typecode(), states)
+
+    def fill_numpy(self, count, rng):
+        """count starting states as a NumPy array, drawn from a numpy.random.Generator"""
+        import numpy as np
+
+        dtype = np.dtype(f'u{array(self.typecode()).itemsize}')
+        if self.states is None:
+            return rng.integers(1, self.top, size=count, dtype=dtype)
+        probabilities = np.diff(np.array([0] + self.cum_weights, dtype=np.float64))
+        return rng.choice(np.array(self.states, dtype=dtype), size=count, p=probabilities / probabilities.sum())
+
+
+UNIFORM = StartStateSampler()
+
+
+def main():
+    import sys
+    import time
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    start = time.perf_counter()
+    states = UNIFORM.fill(count, seed=0)
+    elapsed = time.perf_counter() - start
+    histogram = [0] * 16
+    for state in states:
+        histogram[state] += 1
+    print(f"{count:,} starting states in {elapsed:.2f}s ({count / elapsed:,.0f}/sec)")
+    for state in range(1, 15):
+        print(f"  {''.join(state_to_coins(state, 4))}  {histogram[state] / count:.4f}")
+
+
+if __name__ == "__main__":
+    main()
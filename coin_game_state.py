@@ -0,0 +1,75 @@
+"""Compact coin-state representation shared by the CLI, GUI and headless engine
+
+A state is a 4-bit integer with bit i set when the coin under cup i shows heads.
+Cups are laid out on the 2x2 grid used everywhere else:
+    0 1
+    2 3
+Every rule is a table lookup, so a move costs a few integer operations and
+states can be used directly as dictionary keys.
+"""
+
+CUPS = 4
+STATES = 1 << CUPS
+ALL_HEADS = STATES - 1
+ALL_TAILS = 0
+
+# ROTATIONS[r][position] is the cup whose coin lands on position after r 90° clockwise turns
+ROTATIONS = (
+    (0, 1, 2, 3),
+    (2, 0, 3, 1),
+    (3, 2, 1, 0),
+    (1, 3, 0, 2),
+)
+
+# Every unordered pair of cups the player can examine
+PAIRS = ((0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3))
+
+
+def from_coins(coins):
+    """Pack a list like ['H', 'T', 'T', 'H'] into a state"""
+    state = 0
+    for i, coin in enumerate(coins):
+        if coin == 'H':
+            state |= 1 << i
+    return state
+
+
+def to_coins(state):
+    """Unpack a state into a list of 'H'/'T' strings"""
+    return ['H' if state >> i & 1 else 'T' for i in range(CUPS)]
+
+
+def _rotate(state, rotations):
+    rotated = 0
+    for position, cup in enumerate(ROTATIONS[rotations]):
+        if state >> cup & 1:
+            rotated |= 1 << position
+    return rotated
+
+
+# ROTATE[r][state] is state after r 90° clockwise turns of the Lazy Susan
+ROTATE = tuple(tuple(_rotate(state, r) for state in range(STATES)) for r in range(4))
+
+# IS_WIN[state] is True when all coins show the same face
+IS_WIN = tuple(state in (ALL_HEADS, ALL_TAILS) for state in range(STATES))
+
+# HEADS[state] is the number of coins showing heads
+HEADS = tuple(bin(state).count('1') for state in range(STATES))
+
+# The 14 states a game may start from
+START_STATES = tuple(state for state in range(STATES) if not IS_WIN[state])
+
+# FLIP_MASK[(a, b)][choice] is XORed into the state to apply a flip choice
+# (0 neither, 1 first, 2 second, 3 both) to the cups a and b
+FLIP_MASK = {}
+# PEEK[(a, b)][state] is the pair of coins seen under cups a and b, e.g. ('H', 'T')
+PEEK = {}
+for _a in range(CUPS):
+    for _b in range(CUPS):
+        if _a != _b:
+            FLIP_MASK[_a, _b] = (0, 1 << _a, 1 << _b, 1 << _a | 1 << _b)
+            PEEK[_a, _b] = tuple(
+                ('H' if state >> _a & 1 else 'T', 'H' if state >> _b & 1 else 'T')
+                for state in range(STATES)
+            )
+del _a, _b
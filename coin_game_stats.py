@@ -0,0 +1,179 @@
+"""Constant-memory statistics over streams of game results
+
+TurnStats folds in one game at a time: counts, running mean and variance of
+turns-to-win (Welford's update), and a fixed histogram with one bucket per
+possible turn count, from which percentiles are read. Nothing per game is
+kept, so memory depends only on max_turns. Two TurnStats built on separate
+workers merge exactly (histograms add, moments combine with Chan's formula).
+
+StatsTable holds one TurnStats per key, e.g. (strategy, adversary), and
+Snapshots calls back with the running totals every so many games or seconds.
+"""
+
+import math
+import time
+
+PERCENTILES = (50, 99, 99.9)
+
+
+class TurnStats:
+    """Running statistics for one stream of games"""
+
+    __slots__ = ('max_turns', 'games', 'wins', 'mean', 'm2', 'histogram')
+
+    def __init__(self, max_turns=50):
+        self.max_turns = max_turns
+        self.games = 0
+        self.wins = 0
+        self.mean = 0.0  # of turns-to-win over won games
+        self.m2 = 0.0  # sum of squared deviations from the mean
+        self.histogram = [0] * (max_turns + 1)  # [0] counts losses, [t] wins on turn t
+
+    def add(self, turns):
+        """Fold in one game: turns taken to win, or None for a loss"""
+        self.games += 1
+        if turns is None:
+            self.histogram[0] += 1
+            return
+        self.histogram[turns] += 1
+        self.wins += 1
+        delta = turns - self.mean
+        self.mean += delta / self.wins
+        self.m2 += delta * (turns - self.mean)
+
+    def merge(self, other):
+        """Fold in another TurnStats, e.g. a worker's partial result; returns self"""
+        if other.max_turns != self.max_turns:
+            raise ValueError("cannot merge statistics with different max_turns")
+        wins = self.wins + other.wins
+        if wins:
+            delta = other.mean - self.mean
+            self.m2 += other.m2 + delta * delta * self.wins * other.wins / wins
+            self.mean += delta * other.wins / wins
+        self.games += other.games
+        self.wins = wins
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+        return self
+
+    @property
+    def losses(self):
+        """Games that ran out of turns"""
+        return self.games - self.wins
+
+    @property
+    def win_rate(self):
+        """Fraction of games won"""
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def variance(self):
+        """Sample variance of turns-to-win, or None with fewer than two wins"""
+        return self.m2 / (self.wins - 1) if self.wins > 1 else None
+
+    @property
+    def stddev(self):
+        """Sample standard deviation of turns-to-win"""
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+    def percentile(self, pct):
+        """Nearest-rank percentile of turns-to-win over won games"""
+        if not self.wins:
+            return None
+        rank = max(1, math.ceil(self.wins * pct / 100 - 1e-9))
+        seen = 0
+        for turns in range(1, self.max_turns + 1):
+            seen += self.histogram[turns]
+            if seen >= rank:
+                return turns
+
+    def turns_histogram(self):
+        """{turns_to_win: count} for the turn counts that occurred"""
+        return {turns: count for turns, count in enumerate(self.histogram) if turns and count}
+
+    def summary(self):
+        """Win rate, moments and percentile spins as a dictionary"""
+        summary = {
+            'games': self.games,
+            'wins': self.wins,
+            'win_rate': self.win_rate,
+            'mean_spins': self.mean if self.wins else None,
+            'stddev_spins': self.stddev,
+        }
+        for pct in PERCENTILES:
+            summary[f'p{pct}_spins'] = self.percentile(pct)
+        return summary
+
+
+class StatsTable:
+    """One TurnStats per key, such as (strategy_name, adversary_name)"""
+
+    def __init__(self, max_turns=50):
+        self.max_turns = max_turns
+        self.stats = {}
+
+    def __getitem__(self, key):
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = TurnStats(self.max_turns)
+        return stats
+
+    def add(self, key, turns):
+        """Fold one game into a key's statistics"""
+        self[key].add(turns)
+
+    def merge(self, other):
+        """Fold in another table or a {key: TurnStats} mapping; returns self"""
+        for key, stats in getattr(other, 'stats', other).items():
+            self[key].merge(stats)
+        return self
+
+    def rollup(self, position):
+        """Merge keys by one element of the key tuple, e.g. rollup(1) for totals per adversary"""
+        table = StatsTable(self.max_turns)
+        for key, stats in self.stats.items():
+            table[key[position]].merge(stats)
+        return table
+
+    def total(self):
+        """Every key merged into one TurnStats"""
+        total = TurnStats(self.max_turns)
+        for stats in self.stats.values():
+            total.merge(stats)
+        return total
+
+    def summaries(self):
+        """{key: summary dictionary}"""
+        return {key: stats.summary() for key, stats in self.stats.items()}
+
+
+class Snapshots:
+    """Calls callback(stats) every `every_games` games and/or `every_seconds` seconds"""
+
+    def __init__(self, callback, every_games=None, every_seconds=None):
+        self.callback = callback
+        self.every_games = every_games
+        self.every_seconds = every_seconds
+        self.games = 0
+        self.last = time.monotonic()
+
+    def tick(self, stats, games=1):
+        """Count finished games and take a snapshot if one is due"""
+        self.games += games
+        due = self.every_games is not None and self.games >= self.every_games
+        if not due and self.every_seconds is not None:
+            due = time.monotonic() - self.last >= self.every_seconds
+        if due:
+            self.games = 0
+            self.last = time.monotonic()
+            self.callback(stats)
+
+
+def format_snapshot(stats):
+    """One progress line for a TurnStats"""
+    def cell(value):
+        return '-' if value is None else f"{value:.2f}" if isinstance(value, float) else str(value)
+
+    return (f"{stats.games:,} games  win rate {stats.win_rate:.2%}  "
+            f"mean {cell(stats.mean if stats.wins else None)}  sd {cell(stats.stddev)}  "
+            + "  ".join(f"p{pct} {cell(stats.percentile(pct))}" for pct in PERCENTILES))
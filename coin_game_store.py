@@ -0,0 +1,222 @@
+"""Finished games in SQLite, written in batches off the UI thread
+
+GameStore.add() only puts a row on a queue, so the Tk event loop never waits
+on the disk. A writer thread drains the queue and inserts whatever has built
+up in one transaction (up to batch_size rows, at least every flush_interval
+seconds). The database runs in WAL mode, so leaderboard and stats queries
+read a consistent snapshot while the writer commits.
+
+    store = GameStore('coin_game.db')
+    gui = CoinGameGUI(root, store=store)
+    ...
+    store.leaderboard('human', puzzle=True)   # fewest spins first (4 cups unless cups= says otherwise)
+    store.stats()                             # one row per mode, puzzle flag, cup count and player
+    store.close()
+
+    python coin_game_store.py coin_game.db            # leaderboards and stats
+    python coin_game_store.py coin_game.db --bench 100000
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,      -- Unix time
+    mode TEXT NOT NULL,             -- 'human' or 'blind'
+    player TEXT NOT NULL,           -- 'human' or the autoplay strategy's name
+    puzzle INTEGER NOT NULL,        -- 1 when puzzle mode was on
+    cups INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    spins INTEGER NOT NULL,
+    trace_hash TEXT NOT NULL,       -- hash of the game's moves, equal for identical games
+    duration_ms REAL NOT NULL
+);
+-- Databases made before cups was part of the leaderboard have the old index and view
+DROP INDEX IF EXISTS games_leaderboard;
+CREATE INDEX IF NOT EXISTS games_board ON games (mode, puzzle, cups, won, spins, duration_ms);
+DROP VIEW IF EXISTS game_stats;
+CREATE VIEW game_stats AS
+    SELECT mode, puzzle, cups, player,
+           COUNT(*) AS games,
+           SUM(won) AS wins,
+           AVG(won) AS win_rate,
+           AVG(CASE WHEN won THEN spins END) AS mean_spins,
+           MIN(CASE WHEN won THEN spins END) AS best_spins,
+           AVG(duration_ms) AS mean_duration_ms,
+           COUNT(DISTINCT trace_hash) AS distinct_games
+    FROM games GROUP BY mode, puzzle, cups, player;
+"""
+
+COLUMNS = ('finished_at', 'mode', 'player', 'puzzle', 'cups', 'won', 'spins', 'trace_hash', 'duration_ms')
+INSERT = f"INSERT INTO games ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+def connect(path):
+    """Connection with the store's pragmas"""
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")  # WAL keeps this safe against corruption
+    return connection
+
+
+class GameStore:
+    """Queue-fed, batched writer plus leaderboard queries"""
+
+    def __init__(self, path='coin_game.db', batch_size=1000, flush_interval=0.25):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Create the schema here so a bad path fails now rather than on the writer thread
+        with connect(path) as connection:
+            connection.executescript(SCHEMA)
+        connection.close()
+        self.queue = queue.SimpleQueue()
+        self.error = None  # Latest failure on the writer thread; flush() and close() raise it
+        self.dropped = 0  # Rows lost to failed batches
+        self.written = 0
+        self.batches = 0
+        self.reader = None  # Query connection, opened by the first query on the caller's thread
+        self.writer = threading.Thread(target=self.write_loop, name='GameStore writer', daemon=True)
+        self.writer.start()
+
+    def add(self, mode, player, puzzle, cups, won, spins, trace_hash, duration_ms, finished_at=None):
+        """Queue one finished game; returns at once"""
+        self.queue.put((time.time() if finished_at is None else finished_at, mode, player, int(puzzle), cups,
+                        int(won), spins, trace_hash, duration_ms))
+
+    def write_loop(self):
+        """Writer thread: insert queued rows in batches until close()"""
+        connection = None  # Opened on the first batch, so a failure to open is recorded like any other
+        get = self.queue.get
+        running = True
+        while running:
+            rows = []
+            flushes = []
+            item = get()
+            deadline = time.monotonic() + self.flush_interval
+            # Gather whatever else arrives before the deadline, up to a full batch
+            while True:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    flushes.append(item)
+                else:
+                    rows.append(item)
+                if not running or flushes or len(rows) >= self.batch_size:
+                    break
+                try:
+                    item = get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            try:
+                if rows:
+                    if connection is None:
+                        connection = connect(self.path)
+                    with connection:
+                        connection.executemany(INSERT, rows)
+                    self.written += len(rows)
+                    self.batches += 1
+            except Exception as error:
+                # Keep the thread alive: later batches are still tried, and flush() must not hang
+                self.error = error
+                self.dropped += len(rows)
+            finally:
+                for flushed in flushes:
+                    flushed.set()
+        if connection is not None:
+            connection.close()
+
+    def flush(self):
+        """Wait until every game queued so far is committed"""
+        flushed = threading.Event()
+        self.queue.put(flushed)
+        flushed.wait()
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        """Commit what is queued and stop the writer"""
+        if self.writer.is_alive():
+            self.queue.put(None)
+            self.writer.join()
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def query(self, sql, parameters=()):
+        """Rows of a read-only query as dicts"""
+        if self.reader is None:
+            self.reader = connect(self.path)
+            self.reader.row_factory = sqlite3.Row
+        return [dict(row) for row in self.reader.execute(sql, parameters)]
+
+    def leaderboard(self, mode='human', puzzle=False, limit=10, cups=4):
+        """Fastest wins for a mode and cup count: fewest spins, then quickest"""
+        return self.query(
+            "SELECT player, spins, duration_ms, finished_at, trace_hash FROM games "
+            "WHERE mode = ? AND puzzle = ? AND cups = ? AND won = 1 ORDER BY spins, duration_ms LIMIT ?",
+            (mode, int(puzzle), cups, limit),
+        )
+
+    def stats(self):
+        """The game_stats view: totals per mode, puzzle flag, cup count and player"""
+        return self.query("SELECT * FROM game_stats ORDER BY mode, puzzle, cups, player")
+
+
+def main():
+    import argparse
+    import hashlib
+    import random
+
+    parser = argparse.ArgumentParser(description="Show or load-test a game store")
+    parser.add_argument('db', nargs='?', default='coin_game.db')
+    parser.add_argument('--bench', type=int, metavar='GAMES', help="insert this many synthetic games first")
+    args = parser.parse_args()
+
+    store = GameStore(args.db)
+    if args.bench:
+        rng = random.Random(0)
+        start = time.perf_counter()
+        worst_add = 0.0
+        for game in range(args.bench):
+            spins = rng.randint(1, 50)
+            before = time.perf_counter()
+            store.add(rng.choice(('human', 'blind')), 'bench', rng.random() < 0.5, 4, spins < 50, spins,
+                      hashlib.blake2b(game.to_bytes(8, 'little'), digest_size=8).hexdigest(), rng.uniform(1, 100))
+            worst_add = max(worst_add, time.perf_counter() - before)
+        queued = time.perf_counter() - start
+        store.flush()
+        elapsed = time.perf_counter() - start
+        print(f"{args.bench:,} games queued in {queued * 1000:.0f} ms (worst add {worst_add * 1e6:.0f} µs), "
+              f"committed in {elapsed:.2f}s ({args.bench / elapsed:,.0f} inserts/sec, {store.batches} batches)\n")
+
+    stats = store.stats()
+    for cups in sorted({row['cups'] for row in stats}):
+        for puzzle in (False, True):
+            for mode in ('human', 'blind'):
+                leaders = store.leaderboard(mode, puzzle, limit=5, cups=cups)
+                if leaders:
+                    print(f"{mode}{' puzzle' if puzzle else ''} {cups} cups: "
+                          + ", ".join(f"{row['player']} {row['spins']} spins" for row in leaders))
+    print(f"\n{'mode':6} {'puzzle':>6} {'cups':>4} {'player':10} {'games':>8} {'win rate':>9} {'mean':>6} {'best':>5}")
+    for row in stats:
+        mean = f"{row['mean_spins']:.2f}" if row['mean_spins'] is not None else '-'
+        print(f"{row['mode']:6} {row['puzzle']:6} {row['cups']:4} {row['player']:10} {row['games']:8,} "
+              f"{row['win_rate']:9.2%} {mean:>6} {row['best_spins'] or '-':>5}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Parameter sweeps: play every combination of the game's settings across processes
+
+A sweep is the cross product of max_turns, cup count, reveal count,
+adversary, strategy and starting distribution. Each combination (a cell) is
+played for a number of games, cut into fixed-size shards with their own seeds
+as in coin_game_tournament, and the shards are spread over a process pool.
+The classic strategies (coin_game_engine.STRATEGIES, or a compiled policy
+file) need the 4-cup, 2-reveal board; 'make-heads' plays
+coin_game_ring.RingGame on any board but only against random spins.
+Combinations that cannot be played are left out.
+
+Every game becomes one row of a coin_game_columns file: the cell's settings,
+the starting state and the turns taken to win (0 for a loss):
+
+    python coin_game_sweep.py --cups 4 8 16 --reveals 2 3 --strategy make-heads --out rings.cgc
+    python coin_game_sweep.py --adversary random heuristic --start uniform one-off --games 100000
+"""
+
+import itertools
+import random
+from array import array
+
+from coin_game_adversary import ADVERSARIES
+from coin_game_columns import read_columns, write_columns
+from coin_game_engine import HeadlessCoinGame
+from coin_game_policy import resolve_strategy
+from coin_game_ring import RingGame, make_heads_strategy
+from coin_game_start import StartStateSampler
+from coin_game_stats import StatsTable
+
+PARAMETERS = ('max_turns', 'cups', 'reveals', 'adversary', 'strategy', 'start')
+CATEGORICAL = ('adversary', 'strategy', 'start')
+RING_STRATEGY = 'make-heads'
+STARTS = ('uniform', 'one-off', 'balanced')
+
+
+def start_sampler(name, cups):
+    """StartStateSampler for a named starting distribution"""
+    top = (1 << cups) - 1
+    if name == 'uniform':
+        return StartStateSampler(cups)
+    if name == 'one-off':
+        # One coin differs from the rest
+        return StartStateSampler(cups, {top ^ (1 << cup): 1 for cup in range(cups)} |
+                                       {1 << cup: 1 for cup in range(cups)})
+    if name == 'balanced':
+        if cups > 20:
+            raise ValueError("the balanced start enumerates 2**cups states; use 20 cups or fewer")
+        return StartStateSampler.by_heads({cups // 2: 1}, cups)
+    raise ValueError(f"unknown starting distribution {name!r}; use one of {', '.join(STARTS)}")
+
+
+class DrawnStates:
+    """Wraps a StartStateSampler and keeps every state it draws"""
+
+    def __init__(self, sampler):
+        self.sampler = sampler
+        self.drawn = array('Q')
+
+    def sample(self, rng):
+        state = self.sampler.sample(rng)
+        self.drawn.append(state)
+        return state
+
+
+def playable(cell):
+    """Whether a (max_turns, cups, reveals, adversary, strategy, start) cell can be played"""
+    max_turns, cups, reveals, adversary, strategy, start = cell
+    if not 0 < reveals <= cups or not 1 < cups <= 64 or not 0 < max_turns < 1 << 16:
+        return False
+    if strategy == RING_STRATEGY:
+        return adversary == 'random'
+    return cups == 4 and reveals == 2
+
+
+def sweep_cells(max_turns=(50,), cups=(4,), reveals=(2,), adversaries=('random',), strategies=('optimal',),
+                starts=('uniform',)):
+    """Every playable combination of the given settings, in order"""
+    return [cell for cell in itertools.product(max_turns, cups, reveals, adversaries, strategies, starts)
+            if playable(cell)]
+
+
+def shard_seed(seed, cell, shard):
+    """Independent, reproducible seed for one shard of a cell"""
+    return random.Random(f"{seed}:{':'.join(map(str, cell))}:{shard}").getrandbits(64)
+
+
+def play_shard(task):
+    """Worker entry point: play one shard; return (start states, turns) arrays"""
+    cell, shard, games, seed = task
+    max_turns, cups, reveals, adversary, strategy, start = cell
+    starts = DrawnStates(start_sampler(start, cups))
+    turns = array('H')
+    if strategy == RING_STRATEGY:
+        game = RingGame(cups, reveals, max_turns=max_turns, seed=shard_seed(seed, cell, shard))
+        game.start_states = starts
+        ring_strategy = make_heads_strategy(cups, reveals)
+        for _ in range(games):
+            turns.append(game.play_game(ring_strategy) or 0)
+    else:
+        game = HeadlessCoinGame(resolve_strategy(strategy, max_turns), seed=shard_seed(seed, cell, shard),
+                                max_turns=max_turns, adversary=ADVERSARIES[adversary], start_states=starts)
+        for _ in range(games):
+            turns.append(game.play_game() or 0)
+    return starts.drawn, turns
+
+
+def run_sweep(cells, games=10000, seed=0, workers=None, shard_size=10000):
+    """Play every cell; return ({column: array}, {column: labels}) ready for write_columns
+
+    workers=1 plays in this process; otherwise shards are spread over a process
+    pool (workers=None uses every core). Shards come back in order, so the rows
+    are the same whatever the number of workers.
+    """
+    labels = {name: tuple(dict.fromkeys(cell[PARAMETERS.index(name)] for cell in cells)) for name in CATEGORICAL}
+    codes = {name: {label: code for code, label in enumerate(labels[name])} for name in CATEGORICAL}
+    tasks = []
+    for cell in cells:
+        for shard, start in enumerate(range(0, games, shard_size)):
+            tasks.append((cell, shard, min(shard_size, games - start), seed))
+
+    columns = {
+        'max_turns': array('H'),
+        'cups': array('B'),
+        'reveals': array('B'),
+        'adversary': array('B'),
+        'strategy': array('B'),
+        'start': array('B'),
+        'start_state': array('Q'),
+        'turns': array('H'),
+    }
+
+    def collect(results):
+        for (cell, _, count, _), (start_states, turns) in zip(tasks, results):
+            for name, value in zip(PARAMETERS, cell):
+                column = columns[name]
+                column.extend(array(column.typecode, [codes[name][value] if name in codes else value]) * count)
+            columns['start_state'].extend(start_states)
+            columns['turns'].extend(turns)
+
+    if workers == 1:
+        collect(map(play_shard, tasks))
+    else:
+        import multiprocessing
+
+        with multiprocessing.Pool(workers) as pool:
+            collect(pool.imap(play_shard, tasks))
+    return columns, labels
+
+
+def summarize(table):
+    """StatsTable keyed by each cell's settings, from a loaded sweep"""
+    max_turns = max(table['max_turns'], default=50)
+    stats = StatsTable(max_turns)
+    parameters = [table.decoded(name) if name in table.labels else table[name] for name in PARAMETERS]
+    for cell_and_turns in zip(*parameters, table['turns']):
+        stats.add(cell_and_turns[:-1], cell_and_turns[-1] or None)
+    return stats
+
+
+def main():
+    import argparse
+    import os
+    import time
+
+    from coin_game_engine import STRATEGIES
+
+    parser = argparse.ArgumentParser(description="Play the game over a grid of settings")
+    parser.add_argument('--max-turns', type=int, nargs='+', default=[50])
+    parser.add_argument('--cups', type=int, nargs='+', default=[4])
+    parser.add_argument('--reveals', type=int, nargs='+', default=[2])
+    parser.add_argument('--adversary', nargs='+', default=['random'], choices=sorted(ADVERSARIES))
+    parser.add_argument('--strategy', nargs='+', default=['optimal'],
+                        help=f"{RING_STRATEGY}, one of {', '.join(sorted(STRATEGIES))} or a compiled policy file")
+    parser.add_argument('--start', nargs='+', default=['uniform'], choices=STARTS)
+    parser.add_argument('--games', type=int, default=10000, help="games per cell")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="processes to use (default: all cores)")
+    parser.add_argument('--out', default='sweep.cgc')
+    args = parser.parse_args()
+
+    cells = sweep_cells(args.max_turns, args.cups, args.reveals, args.adversary, args.strategy, args.start)
+    if not cells:
+        parser.error("no playable combination of settings")
+
+    start = time.perf_counter()
+    columns, labels = run_sweep(cells, args.games, args.seed, args.workers)
+    played = time.perf_counter() - start
+    write_columns(args.out, columns, labels)
+    start = time.perf_counter()
+    table = read_columns(args.out)
+    loaded = time.perf_counter() - start
+
+    print(f"{'max':>4} {'cups':>4} {'rev':>3} {'adversary':10} {'strategy':14} {'start':8} {'win rate':>9} "
+          f"{'mean':>7} {'p99':>5}")
+    for (max_turns, cups, reveals, adversary, strategy, start_name), stats in summarize(table).stats.items():
+        mean = f"{stats.mean:.2f}" if stats.wins else '-'
+        print(f"{max_turns:4} {cups:4} {reveals:3} {adversary:10} {strategy:14} {start_name:8} "
+              f"{stats.win_rate:9.2%} {mean:>7} {stats.percentile(99) or '-':>5}")
+    print(f"\n{len(cells)} cells, {len(table):,} games in {played:.2f}s; "
+          f"{os.path.getsize(args.out):,} bytes in {args.out}, reloaded in {loaded * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
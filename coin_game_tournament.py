@@ -0,0 +1,138 @@
+"""Strategy tournament: every strategy against every adversary, sharded across processes
+
+Games for each (strategy, adversary) pair are cut into fixed-size shards, and
+each shard gets its own random stream derived from the tournament seed and the
+shard's identity. Each shard returns a coin_game_stats.TurnStats: counts and
+histograms add, and the running mean and variance combine with Chan's formula.
+That combination is floating point and depends on its order, so shards are
+merged in task order (imap, not imap_unordered). Results then depend only on
+the seed, whatever the number of workers.
+"""
+
+import random
+
+from coin_game_adversary import ADVERSARIES
+from coin_game_engine import STRATEGIES, run_games
+from coin_game_policy import resolve_strategy
+from coin_game_stats import PERCENTILES, Snapshots, StatsTable, TurnStats, format_snapshot
+
+def shard_seed(seed, strategy_name, adversary_name, shard):
+    """Independent, reproducible seed for one shard"""
+    # Seeding Random with a string hashes it with SHA-512, independent of PYTHONHASHSEED
+    return random.Random(f"{seed}:{strategy_name}:{adversary_name}:{shard}").getrandbits(64)
+
+
+def play_shard(task):
+    """Worker entry point: play one shard and return its statistics"""
+    strategy_name, adversary_name, shard, games, seed, max_turns = task
+    stats = TurnStats(max_turns)
+    run_games(
+        resolve_strategy(strategy_name, max_turns),
+        games,
+        seed=shard_seed(seed, strategy_name, adversary_name, shard),
+        max_turns=max_turns,
+        adversary=ADVERSARIES[adversary_name],
+        stats=stats,
+    )
+    return strategy_name, adversary_name, stats
+
+
+def run_tournament(strategy_names=None, adversary_names=None, games=100000, seed=0,
+                   max_turns=50, workers=None, shard_size=10000, progress=None):
+    """Play every strategy against every adversary
+
+    Returns {(strategy_name, adversary_name): summary}. workers=1 plays in
+    this process; otherwise shards are spread over a process pool
+    (workers=None uses every core). progress is an optional
+    coin_game_stats.Snapshots, ticked per shard with the running StatsTable.
+    """
+    strategy_names = list(strategy_names or STRATEGIES)
+    adversary_names = list(adversary_names or ADVERSARIES)
+    # Load every strategy here first, so a bad name or file fails in this process, not inside a worker
+    for strategy_name in strategy_names:
+        resolve_strategy(strategy_name, max_turns)
+    tasks = []
+    for strategy_name in strategy_names:
+        for adversary_name in adversary_names:
+            for shard, start in enumerate(range(0, games, shard_size)):
+                tasks.append((strategy_name, adversary_name, shard, min(shard_size, games - start), seed, max_turns))
+
+    if workers == 1:
+        results = map(play_shard, tasks)
+        return merge(results, strategy_names, adversary_names, max_turns, progress)
+
+    import multiprocessing
+
+    # imap, not imap_unordered: floating-point merges depend on their order, and
+    # merging in task order keeps the results independent of the worker count
+    with multiprocessing.Pool(workers) as pool:
+        return merge(pool.imap(play_shard, tasks), strategy_names, adversary_names, max_turns, progress)
+
+
+def merge(results, strategy_names, adversary_names, max_turns=50, progress=None):
+    """Merge shard statistics per pair and summarize"""
+    table = StatsTable(max_turns)
+    # Create every pair up front so the summaries keep the requested order
+    for strategy_name in strategy_names:
+        for adversary_name in adversary_names:
+            table[strategy_name, adversary_name]
+    for strategy_name, adversary_name, stats in results:
+        table[strategy_name, adversary_name].merge(stats)
+        if progress is not None:
+            progress.tick(table, stats.games)
+    return table.summaries()
+
+
+def format_results(results):
+    """Table of pairs ranked by win rate, then by mean spins"""
+    def rank(item):
+        summary = item[1]
+        return (-summary['win_rate'], summary['mean_spins'] or float('inf'))
+
+    def cell(value):
+        return '-' if value is None else f"{value:.2f}" if isinstance(value, float) else str(value)
+
+    lines = [f"{'strategy':12} {'adversary':10} {'win rate':>9} {'mean':>6} {'sd':>5} "
+             + " ".join(f"{'p' + str(pct):>5}" for pct in PERCENTILES)]
+    for (strategy_name, adversary_name), summary in sorted(results.items(), key=rank):
+        lines.append(f"{strategy_name:12} {adversary_name:10} {summary['win_rate']:9.2%} "
+                     f"{cell(summary['mean_spins']):>6} {cell(summary['stddev_spins']):>5} "
+                     + " ".join(f"{cell(summary[f'p{pct}_spins']):>5}" for pct in PERCENTILES))
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Rank strategies against every adversary")
+    parser.add_argument('--games', type=int, default=100000, help="games per strategy/adversary pair")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="processes to use (default: all cores)")
+    parser.add_argument('--strategy', action='append',
+                        help=f"one of {', '.join(sorted(STRATEGIES))} or a compiled policy file")
+    parser.add_argument('--adversary', action='append', choices=sorted(ADVERSARIES))
+    parser.add_argument('--progress', type=float, metavar='SECONDS', help="print running totals this often")
+    args = parser.parse_args()
+
+    progress = None
+    if args.progress:
+        def report(table):
+            print(format_snapshot(table.total()), flush=True)
+        progress = Snapshots(report, every_seconds=args.progress)
+
+    for name in args.strategy or ():
+        try:
+            resolve_strategy(name)
+        except (OSError, ValueError) as error:
+            parser.error(f"--strategy {name}: not a registered strategy or a readable policy file ({error})")
+
+    start = time.perf_counter()
+    results = run_tournament(args.strategy, args.adversary, args.games, args.seed, workers=args.workers,
+                             progress=progress)
+    print(format_results(results))
+    print(f"\n{time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Leveled event tracing for the GUI and engines
+
+Tracing is off by default and call sites guard on a single attribute check:
+
+    if TRACE.enabled:
+        TRACE.emit('select_cup', cup_index, 'select')
+
+so nothing is formatted or written unless it is switched on. Levels:
+    OFF      nothing recorded
+    TIMINGS  handlers wrapped with @traced record their run time
+    EVENTS   game events too, as (time_ns, kind, fields) tuples in a ring buffer
+    DEBUG    events are also printed as they happen, like the old DEBUG output
+EVENT_FIELDS names the fields of every kind. dump() writes the buffer as JSON lines.
+Set COIN_GAME_TRACE=<level> in the environment to enable tracing at startup.
+"""
+
+import collections
+import functools
+import json
+import os
+import sys
+import time
+
+OFF, TIMINGS, EVENTS, DEBUG = range(4)
+LEVELS = {'off': OFF, 'timings': TIMINGS, 'events': EVENTS, 'debug': DEBUG}
+
+# kind -> names of the fields it carries, in order
+EVENT_FIELDS = {
+    'select_cup': ('cup', 'action'),  # action: select, deselect, replace, flip or blocked
+    'examine': ('cups', 'coins', 'mode', 'puzzle'),
+    'puzzle_rotation': ('rotation_degrees', 'coins'),
+    'flip': ('cups', 'choice', 'coins'),
+    'spin': ('turn', 'outcome'),  # outcome: won, lost or continue
+    'widget_error': ('where', 'error'),
+    'handler': ('name', 'elapsed_ns'),
+}
+
+
+class Tracer:
+    """Ring buffer of typed events plus per-handler timing totals"""
+
+    def __init__(self, capacity=65536):
+        self.level = OFF
+        self.timing = False  # level >= TIMINGS, checked by @traced
+        self.enabled = False  # level >= EVENTS, checked at every emit() call site
+        self.events = collections.deque(maxlen=capacity)
+        # handler name -> [calls, total ns, max ns]
+        self.handler_stats = {}
+
+    def enable(self, level=EVENTS, capacity=None):
+        """Start recording at a level, optionally resizing the ring buffer"""
+        if capacity is not None and capacity != self.events.maxlen:
+            self.events = collections.deque(self.events, maxlen=capacity)
+        self.level = level
+        self.timing = level >= TIMINGS
+        self.enabled = level >= EVENTS
+
+    def disable(self):
+        """Stop recording; what was captured stays available"""
+        self.enable(OFF)
+
+    def clear(self):
+        """Drop every recorded event and timing"""
+        self.events.clear()
+        self.handler_stats.clear()
+
+    def emit(self, kind, *fields):
+        """Record one event; only call this behind an `if TRACE.enabled` check"""
+        self.events.append((time.perf_counter_ns(), kind, fields))
+        if self.level >= DEBUG:
+            print(f"DEBUG: {kind} " + " ".join(f"{name}={value}" for name, value in zip(EVENT_FIELDS[kind], fields)))
+
+    def handler_time(self, name, elapsed_ns):
+        """Record one handler run"""
+        stats = self.handler_stats.get(name)
+        if stats is None:
+            stats = self.handler_stats[name] = [0, 0, 0]
+        stats[0] += 1
+        stats[1] += elapsed_ns
+        if elapsed_ns > stats[2]:
+            stats[2] = elapsed_ns
+        if self.enabled:
+            self.events.append((time.perf_counter_ns(), 'handler', (name, elapsed_ns)))
+
+    def records(self):
+        """The buffered events as dictionaries"""
+        for time_ns, kind, fields in self.events:
+            record = {'time_ns': time_ns, 'event': kind}
+            record.update(zip(EVENT_FIELDS[kind], fields))
+            yield record
+
+    def dump(self, path):
+        """Write the buffer and handler timings to a JSON-lines trace file"""
+        with open(path, 'w') as f:
+            for record in self.records():
+                f.write(json.dumps(record, default=list) + '\n')
+            for name, (calls, total_ns, max_ns) in sorted(self.handler_stats.items()):
+                f.write(json.dumps({'event': 'handler_summary', 'name': name, 'calls': calls,
+                                    'total_ns': total_ns, 'max_ns': max_ns}) + '\n')
+
+    def summary(self):
+        """One line per handler: calls, mean and worst latency"""
+        lines = []
+        for name, (calls, total_ns, max_ns) in sorted(self.handler_stats.items()):
+            lines.append(f"{name:24} {calls:8} calls  mean {total_ns / calls / 1000:8.1f} µs  "
+                         f"max {max_ns / 1000:8.1f} µs")
+        return "\n".join(lines)
+
+
+TRACE = Tracer()
+if os.environ.get('COIN_GAME_TRACE'):
+    level = LEVELS.get(os.environ['COIN_GAME_TRACE'].lower())
+    if level is None:
+        # A typo in the variable should not stop the game from starting
+        print(f"COIN_GAME_TRACE={os.environ['COIN_GAME_TRACE']!r} is not one of {', '.join(LEVELS)}; "
+              "tracing stays off", file=sys.stderr)
+    else:
+        TRACE.enable(level)
+
+
+def traced(handler):
+    """Time every call of an event handler while tracing is enabled"""
+    name = handler.__name__
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        if not TRACE.timing:
+            return handler(*args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            TRACE.handler_time(name, time.perf_counter_ns() - start)
+    return wrapper
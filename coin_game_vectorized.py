@@ -0,0 +1,89 @@
+"""Batched Monte Carlo simulator: many games at once as rows of a NumPy array
+
+Each turn applies the Lazy Susan spin, the strategy's cup selection and flip,
+and the win check to every unfinished game in a single vectorized step, using
+the same tables as coin_game_state. Finished games are masked out.
+"""
+
+import numpy as np
+
+from coin_game_start import UNIFORM
+from coin_game_state import FLIP_MASK, IS_WIN, ROTATE
+
+ROTATE_TABLE = np.array(ROTATE, dtype=np.uint8)
+IS_WIN_TABLE = np.array(IS_WIN, dtype=bool)
+
+OBSERVATIONS = (('T', 'T'), ('H', 'T'), ('T', 'H'), ('H', 'H'))
+
+
+def flip_table(strategy, turn, cup_indices):
+    """XOR mask for each of the four possible observations on this turn
+
+    Index bit 0 is the first cup showing heads, bit 1 the second.
+    """
+    masks = FLIP_MASK[cup_indices]
+    return np.array([masks[strategy.flip(turn, observed)] for observed in OBSERVATIONS], dtype=np.uint8)
+
+
+def simulate_batch(strategy, games, seed=None, max_turns=50, rng=None, start_states=UNIFORM):
+    """Play a batch of games together; return an array of turns-to-win (0 = lost)"""
+    if rng is None:
+        rng = np.random.default_rng(seed)
+    states = start_states.fill_numpy(games, rng)
+    active = np.arange(games)
+    turns = np.zeros(games, dtype=np.int16)
+
+    for turn in range(max_turns):
+        if not len(active):
+            break
+        states = ROTATE_TABLE[rng.integers(4, size=len(states)), states]
+        cup_a, cup_b = cup_indices = strategy.select(turn)
+        observed = (states >> cup_a & 1) | (states >> cup_b & 1) << 1
+        states ^= flip_table(strategy, turn, cup_indices)[observed]
+
+        won = IS_WIN_TABLE[states]
+        turns[active[won]] = turn + 1
+        still_playing = ~won
+        active = active[still_playing]
+        states = states[still_playing]
+
+    return turns
+
+
+def simulate(strategy, games, seed=None, max_turns=50, batch_size=1_000_000, start_states=UNIFORM):
+    """Play any number of games in fixed-size batches
+
+    Returns (wins, histogram) where histogram[t] counts games won on turn t
+    and histogram[0] counts losses. Memory use is bounded by batch_size.
+    """
+    rng = np.random.default_rng(seed)
+    histogram = np.zeros(max_turns + 1, dtype=np.int64)
+    remaining = games
+    while remaining > 0:
+        batch = min(batch_size, remaining)
+        histogram += np.bincount(simulate_batch(strategy, batch, max_turns=max_turns, rng=rng,
+                                                start_states=start_states),
+                                 minlength=max_turns + 1)
+        remaining -= batch
+    return games - int(histogram[0]), histogram
+
+
+def main():
+    import sys
+    import time
+
+    from coin_game_engine import STRATEGIES
+
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    for name, strategy in STRATEGIES.items():
+        start = time.perf_counter()
+        wins, histogram = simulate(strategy, games, seed=0)
+        elapsed = time.perf_counter() - start
+        won_turns = np.nonzero(histogram[1:])[0]
+        worst = int(won_turns[-1]) + 1 if len(won_turns) else 0
+        print(f"{name:12} win rate {wins / games:7.2%}  worst {worst:2} turns  "
+              f"{games / elapsed:,.0f} games/sec")
+
+
+if __name__ == "__main__":
+    main()
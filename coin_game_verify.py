@@ -0,0 +1,367 @@
+"""Model checker: prove a strategy wins within a bound against every rotation sequence
+
+The strategy's moves depend only on the turn and what it sees, so the
+adversary's whole power is the spin before each look. verify() runs a
+breadth-first search whose layer t is the set of coin states the adversary
+can still hold after t turns. Because the adversary spins before every look,
+a state and its rotations are interchangeable, so each layer keeps one
+canonical state per rotation class, stored as a bitset (an int with bit s set
+for canonical state s). An empty layer proves the bound. Otherwise the
+smallest surviving state is traced back to a concrete counterexample. If a
+layer repeats at the same phase of the strategy's cycle, the adversary can
+stall forever, and the counterexample is a lasso: a run into a loop of turns
+the adversary can repeat.
+
+    python coin_game_verify.py                 # every classic strategy
+    python coin_game_verify.py --ring 12 3     # make-heads on 12 cups, 3 revealed
+"""
+
+from array import array
+
+from coin_game_policy import compile_strategy
+from coin_game_state import FLIP_MASK, IS_WIN, PEEK, ROTATE, START_STATES, STATES
+
+
+class ClassicModel:
+    """The 2x2 game from coin_game_state, for Strategy objects from coin_game_engine"""
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.states = STATES
+        self.rotations = len(ROTATE)
+        self.canon = array('B', (min(rotate[state] for rotate in ROTATE) for state in range(STATES)))
+        self.starts = sorted({self.canon[state] for state in START_STATES})
+        self.moves = {}  # turn -> (cup_indices, {observed: (choice, mask)})
+
+    def canonical(self, state):
+        return self.canon[state]
+
+    def rotate(self, state, rotation):
+        return ROTATE[rotation][state]
+
+    def is_win(self, state):
+        return IS_WIN[state]
+
+    def move(self, turn):
+        """Cups examined on a turn and the flip for every observation"""
+        move = self.moves.get(turn)
+        if move is None:
+            cup_indices = tuple(self.strategy.select(turn))
+            flips = {}
+            for observed in set(PEEK[cup_indices]):
+                choice = self.strategy.flip(turn, observed)
+                flips[observed] = (choice, FLIP_MASK[cup_indices][choice])
+            move = self.moves[turn] = (cup_indices, flips)
+        return move
+
+    def step(self, state, turn):
+        """(observed, choice, next state) after a state has been spun"""
+        cup_indices, flips = self.move(turn)
+        observed = PEEK[cup_indices][state]
+        choice, mask = flips[observed]
+        return observed, choice, state ^ mask
+
+    def cups(self, turn):
+        return self.move(turn)[0]
+
+    def describe(self, state):
+        return ''.join('H' if state >> cup & 1 else 'T' for cup in range(4))
+
+
+def necklaces(cups):
+    """Smallest rotation of every coin ring, in increasing order
+
+    Duval's algorithm yields the Lyndon words of length up to `cups` in
+    lexicographic order; those whose length divides `cups`, repeated to
+    fill the ring, are exactly the necklaces. Read with the first cup as the
+    high bit, lexicographic order is numeric order, so each is the smallest
+    rotation of its class.
+    """
+    word = [-1]
+    while word:
+        word[-1] += 1
+        if cups % len(word) == 0:
+            state = 0
+            for bit in word * (cups // len(word)):
+                state = state << 1 | bit
+            yield state
+        length = len(word)
+        while len(word) < cups:
+            word.append(word[-length])
+        while word and word[-1] == 1:
+            word.pop()
+
+
+class RingModel:
+    """N cups in a ring with k revealed, for ring strategies from coin_game_ring
+
+    Nothing here is tabulated over all 2**cups states: canonical forms are
+    computed on demand and the starting classes are generated as necklaces,
+    so memory grows with the surviving layers rather than the state space.
+    """
+
+    def __init__(self, strategy, cups, reveals):
+        self.strategy = strategy
+        self.cups_count = cups
+        self.states = 1 << cups
+        self.full = self.states - 1
+        self.rotations = cups
+        self.starts = [state for state in necklaces(cups) if not self.is_win(state)]
+        self.moves = {}
+
+    def canonical(self, state):
+        """Smallest rotation of a state"""
+        doubled = state | state << self.cups_count
+        full = self.full
+        return min(doubled >> steps & full for steps in range(self.cups_count))
+
+    def rotate(self, state, steps):
+        steps %= self.cups_count
+        return ((state << steps) | (state >> (self.cups_count - steps))) & self.full
+
+    def is_win(self, state):
+        return state == 0 or state == self.full
+
+    def move(self, turn):
+        """Cups examined on a turn and a cache of flips by observation"""
+        move = self.moves.get(turn)
+        if move is None:
+            move = self.moves[turn] = (tuple(self.strategy.select(turn)), {})
+        return move
+
+    def step(self, state, turn):
+        cup_indices, flips = self.move(turn)
+        observed = 0
+        for j, cup in enumerate(cup_indices):
+            if state >> cup & 1:
+                observed |= 1 << j
+        flip = flips.get(observed)
+        if flip is None:
+            choice = self.strategy.flip(turn, observed)
+            mask = 0
+            for j, cup in enumerate(cup_indices):
+                if choice >> j & 1:
+                    mask |= 1 << cup
+            flip = flips[observed] = (choice, mask)
+        return observed, flip[0], state ^ flip[1]
+
+    def cups(self, turn):
+        return self.move(turn)[0]
+
+    def describe(self, state):
+        return ''.join('H' if state >> cup & 1 else 'T' for cup in range(self.cups_count))
+
+
+class Verdict:
+    """Outcome of verify()
+
+    proven: every game is won within `bound` turns; worst_case is the exact
+    guaranteed number of turns. Otherwise counterexample is a list of turns
+    (dicts) the adversary can force without a win. When the surviving states
+    started repeating, cycle is (first, repeat) and the counterexample is a
+    lasso: its turns from loop_start on end in a rotation of the coins they
+    began with, so the adversary can replay them forever and no bound exists.
+    """
+
+    def __init__(self, bound, worst_case=None, counterexample=None, cycle=None, layer_sizes=(), loop_start=None):
+        self.bound = bound
+        self.worst_case = worst_case
+        self.counterexample = counterexample
+        self.cycle = cycle
+        self.loop_start = loop_start
+        self.layer_sizes = list(layer_sizes)
+
+    @property
+    def proven(self):
+        return self.counterexample is None
+
+    def __repr__(self):
+        if self.proven:
+            return f"Verdict(proven, worst_case={self.worst_case})"
+        return f"Verdict(refuted within {self.bound}, cycle={self.cycle})"
+
+
+def bits(bitset):
+    """Indices of the set bits of an int, lowest first"""
+    for index, byte in enumerate(bitset.to_bytes((bitset.bit_length() + 7) // 8, 'little')):
+        while byte:
+            low = byte & -byte
+            yield index << 3 | low.bit_length() - 1
+            byte ^= low
+
+
+def to_bitset(states, size):
+    """Bitset of states below `size`, set byte by byte rather than by growing an int"""
+    buffer = bytearray((size + 7) >> 3)
+    for state in states:
+        buffer[state >> 3] |= 1 << (state & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def expand(model, layer, turn):
+    """Canonical states the adversary can reach one turn after a layer, minus wins"""
+    canonical = model.canonical
+    rotate = model.rotate
+    step = model.step
+    is_win = model.is_win
+    rotations = range(model.rotations)
+    # Spins of different states often land on the same state, so canonicalise each once
+    afters = {step(rotate(state, rotation), turn)[2] for state in bits(layer) for rotation in rotations}
+    reached = (canonical(after) for after in afters if not is_win(after))
+    return to_bitset(reached, model.states)
+
+
+def verify(model, bound, period=None):
+    """Prove every game is won within `bound` turns, or find a counterexample
+
+    period is how often the strategy repeats its choices, used to stop early
+    when the surviving states cycle. With None no cycle check is made.
+    """
+    layers = [to_bitset(model.starts, model.states)]
+    seen = {}
+    cycle = None
+    for turn in range(bound):
+        layer = layers[turn]
+        if not layer:
+            return Verdict(bound, worst_case=turn, layer_sizes=[bin(layer).count('1') for layer in layers])
+        if period is not None:
+            key = (turn % period, layer)
+            if key in seen:
+                cycle = (seen[key], turn)
+                break
+            seen[key] = turn
+        layers.append(expand(model, layer, turn))
+
+    sizes = [bin(layer).count('1') for layer in layers]
+    if cycle is None and not layers[bound]:
+        return Verdict(bound, worst_case=bound, layer_sizes=sizes)
+    if cycle is None:
+        path = walk_back(model, layers, next(bits(layers[bound])), bound, 0)[0]
+        return Verdict(bound, counterexample=replay(model, path), layer_sizes=sizes)
+    path, loop_start = lasso(model, layers, *cycle)
+    return Verdict(bound, counterexample=replay(model, path), cycle=cycle, layer_sizes=sizes,
+                   loop_start=loop_start)
+
+
+def walk_back(model, layers, target, end, start):
+    """Canonical (state, rotation) for turns start..end-1 of a run reaching target after `end` turns
+
+    Returns the path and the canonical state it starts from at turn `start`.
+    """
+    canonical = model.canonical
+    path = []
+    for turn in range(end - 1, start - 1, -1):
+        for state in bits(layers[turn]):
+            rotation = next((rotation for rotation in range(model.rotations)
+                             if canonical(model.step(model.rotate(state, rotation), turn)[2]) == target), None)
+            if rotation is not None:
+                path.append((state, rotation))
+                target = state
+                break
+    path.reverse()
+    return path, target
+
+
+def lasso(model, layers, first, repeat):
+    """A run from a start into a loop the adversary can repeat forever, and the turn the loop begins
+
+    layers[first] == layers[repeat] at the same phase, so every surviving state
+    at turn `repeat` can be walked back to one at turn `first`. Repeating that
+    walk must revisit a state; the walks between the two visits, run forwards,
+    are the loop.
+    """
+    state = next(bits(layers[first]))
+    seen = {state: 0}
+    segments = []
+    while True:
+        segment, state = walk_back(model, layers, state, repeat, first)
+        segments.append(segment)
+        if state in seen:
+            break
+        seen[state] = len(segments)
+    prefix = walk_back(model, layers, state, first, 0)[0]
+    loop = [step for segment in reversed(segments[seen[state]:]) for step in segment]
+    return prefix + loop, first
+
+
+def replay(model, path):
+    """Turn a canonical path into concrete turns, adjusting each spin to the actual coins"""
+    trace = []
+    actual = path[0][0]
+    for turn, (state, rotation) in enumerate(path):
+        spun = model.rotate(state, rotation)
+        spin = next(r for r in range(model.rotations) if model.rotate(actual, r) == spun)
+        observed, choice, after = model.step(spun, turn)
+        trace.append({
+            'turn': turn + 1,
+            'coins': model.describe(actual),
+            'rotation': spin,
+            'spun': model.describe(spun),
+            'cups': model.cups(turn),
+            'observed': observed,
+            'choice': choice,
+            'after': model.describe(after),
+        })
+        actual = after
+    return trace
+
+
+def check_strategy(strategy, bound=50):
+    """verify() a classic strategy, using its compiled period for cycle detection"""
+    return verify(ClassicModel(strategy), bound, compile_strategy(strategy, bound).period)
+
+
+def format_trace(trace, loop_start=None):
+    """One line per turn of a counterexample, marking where a lasso's loop begins"""
+    lines = [
+        f"  turn {step['turn']:3}: {step['coins']} spun {step['rotation']} -> {step['spun']}, "
+        f"look at {step['cups']} see {step['observed']}, flip {step['choice']} -> {step['after']}"
+        + ("   <- loop starts" if i == loop_start else "")
+        for i, step in enumerate(trace)
+    ]
+    if loop_start is not None:
+        lines.append(f"  ... then from turn {loop_start + 1} again, forever")
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+    import time
+
+    from coin_game_engine import STRATEGIES
+    from coin_game_ring import make_heads_strategy
+
+    parser = argparse.ArgumentParser(description="Prove strategies win within a bound against every spin")
+    parser.add_argument('--bound', type=int, default=50)
+    parser.add_argument('--ring', nargs=2, type=int, metavar=('CUPS', 'REVEALS'),
+                        help="check make-heads on a ring instead of the classic strategies")
+    args = parser.parse_args()
+
+    if args.ring:
+        cups, reveals = args.ring
+        strategy = make_heads_strategy(cups, reveals)
+        cases = [(strategy.name, lambda: verify(RingModel(strategy, cups, reveals), args.bound,
+                                                max(1, cups // reveals)))]
+    else:
+        cases = [(name, lambda strategy=strategy: check_strategy(strategy, args.bound))
+                 for name, strategy in STRATEGIES.items()]
+
+    for name, run in cases:
+        start = time.perf_counter()
+        verdict = run()
+        elapsed = time.perf_counter() - start
+        if verdict.proven:
+            print(f"{name}: PROVEN, always wins within {verdict.worst_case} turns ({elapsed * 1000:.1f} ms)")
+        else:
+            if verdict.cycle:
+                print(f"{name}: REFUTED, the spins can avoid a win forever ({elapsed * 1000:.1f} ms)")
+                print(format_trace(verdict.counterexample, verdict.loop_start))
+                continue
+            print(f"{name}: REFUTED, the spins can avoid a win for {verdict.bound} turns ({elapsed * 1000:.1f} ms)")
+            print(format_trace(verdict.counterexample[:8]))
+            if len(verdict.counterexample) > 8:
+                print(f"  ... {len(verdict.counterexample) - 8} more turns")
+
+
+if __name__ == "__main__":
+    main()
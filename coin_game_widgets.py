@@ -0,0 +1,207 @@
+"""In-memory widget backend so CoinGameGUI runs without a display
+
+CoinGameGUI builds its widgets from a backend namespace (Frame, Label, Button,
+LEFT and messagebox). coin_game_gui.tk_backend() is real Tk; virtual_backend()
+here keeps every widget's options in a dict, records message boxes instead of
+blocking on them, and runs root.after() callbacks on a virtual clock:
+
+    root = VirtualRoot()
+    gui = CoinGameGUI(root, backend=virtual_backend())
+    gui.select_cup(0); gui.select_cup(3); gui.examine_cups(); gui.flip_coins(3)
+    gui.spin_lazy_susan(); root.run_until_idle()
+
+    python coin_game_widgets.py 10000            # scripted soak test, 10,000 sessions
+    python coin_game_widgets.py 10000 --puzzle
+    python coin_game_widgets.py 1000 --autoplay  # the GUI's own autoplay bot, through root.after
+    python coin_game_widgets.py 10000 --db soak.db  # keep every game in a coin_game_store database
+"""
+
+import collections
+import heapq
+import itertools
+import types
+
+
+class VirtualWidget:
+    """Just enough of a Tk widget for CoinGameGUI to build and redraw without a display"""
+
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = options
+        self.packed = False
+
+    def config(self, **options):
+        self.options.update(options)
+
+    configure = config
+
+    def cget(self, option):
+        return self.options[option]
+
+    def pack(self, **options):
+        self.packed = True
+
+    def pack_forget(self):
+        self.packed = False
+
+    def grid(self, **options):
+        self.packed = True
+
+    def place(self, **options):
+        self.packed = True
+
+    def winfo_exists(self):
+        return True
+
+    def invoke(self):
+        """Click the widget: run its command unless it is disabled"""
+        command = self.options.get('command')
+        if command is not None and self.options.get('state') != 'disabled':
+            return command()
+
+
+class VirtualRoot(VirtualWidget):
+    """Tk root stand-in whose after() queue runs on a virtual millisecond clock"""
+
+    def __init__(self):
+        super().__init__()
+        self.now_ms = 0
+        self.jobs = []  # heap of (due_ms, job_id, callback, args)
+        self.cancelled = set()
+        self.job_ids = itertools.count(1)
+
+    def title(self, text):
+        self.options['title'] = text
+
+    def geometry(self, spec):
+        self.options['geometry'] = spec
+
+    def update(self):
+        pass
+
+    def after(self, delay, callback, *args):
+        job_id = next(self.job_ids)
+        heapq.heappush(self.jobs, (self.now_ms + delay, job_id, callback, args))
+        return job_id
+
+    def after_cancel(self, job_id):
+        self.cancelled.add(job_id)
+
+    def step(self):
+        """Run the next scheduled callback, jumping the clock to it; False when none is left"""
+        while self.jobs:
+            due_ms, job_id, callback, args = heapq.heappop(self.jobs)
+            if job_id in self.cancelled:
+                self.cancelled.discard(job_id)
+                continue
+            self.now_ms = max(self.now_ms, due_ms)
+            callback(*args)
+            return True
+        return False
+
+    def run_until_idle(self, limit=None):
+        """Run scheduled callbacks until none are left (or `limit` have run); returns how many ran"""
+        ran = 0
+        while (limit is None or ran < limit) and self.step():
+            ran += 1
+        return ran
+
+    def mainloop(self):
+        self.run_until_idle()
+
+
+class VirtualMessagebox:
+    """Records message boxes instead of showing them"""
+
+    def __init__(self, keep=100):
+        self.shown = collections.deque(maxlen=keep)  # latest (title, message) pairs
+        self.count = 0
+
+    def showinfo(self, title=None, message=None, **options):
+        self.shown.append((title, message))
+        self.count += 1
+        return 'ok'
+
+
+def virtual_backend(keep_messages=100):
+    """A fresh backend namespace with its own message box recorder"""
+    return types.SimpleNamespace(
+        Tk=VirtualRoot,
+        Frame=VirtualWidget,
+        Label=VirtualWidget,
+        Button=VirtualWidget,
+        LEFT='left',
+        messagebox=VirtualMessagebox(keep_messages),
+    )
+
+
+def play_session(gui, policy, puzzle=False):
+    """Play one scripted game through the GUI's handlers; return (won, turns)"""
+    gui.malicious_mode = puzzle
+    gui.new_game()
+    root = gui.root
+    turn = 0
+    while gui.game_active:
+        first, second = policy.select(turn)
+        gui.select_cup(first)
+        gui.select_cup(second)
+        gui.examine_cups()
+        gui.flip_coins(policy.flip(turn, gui.examined_coins))
+        if gui.game_active:
+            gui.spin_lazy_susan()
+            root.run_until_idle()
+        turn += 1
+    return gui.check_win_condition(), turn
+
+
+def main():
+    import argparse
+    import time
+
+    from coin_game_engine import STRATEGIES
+    from coin_game_gui import CoinGameGUI
+    from coin_game_policy import resolve_strategy
+    from coin_game_store import GameStore
+
+    parser = argparse.ArgumentParser(description="Soak-test CoinGameGUI on the virtual widget backend")
+    parser.add_argument('sessions', type=int, nargs='?', default=10000)
+    parser.add_argument('--strategy', default='optimal',
+                        help=f"one of {', '.join(sorted(STRATEGIES))} or a compiled policy file")
+    parser.add_argument('--puzzle', action='store_true', help="play against the puzzle-mode rotation")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--autoplay', action='store_true', help="drive the GUI's autoplay bot at full speed")
+    parser.add_argument('--db', help="record every game in this coin_game_store database")
+    args = parser.parse_args()
+
+    policy = resolve_strategy(args.strategy)
+    backend = virtual_backend()
+    root = VirtualRoot()
+    store = GameStore(args.db) if args.db else None
+    gui = CoinGameGUI(root, seed=args.seed, backend=backend, store=store)
+
+    wins = moves = 0
+    start = time.perf_counter()
+    if args.autoplay:
+        gui.malicious_mode = args.puzzle
+        gui.autoplay_speed = len(gui.AUTOPLAY_SPEEDS) - 1
+        gui.start_autoplay(policy, games=args.sessions)
+        root.run_until_idle()
+        moves = gui.autoplay_moves
+        wins = gui.autoplay_wins
+        print(gui.autoplay_label.cget('text'))
+    else:
+        for _ in range(args.sessions):
+            won, turns = play_session(gui, policy, args.puzzle)
+            wins += won
+            moves += turns
+    elapsed = time.perf_counter() - start
+    print(f"{args.sessions:,} sessions, {wins:,} won, {moves:,} moves in {elapsed:.2f}s: "
+          f"{args.sessions / elapsed:,.0f} sessions/sec, {moves / elapsed:,.0f} moves/sec, "
+          f"{backend.messagebox.count:,} message boxes")
+    if store is not None:
+        store.close()
+        print(f"{store.written:,} games stored in {store.batches:,} batches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from array import array
+
+from coin_game_columns import HEADER, read_columns, write_columns
+
+
+class ColumnFileTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'sweep.cgc')
+        self.columns = {
+            'turns': array('H', [3, 5, 50, 1]),
+            'strategy': array('B', [0, 1, 1, 0]),
+            'win_rate': array('d', [1.0, 0.5, 0.0, 0.25]),
+            'seed': array('q', [-1, 2 ** 40, 0, 7]),
+        }
+        write_columns(self.path, self.columns, labels={'strategy': ('optimal', 'blind')})
+
+    def test_round_trip(self):
+        table = read_columns(self.path)
+        self.assertEqual(table.names(), ['turns', 'strategy', 'win_rate', 'seed'])
+        self.assertEqual(len(table), 4)
+        for name, values in self.columns.items():
+            self.assertEqual(table[name].typecode, values.typecode)
+            self.assertEqual(table[name], values)
+        self.assertEqual(table.labels, {'strategy': ('optimal', 'blind')})
+        self.assertEqual(table.decoded('strategy'), ['optimal', 'blind', 'blind', 'optimal'])
+        self.assertEqual(next(table.rows()), {'turns': 3, 'strategy': 'optimal', 'win_rate': 1.0, 'seed': -1})
+
+    def test_reads_only_the_named_columns(self):
+        table = read_columns(self.path, names={'strategy', 'seed'})
+        self.assertEqual(table.names(), ['strategy', 'seed'])
+        self.assertNotIn('turns', table)
+        self.assertEqual(table['seed'], self.columns['seed'])
+        self.assertEqual(table.decoded('strategy'), ['optimal', 'blind', 'blind', 'optimal'])
+        self.assertEqual(list(read_columns(self.path, names={'turns'}).labels), [])
+
+    def test_empty_file_round_trip(self):
+        write_columns(self.path, {})
+        table = read_columns(self.path)
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.names(), [])
+
+    def test_rejects_bad_columns(self):
+        with self.assertRaises(ValueError):
+            write_columns(self.path, {'count': array('l', [1])})
+        with self.assertRaises(ValueError):
+            write_columns(self.path, {'a': array('B', [1, 2]), 'b': array('B', [1])})
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'CG')
+        with self.assertRaises(ValueError):
+            read_columns(self.path)
+        with open(self.path, 'wb') as f:
+            f.write(HEADER.pack(b'XXXX', 1, 0, 0))
+        with self.assertRaises(ValueError):
+            read_columns(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+
+from coin_game_curses import Screen
+
+
+class FakeWindow:
+    """Records addstr calls against a fixed-size grid"""
+
+    def __init__(self, height=5, width=20):
+        self.height = height
+        self.width = width
+        self.writes = []
+        self.cells = [[' '] * width for _ in range(height)]
+
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def addstr(self, y, x, text):
+        self.writes.append((y, x, text))
+        self.cells[y][x:x + len(text)] = text
+
+    def noutrefresh(self):
+        pass
+
+    def text(self):
+        return [''.join(row).rstrip() for row in self.cells]
+
+
+@mock.patch('coin_game_curses.curses.doupdate', lambda: None)
+class ScreenTest(unittest.TestCase):
+    def test_writes_only_changed_span(self):
+        window = FakeWindow()
+        screen = Screen(window)
+        screen.draw(['turn 1', 'HTTH'])
+        window.writes.clear()
+        screen.draw(['turn 2', 'HTTH'])
+        self.assertEqual(window.writes, [(0, 5, '2')])
+        self.assertEqual(window.text()[:2], ['turn 2', 'HTTH'])
+
+    def test_trailing_spaces_need_no_write(self):
+        window = FakeWindow()
+        screen = Screen(window)
+        screen.draw(['ab '])
+        window.writes.clear()
+        screen.draw(['ab'])
+        self.assertEqual(window.writes, [])
+        self.assertEqual(screen.rows, ['ab'])
+
+    def test_shorter_frames_clear_old_rows(self):
+        window = FakeWindow()
+        screen = Screen(window)
+        screen.draw(['first', 'second'])
+        screen.draw(['first'])
+        self.assertEqual(window.text()[:2], ['first', ''])
+
+    def test_rows_are_clipped_to_the_window(self):
+        window = FakeWindow(height=2, width=5)
+        screen = Screen(window)
+        screen.draw(['abcdefgh', 'x', 'not shown'])
+        self.assertEqual(window.text(), ['abcd', 'x'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from coin_game_engine import STRATEGIES
+from coin_game_gui import CoinGameGUI
+from coin_game_policy import compile_strategy
+from coin_game_widgets import VirtualRoot, virtual_backend
+
+
+class AutoplayTest(unittest.TestCase):
+    def setUp(self):
+        self.root = VirtualRoot()
+        self.gui = CoinGameGUI(self.root, seed=0, backend=virtual_backend())
+        self.gui.autoplay_speed = len(self.gui.AUTOPLAY_SPEEDS) - 1
+
+    def play(self, strategy=None, games=50):
+        self.gui.start_autoplay(strategy, games=games)
+        self.root.run_until_idle()
+
+    def test_optimal_wins_every_game(self):
+        self.play()
+        self.assertEqual((self.gui.autoplay_games, self.gui.autoplay_wins), (50, 50))
+        self.assertLessEqual(self.gui.autoplay_moves, 50 * 5)
+
+    def test_blind_mode_plays_the_blind_plan_without_seeing(self):
+        self.gui.game_mode = 'blind'
+        seen = []
+        blind = compile_strategy(STRATEGIES['blind'])
+        flip = blind.flip
+        blind.flip = lambda turn, observed: seen.append(observed) or flip(turn, observed)
+        self.play(blind)
+        self.assertEqual(self.gui.autoplay_wins, 50)
+        self.assertLessEqual(self.gui.autoplay_moves, 50 * 7)
+        self.assertEqual(set(seen), {None})
+
+    def test_blind_mode_defaults_to_the_blind_plan(self):
+        self.gui.game_mode = 'blind'
+        self.play()
+        self.assertEqual(self.gui.autoplay_strategy.name, 'blind')
+        self.assertEqual(self.gui.autoplay_wins, 50)
+
+    def test_blind_mode_refuses_strategies_that_look(self):
+        self.gui.game_mode = 'blind'
+        self.gui.start_autoplay(STRATEGIES['optimal'], games=5)
+        self.assertIsNone(self.gui.autoplay_actions)
+        self.assertIn('cannot play blind mode', self.gui.status_label.cget('text'))
+
+
+if __name__ == "__main__":
+    unittest.main()
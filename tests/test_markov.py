@@ -0,0 +1,62 @@
+import itertools
+import unittest
+from fractions import Fraction
+
+from coin_game_engine import STRATEGIES
+from coin_game_markov import analyze
+from coin_game_start import UNIFORM, StartStateSampler
+from coin_game_state import FLIP_MASK, IS_WIN, PEEK, ROTATE, STATES
+
+
+def enumerate_wins(strategy, turns, start_states=UNIFORM):
+    """P(win on turn t) for t = 1..turns, by playing out every start and every spin sequence"""
+    wins = [Fraction(0)] * (turns + 1)
+    for start in range(STATES):
+        weight = start_states.probability(start)
+        if not weight:
+            continue
+        for rotations in itertools.product(range(4), repeat=turns):
+            state = start
+            for turn, rotation in enumerate(rotations):
+                cup_indices = strategy.select(turn)
+                state = ROTATE[rotation][state]
+                state ^= FLIP_MASK[cup_indices][strategy.flip(turn, PEEK[cup_indices][state])]
+                if IS_WIN[state]:
+                    wins[turn + 1] += weight / 4 ** turns  # Each sequence is one of 4**turns
+                    break
+    return wins[1:]
+
+
+class AnalyzeTest(unittest.TestCase):
+    def test_guaranteed_strategies(self):
+        for name, worst in (('optimal', 5), ('blind', 7)):
+            result = analyze(STRATEGIES[name])
+            self.assertEqual(result.win_rate(), 1, name)
+            self.assertEqual(result.worst_case(), worst, name)
+            self.assertEqual(result.tail(worst), 0, name)
+
+    def test_matches_brute_force_enumeration(self):
+        for name, turns in (('optimal', 5), ('alternating', 4), ('adjacent', 4)):
+            result = analyze(STRATEGIES[name])
+            self.assertEqual(result.distribution()[:turns], enumerate_wins(STRATEGIES[name], turns), name)
+
+    def test_known_values(self):
+        # From three heads the lone tail lands under a diagonal cup, and is turned over, half the time
+        result = analyze(STRATEGIES['optimal'], start_states=StartStateSampler.by_heads({3: 1}))
+        self.assertEqual(result.win_probability(1), Fraction(1, 2))
+        diagonal = analyze(STRATEGIES['diagonal'])
+        self.assertEqual(diagonal.win_rate() + diagonal.tail(50), 1)
+
+    def test_weighted_starts_are_exact(self):
+        sampler = StartStateSampler(weights={0b0001: 1, 0b0011: 2, 0b0111: 4})
+        self.assertEqual(sampler.probability(0b0011), Fraction(2, 7))
+        # Far beyond what a float ratio can carry
+        lopsided = StartStateSampler(weights={0b0001: 1, 0b0011: 3 ** 40})
+        self.assertEqual(lopsided.probability(0b0001), Fraction(1, 3 ** 40 + 1))
+        self.assertEqual(analyze(STRATEGIES['optimal'], start_states=lopsided).win_rate(), 1)
+        result = analyze(STRATEGIES['alternating'], start_states=sampler)
+        self.assertEqual(result.distribution()[:4], enumerate_wins(STRATEGIES['alternating'], 4, sampler))
+
+
+if __name__ == "__main__":
+    unittest.main()
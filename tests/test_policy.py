@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from coin_game_engine import ADJACENT, DIAGONAL, STRATEGIES, Strategy
+from coin_game_policy import compile_strategy, load_policy, save_policy, verify
+
+
+class CompileStrategyTest(unittest.TestCase):
+    def test_periods(self):
+        expected = {'adjacent': 1, 'diagonal': 1, 'alternating': 2, 'optimal': 5, 'blind': 7}
+        for name, period in expected.items():
+            policy = compile_strategy(STRATEGIES[name])
+            self.assertEqual(policy.period, period, name)
+            self.assertEqual(len(policy.table), 2 * period)
+            self.assertEqual(verify(STRATEGIES[name], policy), [], name)
+
+    def test_blind_policies_play_unseen(self):
+        blind = compile_strategy(STRATEGIES['blind'])
+        self.assertTrue(blind.blind)
+        self.assertEqual([blind.flip(turn, None) for turn in range(7)], [3, 3, 3, 1, 3, 3, 3])
+        optimal = compile_strategy(STRATEGIES['optimal'])
+        self.assertFalse(optimal.blind)
+        with self.assertRaises(KeyError):
+            optimal.flip(0, None)
+
+    def test_strategy_without_a_period_keeps_every_turn(self):
+        late_switch = Strategy('late', lambda turn: ADJACENT if turn < 30 else DIAGONAL, lambda turn, observed: 0)
+        policy = compile_strategy(late_switch, max_turns=50)
+        self.assertEqual(policy.period, 50)
+        self.assertEqual(verify(late_switch, policy), [])
+
+    def test_rejects_invalid_flip_choice(self):
+        bad = Strategy('bad', lambda turn: ADJACENT, lambda turn, observed: 4)
+        with self.assertRaises(ValueError):
+            compile_strategy(bad)
+
+
+class PolicyFileTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'optimal.cgp')
+
+    def test_round_trip(self):
+        policy = compile_strategy(STRATEGIES['optimal'])
+        save_policy(policy, self.path)
+        loaded = load_policy(self.path)
+        self.assertEqual((loaded.name, loaded.period, loaded.table), (policy.name, policy.period, policy.table))
+        self.assertEqual(verify(STRATEGIES['optimal'], loaded), [])
+
+    def test_rejects_truncated_and_foreign_files(self):
+        save_policy(compile_strategy(STRATEGIES['blind']), self.path)
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        for broken in (data[:-1], b'CGRB' + data[4:], data[:3]):
+            with open(self.path, 'wb') as f:
+                f.write(broken)
+            with self.assertRaises(ValueError):
+                load_policy(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
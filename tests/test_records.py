@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+
+from coin_game_engine import STRATEGIES, HeadlessCoinGame
+from coin_game_records import GameRecordReader, GameRecordWriter
+
+
+class GameRecordsTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'games.cgr')
+
+    def test_round_trip(self):
+        results = []
+        with GameRecordWriter(self.path, buffer_size=64) as writer:
+            for name in ('optimal', 'adjacent'):
+                game = HeadlessCoinGame(STRATEGIES[name], seed=1, max_turns=10, recorder=writer)
+                for _ in range(200):
+                    results.append(game.play_game())
+        self.assertEqual(writer.games, 400)
+
+        with GameRecordReader(self.path) as reader:
+            self.assertEqual(len(reader), writer.games + writer.turns)
+            games = list(reader.games())
+            self.assertEqual(len(games), len(results))
+            for (state, turns), result in zip(games, results):
+                self.assertTrue(0 < state < 15)
+                self.assertEqual(len(turns), 10 if result is None else result)
+                self.assertEqual(reader.replay(state, turns)[1], result is not None)
+
+    def test_appending_keeps_one_header(self):
+        for state in (3, 5):
+            with GameRecordWriter(self.path) as writer:
+                writer.start_game(state)
+                writer.record_turn((0, 3), 1, 2)
+        with GameRecordReader(self.path) as reader:
+            self.assertEqual([state for state, _ in reader.games()], [3, 5])
+            self.assertEqual(list(reader.games())[1][1], [((0, 3), 1, 2)])
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a record file')
+        with self.assertRaises(ValueError):
+            GameRecordReader(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from coin_game_server import CoinGameServer, run_load
+from coin_game_start import StartStateSampler
+
+
+class HandleTest(unittest.TestCase):
+    def setUp(self):
+        self.server = CoinGameServer(seed=0)
+        self.owned = set()
+        self.sid = int(self.server.handle(b'NEW', self.owned).split()[1])
+
+    def test_other_connections_cannot_touch_a_session(self):
+        stranger = set()
+        for command in (b'EXAMINE %d 1 2', b'FLIP %d 0', b'QUIT %d'):
+            self.assertEqual(self.server.handle(command % self.sid, stranger), b'ERR no such session\n')
+        self.assertIn(self.sid, self.server.sessions)
+
+    def test_one_examination_per_turn(self):
+        self.assertTrue(self.server.handle(b'EXAMINE %d 1 2' % self.sid, self.owned).startswith(b'SEE'))
+        self.assertTrue(self.server.handle(b'EXAMINE %d 1 3' % self.sid, self.owned).startswith(b'ERR'))
+        reply = self.server.handle(b'FLIP %d 0' % self.sid, self.owned)
+        self.assertTrue(reply.startswith((b'OK', b'WIN')))
+
+    def test_new_sessions_use_the_start_state_sampler(self):
+        server = CoinGameServer(seed=0, start_states=StartStateSampler(weights={0b0001: 1}))
+        owned = set()
+        for _ in range(20):
+            sid = int(server.handle(b'NEW', owned).split()[1])
+            self.assertEqual(server.sessions[sid].state, 0b0001)
+        with self.assertRaises(ValueError):
+            CoinGameServer(start_states=StartStateSampler(cups=6))
+
+    def test_flip_needs_an_examination(self):
+        self.assertEqual(self.server.handle(b'FLIP %d 3' % self.sid, self.owned), b'ERR examine two cups first\n')
+
+    def test_malformed_commands(self):
+        for line in (b'', b'EXAMINE', b'EXAMINE x 1 2', b'FLIP %d' % self.sid, b'DANCE'):
+            self.assertTrue(self.server.handle(line, self.owned).startswith(b'ERR'), line)
+
+
+class ConnectionTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'server.sock')
+
+    def test_over_long_line_is_skipped(self):
+        async def exchange():
+            server = await CoinGameServer(seed=0).start(path=self.path)
+            async with server:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+                writer.write(b'NEW ' + b'x' * (3 << 20) + b'\nSTATS\n')
+                replies = [await reader.readline(), await reader.readline()]
+                writer.close()
+                await writer.wait_closed()
+            return replies
+
+        replies = asyncio.run(exchange())
+        self.assertEqual(replies[0], b'ERR line too long\n')
+        self.assertTrue(replies[1].startswith(b'STATS'))
+
+    def test_load_reports_without_moves(self):
+        async def load():
+            server = await CoinGameServer(seed=0).start(path=self.path)
+            async with server:
+                return await run_load(lambda: asyncio.open_unix_connection(self.path), sessions=0, connections=1)
+
+        report = asyncio.run(load())
+        self.assertEqual(report['moves'], 0)
+        self.assertIsNone(report['p50_ms'])
+
+    def test_load_plays_every_game(self):
+        async def load():
+            server = await CoinGameServer(seed=0).start(path=self.path)
+            async with server:
+                return await run_load(lambda: asyncio.open_unix_connection(self.path), sessions=20,
+                                      connections=3, games=2, puzzle=True)
+
+        report = asyncio.run(load())
+        self.assertEqual(report['games'], 40)
+        self.assertGreaterEqual(report['moves'], 40)
+        self.assertLessEqual(report['p50_ms'], report['p99_ms'])
+
+
+if __name__ == "__main__":
+    unittest.main()
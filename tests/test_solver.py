@@ -0,0 +1,33 @@
+import itertools
+import unittest
+
+from coin_game_belief import START_BELIEF, rotation_closure
+from coin_game_solver import PuzzleSolver, advance
+from coin_game_state import FLIP_MASK, IS_WIN, PEEK, ROTATE, START_STATES
+
+
+class PuzzleSolverTest(unittest.TestCase):
+    def test_worst_case_is_five_turns(self):
+        self.assertEqual(PuzzleSolver().solve()[0], 5)
+
+    def test_four_turns_cannot_be_forced(self):
+        self.assertIsNone(PuzzleSolver(max_turns=4).best_move())
+
+    def test_policy_wins_every_game_within_five_turns(self):
+        policy = PuzzleSolver().solve()[1]
+        for start in START_STATES:
+            for rotations in itertools.product(range(4), repeat=5):
+                state, belief = start, START_BELIEF
+                for rotation in rotations:
+                    cup_indices, flips = policy[rotation_closure(belief)]
+                    state = ROTATE[rotation][state]
+                    observed = PEEK[cup_indices][state]
+                    state ^= FLIP_MASK[cup_indices][flips[observed]]
+                    if IS_WIN[state]:
+                        break
+                    belief = advance(belief, cup_indices, observed, flips[observed])
+                self.assertTrue(IS_WIN[state], (start, rotations))
+
+
+if __name__ == "__main__":
+    unittest.main()
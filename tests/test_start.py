@@ -0,0 +1,31 @@
+import random
+import unittest
+
+from coin_game_engine import STRATEGIES, run_games
+from coin_game_start import UNIFORM, StartStateSampler, game_rng
+
+
+class StartStateSamplerTest(unittest.TestCase):
+    def test_fill_matches_sample(self):
+        samplers = (UNIFORM, StartStateSampler.by_heads({1: 1, 3: 2}), StartStateSampler(cups=64))
+        for sampler in samplers:
+            rng = random.Random(7)
+            expected = [sampler.sample(rng) for _ in range(1000)]
+            self.assertEqual(list(sampler.fill(1000, seed=7)), expected)
+
+    def test_never_starts_won(self):
+        self.assertNotIn(0, UNIFORM.fill(10000, seed=0))
+        self.assertNotIn(15, UNIFORM.fill(10000, seed=0))
+
+    def test_game_streams_are_reproducible(self):
+        self.assertEqual(game_rng(3, 10).random(), game_rng(3, 10).random())
+        self.assertNotEqual(game_rng(3, 10).random(), game_rng(3, 11).random())
+
+    def test_unseeded_streams_differ_between_runs(self):
+        runs = {tuple(sorted(run_games(STRATEGIES['adjacent'], 200, max_turns=5, streams=True)[1].items()))
+                for _ in range(5)}
+        self.assertGreater(len(runs), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
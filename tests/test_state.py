@@ -0,0 +1,65 @@
+import unittest
+
+from coin_game_simulator import CoinGame
+from coin_game_state import (
+    FLIP_MASK,
+    IS_WIN,
+    PEEK,
+    ROTATE,
+    ROTATIONS,
+    START_STATES,
+    STATES,
+    from_coins,
+    to_coins,
+)
+
+
+class StateTablesTest(unittest.TestCase):
+    def setUp(self):
+        self.game = CoinGame()
+
+    def test_pack_round_trip(self):
+        for state in range(STATES):
+            self.assertEqual(from_coins(to_coins(state)), state)
+        self.assertEqual(from_coins(['H', 'T', 'T', 'H']), 0b1001)
+
+    def test_rotate_matches_rotate_coins(self):
+        for rotation in range(4):
+            for state in range(STATES):
+                coins = self.game.rotate_coins(to_coins(state), rotation)
+                self.assertEqual(ROTATE[rotation][state], from_coins(coins))
+
+    def test_quarter_turn_moves_each_coin_clockwise(self):
+        # Grid 0 1 / 2 3: after a clockwise quarter turn cup 2's coin is top left, cup 0's top right
+        self.assertEqual(ROTATIONS[1], (2, 0, 3, 1))
+        for rotation in range(4):
+            for state in range(STATES):
+                once_more = ROTATE[1][ROTATE[rotation][state]]
+                self.assertEqual(once_more, ROTATE[(rotation + 1) % 4][state])
+
+    def test_flip_mask_matches_apply_flip(self):
+        for pair in FLIP_MASK:
+            for choice in range(4):
+                for state in range(STATES):
+                    self.game.coins = to_coins(state)
+                    self.game.apply_flip(pair, choice)
+                    self.assertEqual(state ^ FLIP_MASK[pair][choice], from_coins(self.game.coins))
+
+    def test_peek_shows_the_examined_coins(self):
+        for (a, b), seen in PEEK.items():
+            for state in range(STATES):
+                coins = to_coins(state)
+                self.assertEqual(seen[state], (coins[a], coins[b]))
+
+    def test_is_win_matches_check_win_condition(self):
+        for state in range(STATES):
+            self.game.coins = to_coins(state)
+            self.assertEqual(IS_WIN[state], self.game.check_win_condition())
+
+    def test_start_states_are_every_unwon_state(self):
+        self.assertEqual(len(START_STATES), 14)
+        self.assertFalse(any(IS_WIN[state] for state in START_STATES))
+
+
+if __name__ == "__main__":
+    unittest.main()
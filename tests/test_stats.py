@@ -0,0 +1,69 @@
+import random
+import statistics
+import unittest
+
+from coin_game_stats import StatsTable, TurnStats
+
+
+def random_games(seed, count, max_turns=20):
+    """Turn counts with some losses mixed in"""
+    rng = random.Random(seed)
+    return [None if rng.random() < 0.1 else rng.randint(1, max_turns) for _ in range(count)]
+
+
+class TurnStatsTest(unittest.TestCase):
+    def test_merge_equals_sequential(self):
+        games = random_games(0, 5000)
+        sequential = TurnStats(20)
+        for turns in games:
+            sequential.add(turns)
+
+        merged = TurnStats(20)
+        for start in range(0, len(games), 777):
+            part = TurnStats(20)
+            for turns in games[start:start + 777]:
+                part.add(turns)
+            merged.merge(part)
+
+        self.assertEqual((merged.games, merged.wins), (sequential.games, sequential.wins))
+        self.assertEqual(merged.histogram, sequential.histogram)
+        self.assertAlmostEqual(merged.mean, sequential.mean, places=9)
+        self.assertAlmostEqual(merged.variance, sequential.variance, places=9)
+        self.assertEqual(merged.percentile(99), sequential.percentile(99))
+
+    def test_moments_match_statistics_module(self):
+        games = random_games(1, 2000)
+        stats = TurnStats(20)
+        for turns in games:
+            stats.add(turns)
+        wins = [turns for turns in games if turns is not None]
+        self.assertAlmostEqual(stats.mean, statistics.fmean(wins), places=9)
+        self.assertAlmostEqual(stats.stddev, statistics.stdev(wins), places=9)
+        self.assertEqual(stats.percentile(50), sorted(wins)[(len(wins) + 1) // 2 - 1])
+
+    def test_merge_with_empty(self):
+        stats = TurnStats(20)
+        for turns in (3, 4, None):
+            stats.add(turns)
+        summary = stats.summary()
+        self.assertEqual(stats.merge(TurnStats(20)).summary(), summary)
+        self.assertEqual(TurnStats(20).merge(stats).summary(), summary)
+
+    def test_merge_rejects_other_max_turns(self):
+        with self.assertRaises(ValueError):
+            TurnStats(20).merge(TurnStats(50))
+
+
+class StatsTableTest(unittest.TestCase):
+    def test_rollup_and_total(self):
+        table = StatsTable(20)
+        for i, turns in enumerate(random_games(2, 600)):
+            table.add(('optimal' if i % 2 else 'blind', i % 3), turns)
+        per_adversary = table.rollup(1)
+        self.assertEqual(sorted(per_adversary.stats), [0, 1, 2])
+        self.assertEqual(sum(stats.games for stats in per_adversary.stats.values()), 600)
+        self.assertEqual(table.total().histogram, per_adversary.total().histogram)
+
+
+if __name__ == "__main__":
+    unittest.main()
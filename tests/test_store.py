@@ -0,0 +1,59 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from coin_game_store import GameStore
+
+
+class GameStoreTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'games.db')
+
+    def test_leaderboard_and_stats_per_cup_count(self):
+        with GameStore(self.path) as store:
+            store.add('human', 'human', False, 4, True, 3, 'a', 10.0)
+            store.add('human', 'human', False, 4, True, 2, 'b', 20.0)
+            store.add('human', 'human', False, 6, True, 1, 'c', 5.0)
+            store.add('human', 'human', False, 6, False, 50, 'd', 5.0)
+            store.add('blind', 'optimal', True, 4, True, 5, 'e', 1.0)
+            store.flush()
+            self.assertEqual([row['spins'] for row in store.leaderboard()], [2, 3])
+            self.assertEqual([row['spins'] for row in store.leaderboard(cups=6)], [1])
+            self.assertEqual([row['trace_hash'] for row in store.leaderboard('blind', puzzle=True)], ['e'])
+            stats = {(row['mode'], row['cups']): row for row in store.stats()}
+            self.assertEqual(stats['human', 4]['games'], 2)
+            self.assertEqual(stats['human', 6]['win_rate'], 0.5)
+        self.assertEqual(store.written, 5)
+
+    def test_failed_batch_is_reported_and_later_batches_written(self):
+        with GameStore(self.path) as store:
+            store.add('human', 'human', False, 4, True, object(), 'bad', 1.0)
+            with self.assertRaises(sqlite3.Error):
+                store.flush()
+            self.assertEqual(store.dropped, 1)
+            store.error = None
+            store.add('human', 'human', False, 4, True, 3, 'good', 1.0)
+            store.flush()
+            self.assertEqual(len(store.leaderboard()), 1)
+
+    def test_writer_failure_does_not_hang_flush(self):
+        store = GameStore(self.path)
+        with mock.patch('coin_game_store.connect', side_effect=RuntimeError('no database')):
+            store.add('human', 'human', False, 4, True, 3, 'a', 1.0)
+            with self.assertRaises(RuntimeError):
+                store.flush()
+        self.assertTrue(store.writer.is_alive())
+        with self.assertRaises(RuntimeError):
+            store.close()
+
+    def test_bad_path_fails_in_constructor(self):
+        with self.assertRaises(sqlite3.Error):
+            GameStore(os.path.join(self.path, 'missing', 'games.db'))
+
+
+if __name__ == "__main__":
+    unittest.main()
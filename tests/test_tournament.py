@@ -0,0 +1,22 @@
+import unittest
+
+from coin_game_tournament import run_tournament
+
+
+class TournamentTest(unittest.TestCase):
+    def test_results_do_not_depend_on_workers(self):
+        options = dict(strategy_names=['optimal', 'adjacent'], games=6000, seed=1, max_turns=20, shard_size=500)
+        self.assertEqual(run_tournament(workers=1, **options), run_tournament(workers=3, **options))
+
+    def test_seed_changes_results(self):
+        options = dict(strategy_names=['adjacent'], adversary_names=['random'], games=2000, max_turns=5,
+                       workers=1)
+        self.assertNotEqual(run_tournament(seed=1, **options), run_tournament(seed=2, **options))
+
+    def test_unknown_strategy_fails_before_playing(self):
+        with self.assertRaises((OSError, ValueError)):
+            run_tournament(strategy_names=['no-such-strategy'], games=10, workers=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
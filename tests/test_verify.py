@@ -0,0 +1,74 @@
+import unittest
+
+from coin_game_engine import STRATEGIES
+from coin_game_ring import make_heads_strategy
+from coin_game_state import ROTATE, from_coins, to_coins
+from coin_game_verify import RingModel, check_strategy, necklaces, verify
+
+
+def assert_never_wins(test, trace):
+    for step in trace:
+        test.assertGreater(len(set(step['after'])), 1, step)
+
+
+def assert_lasso(test, verdict, cups):
+    """The loop's last turn ends in a rotation of the coins it started from"""
+    assert_never_wins(test, verdict.counterexample)
+    start = verdict.counterexample[verdict.loop_start]['coins']
+    end = verdict.counterexample[-1]['after']
+    if cups == 4:
+        rotations = [''.join(to_coins(rotate[from_coins(end)])) for rotate in ROTATE]
+    else:
+        rotations = [end[i:] + end[:i] for i in range(cups)]
+    test.assertIn(start, rotations)
+
+
+class CheckStrategyTest(unittest.TestCase):
+    def test_optimal_wins_within_five_turns(self):
+        verdict = check_strategy(STRATEGIES['optimal'])
+        self.assertTrue(verdict.proven)
+        self.assertEqual(verdict.worst_case, 5)
+
+    def test_blind_wins_within_seven_turns(self):
+        verdict = check_strategy(STRATEGIES['blind'])
+        self.assertTrue(verdict.proven)
+        self.assertEqual(verdict.worst_case, 7)
+
+    def test_tight_bound_is_refuted(self):
+        self.assertFalse(check_strategy(STRATEGIES['optimal'], bound=4).proven)
+
+    def test_cycle_gives_a_closed_lasso(self):
+        for name in ('adjacent', 'diagonal', 'alternating'):
+            verdict = check_strategy(STRATEGIES[name], bound=20)
+            self.assertFalse(verdict.proven)
+            self.assertIsNotNone(verdict.cycle)
+            self.assertLessEqual(len(verdict.counterexample), verdict.cycle[1] + 1, name)
+            assert_lasso(self, verdict, 4)
+
+    def test_plain_refutation_runs_to_the_bound(self):
+        verdict = check_strategy(STRATEGIES['optimal'], bound=4)
+        self.assertIsNone(verdict.cycle)
+        self.assertIsNone(verdict.loop_start)
+        self.assertEqual(len(verdict.counterexample), 4)
+        assert_never_wins(self, verdict.counterexample)
+
+
+class RingModelTest(unittest.TestCase):
+    def test_canonical_is_smallest_rotation(self):
+        model = RingModel(make_heads_strategy(6, 3), 6, 3)
+        for state in range(model.states):
+            self.assertEqual(model.canonical(state), min(model.rotate(state, steps) for steps in range(6)))
+
+    def test_necklaces_are_the_rotation_classes(self):
+        for cups in range(1, 11):
+            model = RingModel(make_heads_strategy(cups, 1), cups, 1)
+            classes = sorted({model.canonical(state) for state in range(model.states)})
+            self.assertEqual(list(necklaces(cups)), classes)
+
+    def test_ring_counterexample_is_a_lasso(self):
+        verdict = verify(RingModel(make_heads_strategy(6, 3), 6, 3), 12, 2)
+        self.assertFalse(verdict.proven)
+        assert_lasso(self, verdict, 6)
+
+if __name__ == "__main__":
+    unittest.main()